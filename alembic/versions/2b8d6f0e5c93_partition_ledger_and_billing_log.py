@@ -0,0 +1,101 @@
+"""Partition ledger and billing_log by month (Postgres)
+
+Revision ID: 2b8d6f0e5c93
+Revises: 9a4f7e3b2c18
+Create Date: 2026-10-19 14:51:12.530977
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8d6f0e5c93'
+down_revision: Union[str, None] = '9a4f7e3b2c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months created ahead of time here; afterwards the maintain_partitions beat task keeps this up
+PREMAKE_MONTHS = 3
+
+# table -> (foreign keys, indexes); recreated on the new table
+TABLES = {
+    'ledger': (
+        [('ledger_user_id_fkey', 'user_id', 'users'), ('ledger_campaign_id_fkey', 'campaign_id', 'campaigns')],
+        [('ix_ledger_id', ['id']), ('ix_ledger_stripe_payment_intent_id', ['stripe_payment_intent_id']),
+         ('ix_ledger_user_id_created_at', ['user_id', 'created_at'])],
+    ),
+    'billing_log': (
+        [('billing_log_user_id_fkey', 'user_id', 'users')],
+        [('ix_billing_log_id', ['id']), ('ix_billing_log_transaction_id', ['transaction_id'])],
+    ),
+}
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """
+    Swaps `table` for a partitioned (or plain) copy. The id sequence is handed over
+    before the old table is dropped, and constraints/indexes are created only
+    afterwards so their names are free.
+    """
+    foreign_keys, indexes = TABLES[table]
+    old = f'{table}_old'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    partition_clause = ' PARTITION BY RANGE (created_at)' if partitioned else ''
+    op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS){partition_clause}')
+
+    if partitioned:
+        bind = op.get_bind()
+        oldest = bind.execute(sa.text(f'SELECT min(created_at) FROM {old}')).scalar()
+        today = datetime.now(timezone.utc).date()
+        month = date((oldest or today).year, (oldest or today).month, 1)
+        last = _add_months(date(today.year, today.month, 1), PREMAKE_MONTHS)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+        # Catches rows outside the premade months instead of failing the insert
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        # The partition key becomes part of the primary key, so it cannot be NULL
+        op.execute(f'UPDATE {old} SET created_at = now() WHERE created_at IS NULL')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {old}')
+
+    if partitioned:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL')
+        op.create_primary_key(f'{table}_pkey', table, ['id', 'created_at'])
+    else:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL')
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+    for name, column, referred in foreign_keys:
+        op.create_foreign_key(name, table, referred, [column], ['id'])
+    for name, columns in indexes:
+        op.create_index(name, table, columns, unique=False)
+
+
+def upgrade() -> None:
+    # SQLite (development/tests) keeps plain tables; PartitionManager is a no-op there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
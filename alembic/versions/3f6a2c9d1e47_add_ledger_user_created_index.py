@@ -0,0 +1,26 @@
+"""Add ledger (user_id, created_at) index
+
+Revision ID: 3f6a2c9d1e47
+Revises: bd4c1cc09725
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a2c9d1e47'
+down_revision: Union[str, None] = 'bd4c1cc09725'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_ledger_user_id_created_at', 'ledger', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ledger_user_id_created_at', table_name='ledger')
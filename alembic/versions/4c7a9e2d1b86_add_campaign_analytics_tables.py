@@ -0,0 +1,72 @@
+"""Add campaign analytics summary tables and ledger.updated_at
+
+Revision ID: 4c7a9e2d1b86
+Revises: 8f3b1d6a2e54
+Create Date: 2026-10-19 18:21:44.902317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c7a9e2d1b86'
+down_revision: Union[str, None] = '8f3b1d6a2e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows get the migration time; the first refresh rebuilds every campaign anyway
+    op.add_column('ledger', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.create_index('ix_ledger_updated_at', 'ledger', ['updated_at'], unique=False)
+    op.create_index('ix_ledger_campaign_id_status', 'ledger', ['campaign_id', 'status'], unique=False)
+
+    op.create_table(
+        'campaign_stats',
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('investor_count', sa.Integer(), nullable=False),
+        sa.Column('investment_count', sa.Integer(), nullable=False),
+        sa.Column('committed_cents', sa.BigInteger(), nullable=False),
+        sa.Column('settled_cents', sa.BigInteger(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id']),
+        sa.PrimaryKeyConstraint('campaign_id'),
+    )
+    op.create_table(
+        'campaign_status_totals',
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('amount_cents', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id']),
+        sa.PrimaryKeyConstraint('campaign_id', 'status'),
+    )
+    op.create_table(
+        'campaign_daily_inflow',
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('investment_count', sa.Integer(), nullable=False),
+        sa.Column('amount_cents', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id']),
+        sa.PrimaryKeyConstraint('campaign_id', 'day'),
+    )
+    op.create_table(
+        'analytics_watermarks',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('refreshed_through', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_watermarks')
+    op.drop_table('campaign_daily_inflow')
+    op.drop_table('campaign_status_totals')
+    op.drop_table('campaign_stats')
+    op.drop_index('ix_ledger_campaign_id_status', table_name='ledger')
+    op.drop_index('ix_ledger_updated_at', table_name='ledger')
+    with op.batch_alter_table('ledger') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,60 @@
+"""Add materialized Reg CF limit state to users
+
+Revision ID: 5d2e8b1c4a76
+Revises: 7c1e5b2a9f30
+Create Date: 2026-10-19 11:42:05.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8b1c4a76'
+down_revision: Union[str, None] = '7c1e5b2a9f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _annual_limit(annual_income, net_worth):
+    # SEC § 227.100(a)(2), as in ComplianceService.annual_investment_limit at this revision
+    income = annual_income or 0
+    net_worth = net_worth or 0
+    limit_base = max(income, net_worth)
+    if income < 124000 or net_worth < 124000:
+        return max(2500, limit_base * 0.05)
+    return min(limit_base * 0.10, 124000)
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('reg_cf_annual_limit', sa.Float(), nullable=True))
+    # Left NULL: computed from the ledger on each investor's next limit check
+    op.add_column('users', sa.Column('reg_cf_invested_12mo', sa.Float(), nullable=True))
+    op.add_column('users', sa.Column('reg_cf_window_resets_at', sa.DateTime(timezone=True), nullable=True))
+
+    users = sa.table(
+        'users',
+        sa.column('id', sa.Integer),
+        sa.column('is_accredited', sa.Boolean),
+        sa.column('annual_income', sa.Float),
+        sa.column('net_worth', sa.Float),
+        sa.column('reg_cf_annual_limit', sa.Float),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(users.c.id, users.c.annual_income, users.c.net_worth)
+        .where(sa.or_(users.c.is_accredited.is_(None), users.c.is_accredited == sa.false()))
+    ).fetchall()
+    if rows:
+        connection.execute(
+            users.update().where(users.c.id == sa.bindparam('user_id')).values(reg_cf_annual_limit=sa.bindparam('limit')),
+            [{'user_id': row.id, 'limit': _annual_limit(row.annual_income, row.net_worth)} for row in rows],
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'reg_cf_window_resets_at')
+    op.drop_column('users', 'reg_cf_invested_12mo')
+    op.drop_column('users', 'reg_cf_annual_limit')
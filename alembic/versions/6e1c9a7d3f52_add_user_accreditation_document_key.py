@@ -0,0 +1,27 @@
+"""Add users.accreditation_document_key
+
+Revision ID: 6e1c9a7d3f52
+Revises: 2b8d6f0e5c93
+Create Date: 2026-10-19 16:08:37.114520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1c9a7d3f52'
+down_revision: Union[str, None] = '2b8d6f0e5c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('accreditation_document_key', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('accreditation_document_key')
@@ -0,0 +1,26 @@
+"""Add users (accreditation_status, id) index
+
+Revision ID: 8f3b1d6a2e54
+Revises: 6e1c9a7d3f52
+Create Date: 2026-10-19 17:02:15.384106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b1d6a2e54'
+down_revision: Union[str, None] = '6e1c9a7d3f52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_accreditation_status_id', 'users', ['accreditation_status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_accreditation_status_id', table_name='users')
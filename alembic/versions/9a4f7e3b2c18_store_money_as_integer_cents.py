@@ -0,0 +1,52 @@
+"""Store money as integer cents
+
+Revision ID: 9a4f7e3b2c18
+Revises: 5d2e8b1c4a76
+Create Date: 2026-10-19 13:20:44.906173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f7e3b2c18'
+down_revision: Union[str, None] = '5d2e8b1c4a76'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, float dollars column, BIGINT cents column)
+MONEY_COLUMNS = [
+    ('ledger', 'amount', 'amount_cents'),
+    ('campaigns', 'target_amount', 'target_amount_cents'),
+    ('billing_log', 'fee_amount', 'fee_amount_cents'),
+    ('users', 'reg_cf_annual_limit', 'reg_cf_annual_limit_cents'),
+]
+
+
+def upgrade() -> None:
+    for table, dollars, cents in MONEY_COLUMNS:
+        op.add_column(table, sa.Column(cents, sa.BigInteger(), nullable=True))
+        op.execute(f"UPDATE {table} SET {cents} = CAST(ROUND({dollars} * 100) AS BIGINT) WHERE {dollars} IS NOT NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(dollars)
+
+    # Exposure is re-aggregated (in cents) from the ledger on each investor's next limit check
+    op.add_column('users', sa.Column('reg_cf_invested_12mo_cents', sa.BigInteger(), nullable=True))
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('reg_cf_invested_12mo')
+
+
+def downgrade() -> None:
+    op.add_column('users', sa.Column('reg_cf_invested_12mo', sa.Float(), nullable=True))
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('reg_cf_invested_12mo_cents')
+
+    for table, dollars, cents in reversed(MONEY_COLUMNS):
+        op.add_column(table, sa.Column(dollars, sa.Float(), nullable=True))
+        op.execute(f"UPDATE {table} SET {dollars} = {cents} / 100.0 WHERE {cents} IS NOT NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(cents)
@@ -0,0 +1,67 @@
+"""Add append-only compliance_decisions
+
+Revision ID: a3e6c0f4b718
+Revises: 1d5f8a3c7e29
+Create Date: 2026-10-19 19:48:30.217564
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e6c0f4b718'
+down_revision: Union[str, None] = '1d5f8a3c7e29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'compliance_decisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('chain_id', sa.String(length=32), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('decided_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('campaign_id', sa.Integer(), nullable=True),
+        sa.Column('regulation_type', sa.String(), nullable=False),
+        sa.Column('approved', sa.Boolean(), nullable=False),
+        sa.Column('reason', sa.String(), nullable=True),
+        sa.Column('inputs', sa.Text(), nullable=False),
+        sa.Column('compliance_version', sa.String(), nullable=False),
+        sa.Column('prev_hash', sa.String(length=64), nullable=False),
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('chain_id', 'seq', name='uq_compliance_decisions_chain_seq'),
+    )
+    op.create_index(op.f('ix_compliance_decisions_id'), 'compliance_decisions', ['id'], unique=False)
+    op.create_index(op.f('ix_compliance_decisions_user_id'), 'compliance_decisions', ['user_id'], unique=False)
+    op.create_index('ix_compliance_decisions_decided_at', 'compliance_decisions', ['decided_at'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Append-only: the hash chain makes edits evident, the trigger stops them outright
+        op.execute("""
+            CREATE FUNCTION compliance_decisions_append_only() RETURNS trigger AS $$
+            BEGIN
+                RAISE EXCEPTION 'compliance_decisions is append-only';
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            CREATE TRIGGER compliance_decisions_append_only
+            BEFORE UPDATE OR DELETE OR TRUNCATE ON compliance_decisions
+            FOR EACH STATEMENT EXECUTE FUNCTION compliance_decisions_append_only()
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP TRIGGER compliance_decisions_append_only ON compliance_decisions')
+        op.execute('DROP FUNCTION compliance_decisions_append_only()')
+    op.drop_index('ix_compliance_decisions_decided_at', table_name='compliance_decisions')
+    op.drop_index(op.f('ix_compliance_decisions_user_id'), table_name='compliance_decisions')
+    op.drop_index(op.f('ix_compliance_decisions_id'), table_name='compliance_decisions')
+    op.drop_table('compliance_decisions')
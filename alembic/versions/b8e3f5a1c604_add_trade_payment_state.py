@@ -0,0 +1,32 @@
+"""Add trade payment state (pending lots, fill ledger links)
+
+Revision ID: b8e3f5a1c604
+Revises: f4c1b7e9a2d6
+Create Date: 2026-10-20 10:12:41.862310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f5a1c604'
+down_revision: Union[str, None] = 'f4c1b7e9a2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('position_lots', sa.Column('pending', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('order_events', sa.Column('buy_ledger_id', sa.Integer(), nullable=True))
+    op.add_column('order_events', sa.Column('sell_ledger_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_order_events_buy_ledger_id'), 'order_events', ['buy_ledger_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_order_events_buy_ledger_id'), table_name='order_events')
+    op.drop_column('order_events', 'sell_ledger_id')
+    op.drop_column('order_events', 'buy_ledger_id')
+    op.drop_column('position_lots', 'pending')
@@ -0,0 +1,77 @@
+"""Add positions and position_lots
+
+Revision ID: c5b2e8f1a9d3
+Revises: a3e6c0f4b718
+Create Date: 2026-10-19 21:14:03.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5b2e8f1a9d3'
+down_revision: Union[str, None] = 'a3e6c0f4b718'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'positions',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('quantity_cents', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'campaign_id'),
+    )
+    op.create_table(
+        'position_lots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('ledger_id', sa.Integer(), nullable=False),
+        sa.Column('acquired_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('quantity_cents', sa.BigInteger(), nullable=False),
+        sa.Column('remaining_cents', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ledger_id'),
+    )
+    op.create_index(op.f('ix_position_lots_id'), 'position_lots', ['id'], unique=False)
+    op.create_index(
+        'ix_position_lots_open_fifo', 'position_lots', ['user_id', 'campaign_id', 'acquired_at', 'id'], unique=False,
+        postgresql_where=sa.text('remaining_cents > 0'), sqlite_where=sa.text('remaining_cents > 0'),
+    )
+
+    # Backfill from the investments settled so far. Past secondary trades are not
+    # replayed: they were never checked against holdings.
+    op.execute(
+        """
+        INSERT INTO position_lots (user_id, campaign_id, ledger_id, acquired_at, quantity_cents, remaining_cents)
+        SELECT user_id, campaign_id, id, created_at, amount_cents, amount_cents
+        FROM ledger
+        WHERE transaction_type = 'investment' AND status = 'settled'
+          AND user_id IS NOT NULL AND campaign_id IS NOT NULL AND created_at IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO positions (user_id, campaign_id, quantity_cents)
+        SELECT user_id, campaign_id, SUM(remaining_cents)
+        FROM position_lots
+        GROUP BY user_id, campaign_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_position_lots_open_fifo', table_name='position_lots')
+    op.drop_index(op.f('ix_position_lots_id'), table_name='position_lots')
+    op.drop_table('position_lots')
+    op.drop_table('positions')
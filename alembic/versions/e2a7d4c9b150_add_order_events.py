@@ -0,0 +1,63 @@
+"""Add order_events
+
+Revision ID: e2a7d4c9b150
+Revises: c5b2e8f1a9d3
+Create Date: 2026-10-19 22:02:47.519330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7d4c9b150'
+down_revision: Union[str, None] = 'c5b2e8f1a9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('side', sa.String(), nullable=True),
+        sa.Column('price_bps', sa.Integer(), nullable=True),
+        sa.Column('quantity_cents', sa.BigInteger(), nullable=True),
+        sa.Column('buy_order_id', sa.Integer(), nullable=True),
+        sa.Column('sell_order_id', sa.Integer(), nullable=True),
+        sa.Column('reason', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_order_events_id'), 'order_events', ['id'], unique=False)
+    op.create_index('ix_order_events_campaign_id_id', 'order_events', ['campaign_id', 'id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Append-only: order books are rebuilt by replaying this log
+        op.execute("""
+            CREATE FUNCTION order_events_append_only() RETURNS trigger AS $$
+            BEGIN
+                RAISE EXCEPTION 'order_events is append-only';
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            CREATE TRIGGER order_events_append_only
+            BEFORE UPDATE OR DELETE OR TRUNCATE ON order_events
+            FOR EACH STATEMENT EXECUTE FUNCTION order_events_append_only()
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP TRIGGER order_events_append_only ON order_events')
+        op.execute('DROP FUNCTION order_events_append_only()')
+    op.drop_index('ix_order_events_campaign_id_id', table_name='order_events')
+    op.drop_index(op.f('ix_order_events_id'), table_name='order_events')
+    op.drop_table('order_events')
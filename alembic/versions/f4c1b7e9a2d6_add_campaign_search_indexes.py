@@ -0,0 +1,40 @@
+"""Add campaign search indexes
+
+Revision ID: f4c1b7e9a2d6
+Revises: e2a7d4c9b150
+Create Date: 2026-10-19 22:48:30.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c1b7e9a2d6'
+down_revision: Union[str, None] = 'e2a7d4c9b150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_campaigns_funding_status_deadline_id', 'campaigns', ['funding_status', 'deadline', 'id'], unique=False)
+    op.create_index('ix_campaigns_deadline_id', 'campaigns', ['deadline', 'id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Expressions must match app.services.campaign_search.name_matches
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(
+            "CREATE INDEX ix_campaigns_name_tsv ON campaigns "
+            "USING gin (to_tsvector('simple', coalesce(name, '')))"
+        )
+        op.execute('CREATE INDEX ix_campaigns_name_trgm ON campaigns USING gin (name gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX ix_campaigns_name_trgm')
+        op.execute('DROP INDEX ix_campaigns_name_tsv')
+    op.drop_index('ix_campaigns_deadline_id', table_name='campaigns')
+    op.drop_index('ix_campaigns_funding_status_deadline_id', table_name='campaigns')
@@ -1,5 +1,5 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
@@ -8,20 +8,54 @@ from sqlalchemy.orm import Session
 from app import models, schemas
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.replica import ReadYourWrites
+from app.db.session import ReadSessionLocal, SessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
 
-def get_db() -> Generator:
+def _client_key(request: Request) -> str:
+    """
+    Identifies the client for read-your-writes: the token subject when a valid
+    bearer token is present, otherwise the client IP.
+    """
+    subject = security.token_subject(request.headers.get("authorization"))
+    if subject:
+        return f"user:{subject}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def get_db(request: Request) -> Generator:
     try:
         db = SessionLocal()
         yield db
+        if settings.READ_REPLICA_URL and db.info.get("committed_writes"):
+            # Keep this client's reads on the primary until the replica has the write
+            ReadYourWrites.mark(_client_key(request), ReadYourWrites.primary_lsn(db))
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
+def get_read_db(request: Request) -> Generator:
+    """
+    Session for read-only endpoints: the replica (READ_REPLICA_URL), unless this
+    client wrote recently and the replica has not replayed that write yet.
+    """
+    if not settings.READ_REPLICA_URL:
+        yield from get_db(request)
+        return
+    db = ReadSessionLocal()
+    try:
+        pending, lsn = ReadYourWrites.pending(_client_key(request))
+        if pending and not ReadYourWrites.replica_caught_up(db, lsn):
+            db.close()
+            db = SessionLocal()
+        yield db
+    finally:
+        db.close()
+
+def get_current_user_email(token: str = Depends(oauth2_scheme)) -> str:
+    """
+    Validates the token without touching the database, for handlers that
+    load the user together with other rows in a single query.
+    """
     try:
         payload = jwt.decode(
             token, security.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -35,7 +69,32 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    return token_data.email
+
+def get_current_user(
+    db: Session = Depends(get_db), email: str = Depends(get_current_user_email)
+) -> models.User:
+    user = db.query(models.User).filter(models.User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
+
+def get_current_user_read(
+    db: Session = Depends(get_read_db), email: str = Depends(get_current_user_email)
+) -> models.User:
+    """
+    Same as get_current_user, loaded through the read session.
+    """
+    return get_current_user(db, email)
+
+def get_optional_user_read(
+    request: Request, db: Session = Depends(get_read_db)
+) -> Optional[models.User]:
+    """
+    The caller when a valid bearer token is sent, else None (anonymous), for
+    public endpoints that personalize results for signed-in users.
+    """
+    email = security.token_subject(request.headers.get("authorization"))
+    if email is None:
+        return None
+    return db.query(models.User).filter(models.User.email == email).first()
@@ -0,0 +1,85 @@
+import json
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Type
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.services.idempotency import IdempotencyInProgress, IdempotencyKeyReused, IdempotencyService
+
+@contextmanager
+def _track_commits(db: Session) -> Iterator[dict]:
+    """
+    Sets `committed` once a transaction that wrote rows (a fee, a reservation,
+    a trade) commits: from then on a failed request has side effects to keep.
+    """
+    state = {"flushed": False, "committed": False}
+
+    def after_flush(session, flush_context):
+        state["flushed"] = True
+
+    def after_commit(session):
+        if state["flushed"]:
+            state["committed"] = True
+
+    def after_rollback(session):
+        state["flushed"] = False
+
+    listeners = (("after_flush", after_flush), ("after_commit", after_commit), ("after_rollback", after_rollback))
+    for name, fn in listeners:
+        event.listen(db, name, fn)
+    try:
+        yield state
+    finally:
+        for name, fn in listeners:
+            event.remove(db, name, fn)
+
+def run_idempotent(
+    db: Session,
+    idempotency_key: Optional[str],
+    owner: str,
+    scope: str,
+    payload: dict,
+    response_model: Type[BaseModel],
+    handler: Callable[[], Any],
+) -> Any:
+    """
+    Executes `handler` at most once per (owner, Idempotency-Key). Repeats get the
+    stored response replayed; a duplicate arriving while the first is still running gets 409.
+    A request that fails before committing anything releases the key so the client
+    may retry; one that fails afterwards (e.g. Stripe, once the fee is billed) has
+    its error response stored and replayed like a success.
+    """
+    if not idempotency_key:
+        return handler()
+
+    try:
+        claimed, completed = IdempotencyService.begin(db, owner, idempotency_key, scope, payload)
+    except IdempotencyInProgress:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is already in progress")
+    except IdempotencyKeyReused:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+
+    if completed is not None:
+        return JSONResponse(
+            content=json.loads(completed.response_body),
+            status_code=completed.response_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    with _track_commits(db) as commits:
+        try:
+            result = handler()
+        except Exception as e:
+            if not commits["committed"]:
+                IdempotencyService.release(db, claimed)
+            elif isinstance(e, HTTPException):
+                IdempotencyService.fail(db, claimed, e.status_code, {"detail": e.detail})
+            else:
+                IdempotencyService.fail(db, claimed, 500, {"detail": "Internal Server Error"})
+            raise
+
+    body = response_model.model_validate(result).model_dump(mode="json")
+    IdempotencyService.complete(db, claimed, 200, body)
+    return body
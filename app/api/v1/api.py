@@ -1,10 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, campaigns, ledger, login, webhooks, admin
+from app.api.v1.endpoints import users, campaigns, ledger, login, webhooks, admin, orders
 
 api_router = APIRouter()
 api_router.include_router(login.router, prefix="/login", tags=["login"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(campaigns.router, prefix="/campaigns", tags=["campaigns"])
 api_router.include_router(ledger.router, prefix="/ledger", tags=["ledger"])
+api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
 api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
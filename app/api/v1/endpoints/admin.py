@@ -1,10 +1,15 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from app import models, schemas
 from app.api import deps
 from app.core.config import settings
+from app.services.accreditation import AccreditationService
+from app.services.decision_log import verify_chain
+from app.services.exports import ExportService
+from app.services.user_import import UserImportService
 
 router = APIRouter()
 
@@ -19,6 +24,14 @@ def get_current_active_admin(
     #    raise HTTPException(status_code=400, detail="The user doesn't have enough privileges")
     return current_user
 
+def get_export_user(
+    current_user: models.User = Depends(deps.get_current_user),
+) -> models.User:
+    # Exports carry the whole ledger, so they need an explicit grant until roles exist
+    if current_user.email.lower() not in {email.lower() for email in settings.EXPORT_ALLOWED_EMAILS}:
+        raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
+    return current_user
+
 @router.post("/users/{user_id}/verify", response_model=schemas.User)
 def verify_accreditation(
     user_id: int,
@@ -39,8 +52,133 @@ def verify_accreditation(
     user_to_verify.accreditation_status = "VERIFIED_DOCS"
     user_to_verify.accreditation_verified_at = datetime.utcnow()
     user_to_verify.accreditation_verified_by = current_user.id
-    user_to_verify.accreditation_expiry = datetime.utcnow() + timedelta(days=90) # 90 day validity
+    user_to_verify.accreditation_expiry = datetime.utcnow() + timedelta(days=settings.ACCREDITATION_VALIDITY_DAYS)
     
     db.commit()
     db.refresh(user_to_verify)
     return user_to_verify
+
+
+@router.get("/accreditation/queue", response_model=schemas.ReviewQueue)
+def read_review_queue(
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user), # Should be admin
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+) -> Any:
+    """
+    Users with documents awaiting review, oldest first. Pass `next_after_id`
+    back as `after_id` to fetch the next page.
+    """
+    rows, next_after_id = AccreditationService.review_queue(db, after_id=after_id, limit=limit)
+    return {"items": rows, "next_after_id": next_after_id}
+
+@router.post("/accreditation/review", response_model=schemas.AccreditationReviewResult)
+def review_accreditations(
+    review_in: schemas.AccreditationReview,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user), # Should be admin
+) -> Any:
+    """
+    Bulk verify or reject pending users in a single statement.
+    Verification sets the reviewer, review time and expiry, like `/users/{user_id}/verify`.
+    """
+    if len(review_in.user_ids) > settings.ACCREDITATION_REVIEW_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.ACCREDITATION_REVIEW_BATCH_MAX} users per request",
+        )
+    updated = AccreditationService.review(
+        db, review_in.user_ids, approve=review_in.decision == "verify", reviewer_id=current_user.id,
+    )
+    updated_ids = set(updated)
+    skipped = sorted(set(review_in.user_ids) - updated_ids)
+    return {"updated": updated, "skipped": skipped}
+
+@router.post("/users/import", response_model=schemas.UserImportResult)
+def import_users(
+    import_in: schemas.UserImport,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user), # Should be admin
+) -> Any:
+    """
+    Bulk onboarding of investors migrating from another portal.
+    Rows that fail validation or already exist are reported in `errors`; the rest are created.
+    Larger migrations should use `python -m app.import_users`.
+    """
+    if len(import_in.users) > settings.USER_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.USER_IMPORT_MAX_ROWS} users per request",
+        )
+    return UserImportService.import_users(db, import_in.users)
+
+@router.post("/exports", response_model=schemas.ExportJob, status_code=202)
+def create_export(
+    export_in: schemas.ExportCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(get_export_user),
+) -> Any:
+    """
+    Queue a Parquet extract of ledger/billing_log for auditors, optionally for one
+    campaign and/or a created_at period. Poll the job, then download the zip.
+    """
+    job = models.ExportJob(
+        requested_by=current_user.id,
+        tables=",".join(dict.fromkeys(export_in.tables)),
+        campaign_id=export_in.campaign_id,
+        period_start=export_in.period_start,
+        period_end=export_in.period_end,
+    )
+    db.add(job)
+    db.commit()
+    try:
+        ExportService.enqueue(db, job)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Export queue unavailable, retry later")
+    return job
+
+@router.get("/exports/{job_id}", response_model=schemas.ExportJob)
+def read_export(
+    job_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(get_export_user),
+) -> Any:
+    job = db.get(models.ExportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+@router.get("/exports/{job_id}/download")
+def download_export(
+    job_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(get_export_user),
+) -> Any:
+    """
+    Streams the export zip: `manifest.json` plus `<table>/<partition>/part-N.parquet`.
+    """
+    job = db.get(models.ExportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+    return StreamingResponse(
+        ExportService.open_download(job),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="export_{job.id}.zip"'},
+    )
+
+@router.get("/compliance-decisions/chains/{chain_id}/verify", response_model=schemas.DecisionChainVerification)
+def verify_decision_chain(
+    chain_id: str,
+    db: Session = Depends(deps.get_read_db),
+    current_user: models.User = Depends(deps.get_current_user_read), # Should be admin
+) -> Any:
+    """
+    Recomputes a decision log hash chain to detect tampering.
+    """
+    result = verify_chain(db, chain_id)
+    if not result["records"]:
+        raise HTTPException(status_code=404, detail="Chain not found")
+    return result
@@ -1,8 +1,15 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app import schemas, models
 from app.api import deps
+from app.api.fast_json import FastJSONResponse, dollars
+from app.core.config import settings
+from app.core.money import to_cents
+from app.services.analytics import AnalyticsService
+from app.services.campaign_search import CampaignSearchService, InvalidCursor
 
 router = APIRouter()
 
@@ -17,7 +24,7 @@ def create_campaign(
     """
     campaign = models.Campaign(
         name=campaign_in.name,
-        target_amount=campaign_in.target_amount,
+        target_amount_cents=to_cents(campaign_in.target_amount),
         deadline=campaign_in.deadline,
         funding_status=campaign_in.funding_status,
         regulation_type=campaign_in.regulation_type,
@@ -28,22 +35,80 @@ def create_campaign(
     db.refresh(campaign)
     return campaign
 
-@router.get("/", response_model=List[schemas.Campaign])
+_CAMPAIGN_LIST_COLUMNS = (
+    models.Campaign.id, models.Campaign.name, models.Campaign.issuer_id, models.Campaign.target_amount_cents,
+    models.Campaign.deadline, models.Campaign.funding_status, models.Campaign.regulation_type,
+    models.Campaign.escrow_wallet_id, models.Campaign.stripe_account_id, models.Campaign.created_at,
+)
+
+def _campaign_list_item(row) -> dict:
+    # Field order and values of schemas.Campaign
+    return {
+        "name": row.name,
+        "target_amount": dollars(row.target_amount_cents),
+        "deadline": row.deadline,
+        "funding_status": row.funding_status,
+        "regulation_type": row.regulation_type,
+        "escrow_wallet_id": row.escrow_wallet_id,
+        "stripe_account_id": row.stripe_account_id,
+        "id": row.id,
+        "issuer_id": row.issuer_id,
+        "created_at": row.created_at,
+    }
+
+@router.get("/", response_model=List[schemas.Campaign], response_class=FastJSONResponse)
 def read_campaigns(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
     """
     Retrieve campaigns.
+    Column tuples encoded straight to JSON: no ORM objects, no per-row validation.
     """
-    campaigns = db.query(models.Campaign).offset(skip).limit(limit).all()
-    return campaigns
+    rows = db.execute(select(*_CAMPAIGN_LIST_COLUMNS).offset(skip).limit(limit)).all()
+    return FastJSONResponse([_campaign_list_item(row) for row in rows])
+
+@router.get("/search", response_model=schemas.CampaignSearchPage, response_class=FastJSONResponse)
+def search_campaigns(
+    db: Session = Depends(deps.get_read_db),
+    current_user: Optional[models.User] = Depends(deps.get_optional_user_read),
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Matches words or part of the campaign name"),
+    regulation_type: Optional[List[str]] = Query(None),
+    funding_status: Optional[str] = None,
+    deadline_after: Optional[datetime] = None,
+    deadline_before: Optional[datetime] = None,
+    investable: bool = Query(False, description="Only open campaigns the caller may invest in now (requires a token)"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1),
+) -> Any:
+    """
+    Search campaigns, closing soonest first, with keyset pagination via `cursor`.
+    """
+    lanes = None
+    if investable:
+        if current_user is None:
+            raise HTTPException(status_code=401, detail="Sign in to filter by eligibility")
+        lanes = CampaignSearchService.investable_lanes(current_user)
+        funding_status = "active"
+        now = datetime.now(timezone.utc)
+        if deadline_after is None or deadline_after.replace(tzinfo=deadline_after.tzinfo or timezone.utc) < now:
+            deadline_after = now
+    try:
+        rows, next_cursor = CampaignSearchService.search(
+            db, _CAMPAIGN_LIST_COLUMNS,
+            q=q, regulation_types=regulation_type, funding_status=funding_status,
+            deadline_after=deadline_after, deadline_before=deadline_before, lanes=lanes,
+            cursor=cursor, limit=min(limit, settings.CAMPAIGN_SEARCH_MAX_LIMIT),
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return FastJSONResponse({"items": [_campaign_list_item(row) for row in rows], "next_cursor": next_cursor})
 
 @router.get("/{campaign_id}", response_model=schemas.Campaign)
 def read_campaign(
     campaign_id: int,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
 ) -> Any:
     """
     Get campaign by ID.
@@ -52,3 +117,30 @@ def read_campaign(
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
+
+@router.get("/issuer/{issuer_id}/stats", response_model=schemas.IssuerStats)
+def read_issuer_stats(
+    issuer_id: int,
+    db: Session = Depends(deps.get_read_db),
+    current_user: models.User = Depends(deps.get_current_user_read),
+) -> Any:
+    """
+    Issuer dashboard: per-campaign totals and totals by regulation lane.
+    Read from the summary tables (refreshed every ANALYTICS_REFRESH_SECONDS).
+    """
+    return AnalyticsService.issuer_stats(db, issuer_id)
+
+@router.get("/{campaign_id}/stats", response_model=schemas.CampaignStats)
+def read_campaign_stats(
+    campaign_id: int,
+    db: Session = Depends(deps.get_read_db),
+    current_user: models.User = Depends(deps.get_current_user_read),
+    days: int = Query(30, ge=1, le=366),
+) -> Any:
+    """
+    Investor count, amounts by status and daily inflow for the last `days` days.
+    Read from the summary tables (refreshed every ANALYTICS_REFRESH_SECONDS).
+    """
+    if db.get(models.Campaign, campaign_id) is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return AnalyticsService.campaign_stats(db, campaign_id, days=days)
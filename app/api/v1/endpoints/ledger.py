@@ -1,108 +1,192 @@
-from typing import Any, List
-from sqlalchemy import func
-from fastapi import APIRouter, Depends, HTTPException
+import uuid
+from typing import Any, Dict, List, NamedTuple, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy import inspect, select
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app import schemas, models
 from app.api import deps
+from app.api.fast_json import FastJSONResponse, dollars
+from app.api.idempotency import run_idempotent
+from app.core.config import settings
+from app.core.money import from_cents
 from app.services.compliance import ComplianceService
-from app.worker import settle_investment_task
+from app.services.compliance_context import load_basket_compliance_context, load_compliance_context
+from app.services.decision_log import DecisionLogUnavailable, decision_log
+from app.services.investor_lock import InvestorLock, InvestorLockTimeout
+from app.services.positions import PositionService
+from app.services.verdict_cache import VerdictCache
 from app.services.email_service import EmailService
 
 router = APIRouter()
 
-@router.post("/invest", response_model=schemas.Ledger)
-def create_investment(
-    *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
-    investment_in: schemas.LedgerCreate,
-) -> Any:
+# pending_payment may be cancelled before it is charged; only charged rows are refunded
+CANCELLABLE_STATUSES = ("pending_payment", "pending_settlement", "settled")
+REFUNDABLE_STATUSES = ("pending_settlement", "settled")
+
+class _Reservation(NamedTuple):
+    ledger_entry: models.Ledger
+    user_id: int
+    user_email: str
+    campaign_id: int
+    campaign_name: str
+
+def _decide(user: models.User, campaign: models.Campaign, inputs: dict, denial: Optional[str] = None) -> None:
     """
-    Create investment (Compliance Router + Turnstile).
+    Records the lane verdict in the compliance decision log (buffered, only
+    blocks on the database when the buffer is full) and raises 403 on denial,
+    or 503 when the decision cannot be recorded.
     """
-    # Verify the user is investing for themselves (Implicit via Token)
-    user = current_user
-    investment_in__user_id = user.id # Explicitly bind ID from token
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == investment_in.campaign_id).first()
-    if not campaign:
-        raise HTTPException(status_code=404, detail="Campaign not found")
+    try:
+        decision_log.record(
+            user_id=user.id,
+            campaign_id=campaign.id,
+            regulation_type=campaign.regulation_type,
+            approved=denial is None,
+            reason=denial,
+            inputs=inputs,
+        )
+    except DecisionLogUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if denial is not None:
+        raise HTTPException(status_code=403, detail=denial)
 
-    # --- TRAFFIC COP LOGIC (Compliance Router) ---
-    is_compliant = False
-    
+def _run_lanes(user: models.User, campaign: models.Campaign, amount_cents: int, past_12mo_investments_cents: int) -> None:
+    """
+    Compliance Router: runs the campaign's lane for `amount_cents`, raising 403
+    on denial. `past_12mo_investments_cents` is the Reg CF exposure to count
+    the amount against.
+    """
     # Lane A: Reg CF
     if campaign.regulation_type == "REG_CF":
+        inputs = {
+            "kyc_status": user.kyc_status,
+            "is_accredited": user.is_accredited,
+            "amount_cents": amount_cents,
+            "annual_limit_cents": user.reg_cf_annual_limit_cents,
+            "past_12mo_investments_cents": past_12mo_investments_cents,
+        }
         # 1. KYC Check
         if not ComplianceService.check_kyc(user):
-            raise HTTPException(status_code=403, detail="User is not KYC verified")
-            
+            _decide(user, campaign, inputs, "User is not KYC verified")
+
         # 2. Investment Limits (SEC § 227.100)
-        from datetime import timedelta
-        one_year_ago = datetime.now() - timedelta(days=365)
-        past_investments_sum = db.query(func.sum(models.Ledger.amount)).filter(
-            models.Ledger.user_id == user.id,
-            models.Ledger.created_at >= one_year_ago,
-            models.Ledger.transaction_type == "investment",
-            models.Ledger.status.in_(["pending_settlement", "settled", "pending_payment"])
-        ).scalar() or 0.0
-
-        if not ComplianceService.check_investment_limit(user, investment_in.amount, past_investments_sum):
-             raise HTTPException(status_code=403, detail="Investment exceeds SEC § 227.100 limits for non-accredited investors")
-        is_compliant = True
+        if not ComplianceService.check_investment_limit(user, amount_cents, past_12mo_investments_cents):
+            _decide(user, campaign, inputs, "Investment exceeds SEC § 227.100 limits for non-accredited investors")
+        _decide(user, campaign, inputs)
 
     # Lane B: Reg D 506(b)
     elif campaign.regulation_type == "506_B":
-        if not ComplianceService.check_reg_d_506b(user):
-             raise HTTPException(status_code=403, detail="Reg D 506(b) Requirements Failed: User must be known >30 days and Self-Certified.")
-        is_compliant = True
+        inputs = {"accreditation_status": user.accreditation_status, "user_created_at": user.created_at, "amount_cents": amount_cents}
+        if not VerdictCache.check(user, "506_B"):
+            _decide(user, campaign, inputs, "Reg D 506(b) Requirements Failed: User must be known >30 days and Self-Certified.")
+        _decide(user, campaign, inputs)
 
     # Lane C: Reg D 506(c)
     elif campaign.regulation_type == "506_C":
-        if not ComplianceService.check_reg_d_506c(user):
-             raise HTTPException(status_code=403, detail="Reg D 506(c) Requirements Failed: User must be Verified by Admin.")
-        is_compliant = True
+        inputs = {"accreditation_status": user.accreditation_status, "accreditation_expiry": user.accreditation_expiry, "amount_cents": amount_cents}
+        if not VerdictCache.check(user, "506_C"):
+            _decide(user, campaign, inputs, "Reg D 506(c) Requirements Failed: User must be Verified by Admin.")
+        _decide(user, campaign, inputs)
 
     else:
         # Default/Fallback (Treat as Reg CF or Fail)
         raise HTTPException(status_code=400, detail="Unknown Regulation Type")
 
+def _validation_fee(user: models.User, campaign: models.Campaign) -> models.BillingLog:
+    # Billed once per compliant check
+    return models.BillingLog(
+        user_id=user.id,
+        transaction_id=f"val_{user.id}_{campaign.id}_{int(datetime.now().timestamp())}",
+        description=f"Validation Check: {campaign.regulation_type}",
+        fee_amount_cents=200
+    )
+
+def _reserve_investment(db: Session, current_user_email: str, investment_in: schemas.LedgerCreate) -> _Reservation:
+    """
+    Runs the compliance lanes, bills the validation fee and reserves the amount
+    as a `pending_payment` ledger row, committed before any Stripe call so that
+    concurrent requests for the same investor count it against their limit.
+    """
+    # User, campaign and 12-month exposure in a single round trip
+    context = load_compliance_context(db, current_user_email, investment_in.campaign_id)
+    if context is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Verify the user is investing for themselves (Implicit via Token)
+    user = context.user
+    investment_in__user_id = user.id # Explicitly bind ID from token
+    campaign = context.campaign
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    # --- TRAFFIC COP LOGIC (Compliance Router) ---
+    _run_lanes(user, campaign, investment_in.amount_cents, context.past_12mo_investments_cents)
+
     # --- THE TURNSTILE (Monetization) ---
-    if is_compliant:
-        from app.models.billing import BillingLog
-        billing_log = BillingLog(
-            user_id=user.id,
-            transaction_id=f"val_{user.id}_{campaign.id}_{int(datetime.now().timestamp())}",
-            description=f"Validation Check: {campaign.regulation_type}",
-            fee_amount=2.00
-        )
-        db.add(billing_log)
-        db.commit() # Commit the fee immediately
-    
+    db.add(_validation_fee(user, campaign))
+
+    # Reservation: counts towards the 12-month limit until the payment fails or is cancelled
+    ledger_entry = models.Ledger(
+        user_id=investment_in__user_id,
+        campaign_id=investment_in.campaign_id,
+        amount_cents=investment_in.amount_cents,
+        transaction_type=investment_in.transaction_type,
+        status="pending_payment", # Wait for webhook
+    )
+    db.add(ledger_entry)
+    # Captured before commit: reading them afterwards would reload the expired rows
+    reservation = _Reservation(ledger_entry, user.id, user.email, campaign.id, campaign.name)
+    db.commit() # Commits the fee and the reservation, releasing the investor lock
+    return reservation
+
+@router.post("/invest", response_model=schemas.Ledger)
+def create_investment(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user_email: str = Depends(deps.get_current_user_email),
+    investment_in: schemas.LedgerCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+) -> Any:
+    """
+    Create investment (Compliance Router + Turnstile).
+    Retries carrying the same Idempotency-Key replay the first response.
+    """
+    return run_idempotent(
+        db, idempotency_key, current_user_email, "POST /ledger/invest",
+        investment_in.model_dump(mode="json"), schemas.Ledger,
+        lambda: _create_investment(db, current_user_email, investment_in),
+    )
+
+def _create_investment(db: Session, current_user_email: str, investment_in: schemas.LedgerCreate) -> models.Ledger:
+    # Same-investor requests are serialized from the exposure read until the
+    # reservation below is committed; other investors are not blocked.
+    try:
+        with InvestorLock.hold(db, current_user_email):
+            reservation = _reserve_investment(db, current_user_email, investment_in)
+    except InvestorLockTimeout:
+        raise HTTPException(status_code=409, detail="Another investment for this investor is in progress")
+
+    ledger_entry = reservation.ledger_entry
+
     # --- EXECUTION (Money Mover) ---
     try:
         from app.services.stripe_service import StripeService
         payment_intent = StripeService.create_payment_intent(
-            amount=investment_in.amount,
+            amount_cents=investment_in.amount_cents,
             metadata={
-                "user_id": user.id,
-                "campaign_id": campaign.id,
+                "user_id": reservation.user_id,
+                "campaign_id": reservation.campaign_id,
                 "transaction_type": "investment"
             }
         )
     except Exception as e:
+        # Release the reserved capacity
+        ledger_entry.status = "failed"
+        db.commit()
         raise HTTPException(status_code=400, detail=str(e))
 
-    # 4. Create Ledger Entry
-    ledger_entry = models.Ledger(
-        user_id=investment_in__user_id,
-        campaign_id=investment_in.campaign_id,
-        amount=investment_in.amount,
-        transaction_type=investment_in.transaction_type,
-        status="pending_payment", # Wait for webhook
-        stripe_payment_intent_id=payment_intent.id
-    )
-    db.add(ledger_entry)
+    ledger_entry.stripe_payment_intent_id = payment_intent.id
     db.commit()
     db.refresh(ledger_entry)
 
@@ -111,13 +195,141 @@ def create_investment(
     
     # Send Email
     EmailService.send_email(
-        to_email=user.email,
+        to_email=reservation.user_email,
         subject="Investment Initiated",
-        html_content=f"You have initiated an investment of ${investment_in.amount} in {campaign.name}."
+        html_content=f"You have initiated an investment of ${investment_in.amount} in {reservation.campaign_name}."
     )
 
     return ledger_entry
 
+class _BasketReservation(NamedTuple):
+    ledger_entries: List[models.Ledger]
+    user_id: int
+    user_email: str
+    campaign_names: Dict[int, str]
+    transfer_group: str
+
+def _reserve_basket(db: Session, current_user_email: str, checkout_in: schemas.CheckoutCreate) -> _BasketReservation:
+    """
+    _reserve_investment for a basket: one context query, every lane run before
+    anything is written, then all fees and reservations in one commit.
+    """
+    campaign_ids = [item.campaign_id for item in checkout_in.items]
+    context = load_basket_compliance_context(db, current_user_email, campaign_ids)
+    if context is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user = context.user
+    missing = [campaign_id for campaign_id in campaign_ids if campaign_id not in context.campaigns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Campaign not found: {', '.join(map(str, missing))}")
+
+    # The whole basket counts towards the 12-month limit, as if invested one by one
+    basket_cents = sum(item.amount_cents for item in checkout_in.items)
+    for item in checkout_in.items:
+        campaign = context.campaigns[item.campaign_id]
+        other_items_cents = basket_cents - item.amount_cents
+        try:
+            _run_lanes(user, campaign, item.amount_cents, context.past_12mo_investments_cents + other_items_cents)
+        except HTTPException as e:
+            raise HTTPException(status_code=e.status_code, detail=f"Campaign {campaign.id}: {e.detail}")
+        db.add(_validation_fee(user, campaign))
+
+    ledger_entries = [
+        models.Ledger(
+            user_id=user.id,
+            campaign_id=item.campaign_id,
+            amount_cents=item.amount_cents,
+            transaction_type="investment",
+            status="pending_payment", # Wait for webhook
+        )
+        for item in checkout_in.items
+    ]
+    db.add_all(ledger_entries)
+    # Captured before commit: reading them afterwards would reload the expired rows
+    reservation = _BasketReservation(
+        ledger_entries, user.id, user.email,
+        {campaign_id: campaign.name for campaign_id, campaign in context.campaigns.items()},
+        f"checkout_{uuid.uuid4().hex}",
+    )
+    db.commit() # Commits the fees and the reservations, releasing the investor lock
+    return reservation
+
+@router.post("/checkout", response_model=schemas.Checkout)
+def checkout(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user_email: str = Depends(deps.get_current_user_email),
+    checkout_in: schemas.CheckoutCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+) -> Any:
+    """
+    Invest in several campaigns at once: one compliance pass, one transaction
+    and a single PaymentIntent for the basket.
+    Retries carrying the same Idempotency-Key replay the first response.
+    """
+    if len(checkout_in.items) > settings.CHECKOUT_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail="Too many campaigns in one checkout")
+    return run_idempotent(
+        db, idempotency_key, current_user_email, "POST /ledger/checkout",
+        checkout_in.model_dump(mode="json"), schemas.Checkout,
+        lambda: _checkout(db, current_user_email, checkout_in),
+    )
+
+def _checkout(db: Session, current_user_email: str, checkout_in: schemas.CheckoutCreate) -> dict:
+    try:
+        with InvestorLock.hold(db, current_user_email):
+            reservation = _reserve_basket(db, current_user_email, checkout_in)
+    except InvestorLockTimeout:
+        raise HTTPException(status_code=409, detail="Another investment for this investor is in progress")
+
+    ledger_entries = reservation.ledger_entries
+    total_cents = sum(item.amount_cents for item in checkout_in.items)
+
+    # --- EXECUTION (Money Mover) ---
+    try:
+        from app.services.stripe_service import StripeService
+        payment_intent = StripeService.create_payment_intent(
+            amount_cents=total_cents,
+            transfer_group=reservation.transfer_group,
+            metadata={
+                "user_id": reservation.user_id,
+                "transaction_type": "checkout",
+                # Split of the charge, used when transferring to each issuer
+                **{f"campaign_{item.campaign_id}": item.amount_cents for item in checkout_in.items},
+            }
+        )
+    except Exception as e:
+        # Release the reserved capacity
+        for ledger_entry in ledger_entries:
+            ledger_entry.status = "failed"
+        db.commit()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    for ledger_entry in ledger_entries:
+        ledger_entry.stripe_payment_intent_id = payment_intent.id
+    db.commit()
+    # Reload the expired rows in one query rather than one refresh each
+    ledger_ids = [inspect(ledger_entry).identity[0] for ledger_entry in ledger_entries]
+    db.execute(select(models.Ledger).where(models.Ledger.id.in_(ledger_ids))).all()
+
+    # Send Email
+    lines = "".join(
+        f"<li>${item.amount} in {reservation.campaign_names[item.campaign_id]}</li>" for item in checkout_in.items
+    )
+    EmailService.send_email(
+        to_email=reservation.user_email,
+        subject="Investments Initiated",
+        html_content=f"You have initiated the following investments:<ul>{lines}</ul>"
+    )
+
+    return {
+        "transfer_group": reservation.transfer_group,
+        "amount": from_cents(total_cents),
+        "stripe_payment_intent_id": payment_intent.id,
+        "client_secret": payment_intent.client_secret,
+        "investments": ledger_entries,
+    }
+
 @router.post("/investments/{investment_id}/cancel", response_model=schemas.Ledger)
 def cancel_investment(
     investment_id: int,
@@ -127,27 +339,44 @@ def cancel_investment(
     """
     Cancel investment (Checks 48-hour rule).
     """
-    ledger_entry = db.query(models.Ledger).filter(models.Ledger.id == investment_id).first()
-    if not ledger_entry:
+    # Locked so concurrent cancels of the same investment refund it once
+    ledger_entry = db.query(models.Ledger).filter(models.Ledger.id == investment_id).with_for_update().first()
+    # Trade legs are not investments: cancelling one would refund the buyer's payment
+    # while the lot stays with (or vanishes from) the other side
+    if not ledger_entry or ledger_entry.transaction_type != "investment":
         raise HTTPException(status_code=404, detail="Investment not found")
     
     if ledger_entry.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    if ledger_entry.status not in CANCELLABLE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Investment is {ledger_entry.status} and cannot be cancelled")
+
     campaign = db.query(models.Campaign).filter(models.Campaign.id == ledger_entry.campaign_id).first()
     
     # Compliance: 48-Hour Rule
     if not ComplianceService.check_cancellation_window(campaign.deadline):
         raise HTTPException(status_code=403, detail="Cancellation window closed (within 48 hours of deadline)")
 
-    # Refund via Stripe
-    if ledger_entry.stripe_payment_intent_id:
+    # The refund covers the whole investment, so none of it may have been resold
+    if ledger_entry.status == "settled" and PositionService.sold_from(db, ledger_entry):
+        raise HTTPException(status_code=409, detail="Part of this investment has already been sold")
+
+    # Refund via Stripe; a pending_payment investment has not been charged yet
+    if ledger_entry.stripe_payment_intent_id and ledger_entry.status in REFUNDABLE_STATUSES:
         try:
             from app.services.stripe_service import StripeService
-            StripeService.refund_payment(ledger_entry.stripe_payment_intent_id)
+            # Partial: a checkout PaymentIntent also carries other investments
+            StripeService.refund_payment(
+                ledger_entry.stripe_payment_intent_id,
+                amount_cents=ledger_entry.amount_cents,
+                idempotency_key=f"refund_{ledger_entry.id}",
+            )
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Stripe Refund Failed: {str(e)}")
 
+    if ledger_entry.status == "settled":
+        PositionService.release(db, ledger_entry)
     ledger_entry.status = "cancelled"
     db.commit()
     db.refresh(ledger_entry)
@@ -161,38 +390,30 @@ def cancel_investment(
 
     return ledger_entry
 
-@router.post("/trade", response_model=schemas.Ledger)
-def trade_secondary_market(
-    *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
-    trade_in: schemas.LedgerCreate,
-    original_transaction_date: datetime, # simplified for demo
-) -> Any:
-    """
-    Secondary market trade (Checks Lockup).
-    """
-    # Compliance Check
-    if not ComplianceService.check_lockup_period(original_transaction_date):
-        raise HTTPException(status_code=403, detail="Asset is under 1-year lockup period (SEC Rule 501)")
+_LEDGER_LIST_COLUMNS = (
+    models.Ledger.id, models.Ledger.user_id, models.Ledger.campaign_id, models.Ledger.amount_cents,
+    models.Ledger.transaction_type, models.Ledger.status, models.Ledger.stripe_payment_intent_id, models.Ledger.created_at,
+)
 
-    ledger_entry = models.Ledger(
-        user_id=current_user.id,
-        campaign_id=trade_in.campaign_id,
-        amount=trade_in.amount,
-        transaction_type=trade_in.transaction_type,
-        status=trade_in.status,
-    )
-    db.add(ledger_entry)
-    db.commit()
-    db.refresh(ledger_entry)
-    return ledger_entry
+def _ledger_list_item(row) -> dict:
+    # Field order and values of schemas.Ledger
+    return {
+        "amount": dollars(row.amount_cents),
+        "transaction_type": row.transaction_type,
+        "status": row.status,
+        "id": row.id,
+        "user_id": row.user_id,
+        "campaign_id": row.campaign_id,
+        "stripe_payment_intent_id": row.stripe_payment_intent_id,
+        "client_secret": None,
+        "created_at": row.created_at,
+    }
 
-@router.get("/{user_id}", response_model=List[schemas.Ledger])
+@router.get("/{user_id}", response_model=List[schemas.Ledger], response_class=FastJSONResponse)
 def read_transactions(
     user_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_read_db),
+    current_user: models.User = Depends(deps.get_current_user_read),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
@@ -202,5 +423,8 @@ def read_transactions(
     if current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to view these transactions")
     
-    transactions = db.query(models.Ledger).filter(models.Ledger.user_id == user_id).offset(skip).limit(limit).all()
-    return transactions
+    rows = db.execute(
+        select(*_LEDGER_LIST_COLUMNS).where(models.Ledger.user_id == user_id).offset(skip).limit(limit)
+    ).all()
+    # Column tuples encoded straight to JSON: no ORM objects, no per-row validation
+    return FastJSONResponse([_ledger_list_item(row) for row in rows])
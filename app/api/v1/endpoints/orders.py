@@ -0,0 +1,137 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.api import deps
+from app.api.idempotency import run_idempotent
+from app.core.config import settings
+from app.core.money import from_cents
+from app.services.decision_log import DecisionLogUnavailable
+from app.services.investor_lock import InvestorLockTimeout
+from app.services.order_book import Fill, MatchResult, Order
+from app.services.orders import OrderRejected, OrderService, TradePayment
+
+router = APIRouter()
+
+def _fill_out(fill: Fill, payment: TradePayment, user_id: int) -> dict:
+    out = {
+        "buy_order_id": fill.buy_order.id,
+        "sell_order_id": fill.sell_order.id,
+        "price_bps": fill.price_bps,
+        "quantity": from_cents(fill.quantity_cents),
+        "amount": from_cents(fill.amount_cents),
+        "payment_status": payment.status,
+    }
+    if fill.buy_order.user_id == user_id:
+        out["stripe_payment_intent_id"] = payment.stripe_payment_intent_id
+        out["client_secret"] = payment.client_secret
+    return out
+
+def _order_out(order: Order, campaign_id: int, result: Optional[MatchResult] = None, payments: List[TradePayment] = ()) -> dict:
+    if not order.remaining_cents:
+        status = "filled"
+    else:
+        status = "open" if order.active else "cancelled"
+    return {
+        "id": order.id,
+        "campaign_id": campaign_id,
+        "side": order.side,
+        "price_bps": order.price_bps,
+        "quantity": from_cents(order.quantity_cents),
+        "remaining": from_cents(order.remaining_cents),
+        "status": status,
+        "fills": [_fill_out(fill, payment, order.user_id) for fill, payment in zip(result.fills if result else [], payments)],
+        "cancelled": [{"order_id": cancelled.id, "reason": reason} for cancelled, reason in (result.cancelled if result else [])],
+    }
+
+@router.post("/", response_model=schemas.Order)
+def place_order(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+    order_in: schemas.OrderCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+) -> Any:
+    """
+    Place a secondary-market order; it is matched immediately in price-time
+    priority. Retries carrying the same Idempotency-Key replay the first response.
+    """
+    return run_idempotent(
+        db, idempotency_key, current_user.email, "POST /orders", order_in.model_dump(mode="json"), schemas.Order,
+        lambda: _place_order(db, current_user, order_in),
+    )
+
+def _place_order(db: Session, current_user: models.User, order_in: schemas.OrderCreate) -> dict:
+    campaign = db.query(models.Campaign).filter(models.Campaign.id == order_in.campaign_id).first()
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    try:
+        order, result, payments = OrderService.place(
+            db, current_user, campaign, order_in.side,
+            order_in.price_bps if order_in.order_type == "limit" else None, order_in.quantity_cents,
+        )
+    except OrderRejected as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except InvestorLockTimeout:
+        raise HTTPException(status_code=409, detail="The order book is busy, retry")
+    except DecisionLogUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return _order_out(order, campaign.id, result, payments)
+
+@router.delete("/{order_id}", response_model=schemas.Order)
+def cancel_order(
+    order_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Cancel what is left of an open order.
+    """
+    placed = db.get(models.OrderEvent, order_id)
+    try:
+        order = OrderService.cancel(db, current_user, order_id)
+    except InvestorLockTimeout:
+        raise HTTPException(status_code=409, detail="The order book is busy, retry")
+    if order is None:
+        raise HTTPException(status_code=404, detail="Open order not found")
+    return _order_out(order, placed.campaign_id)
+
+@router.get("/payments", response_model=List[schemas.Ledger])
+def read_trade_payments(
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    The current user's unpaid trade purchases, with the client secret to confirm
+    each payment. Covers fills of resting buy orders, matched by someone else's
+    order. Unpaid after TRADE_PAYMENT_WINDOW_HOURS, a purchase is unwound.
+    """
+    entries = db.query(models.Ledger).filter(
+        models.Ledger.user_id == current_user.id,
+        models.Ledger.transaction_type == "trade_buy",
+        models.Ledger.status == "pending_payment",
+        models.Ledger.stripe_payment_intent_id.is_not(None),
+    ).order_by(models.Ledger.id).all()
+    from app.services.stripe_service import StripeService
+    for entry in entries:
+        try:
+            entry.client_secret = StripeService.retrieve_payment_intent(entry.stripe_payment_intent_id).client_secret
+        except Exception:
+            raise HTTPException(status_code=503, detail="Payment provider unavailable, retry later")
+    return entries
+
+@router.get("/book/{campaign_id}", response_model=schemas.OrderBookDepth)
+def read_order_book(
+    campaign_id: int,
+    db: Session = Depends(deps.get_db),
+    levels: int = settings.ORDER_BOOK_DEPTH_LEVELS,
+) -> Any:
+    """
+    Aggregated price levels of a campaign's order book.
+    """
+    depth = OrderService.depth(db, campaign_id, min(max(levels, 1), settings.ORDER_BOOK_DEPTH_LEVELS))
+    return {
+        "campaign_id": campaign_id,
+        "bids": [{"price_bps": price, "quantity": from_cents(quantity)} for price, quantity in depth["bids"]],
+        "asks": [{"price_bps": price, "quantity": from_cents(quantity)} for price, quantity in depth["asks"]],
+    }
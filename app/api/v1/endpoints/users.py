@@ -7,7 +7,13 @@ from sqlalchemy.orm import Session
 from app import models, schemas
 from app.api import deps
 from app.core.config import settings
-from datetime import datetime # Ensure deps is imported if not already
+from app.core.money import from_cents
+from datetime import datetime, timezone # Ensure deps is imported if not already
+from app.services.compliance import COMPLIANCE_VERSION
+from app.services.investment_limit import InvestmentLimitService
+from app.services.kyc import KycService
+from app.services.storage import DocumentRejected, StorageService
+from app.services.verdict_cache import VerdictCache
 
 router = APIRouter()
 
@@ -23,19 +29,44 @@ def upload_accreditation(
 ) -> Any:
     """
     Upload accreditation proof (PDF).
-    Updates status to PENDING_REVIEW.
+    Streams the file to document storage in chunks and updates status to PENDING_REVIEW.
+    Sync handler: runs in the threadpool, so the blocking upload never stalls the event loop.
     """
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
-    
-    # Mock S3 Upload: In prod, upload to S3 and save URL
-    logging.info(f"Mocking upload of {file.filename} for user {current_user.id}")
-    
+
+    try:
+        key = StorageService.store_accreditation_document(current_user.id, file.file)
+    except DocumentRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    logging.info(f"Stored accreditation document {key} for user {current_user.id}")
+
+    current_user.accreditation_document_key = key
     current_user.accreditation_status = "PENDING_REVIEW"
     db.commit()
     db.refresh(current_user)
     return current_user
 
+@router.get("/me/investment-limit", response_model=schemas.InvestmentLimit)
+def read_investment_limit(
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Current SEC § 227.100 limit and remaining capacity, read from the stored values.
+    """
+    stale = not InvestmentLimitService.exposure_is_current(current_user)
+    invested = InvestmentLimitService.ensure_current(db, current_user)
+    limit = {
+        "annual_limit": from_cents(current_user.reg_cf_annual_limit_cents),
+        "invested_12mo": from_cents(invested),
+        "remaining": from_cents(InvestmentLimitService.remaining_capacity(current_user)),
+        "window_resets_at": current_user.reg_cf_window_resets_at,
+    }
+    if stale:
+        db.commit() # Persist the recomputed exposure
+    return limit
+
 @router.post("/", response_model=schemas.User)
 def create_user(
     *,
@@ -66,8 +97,8 @@ def create_user(
 @router.get("/{user_id}", response_model=schemas.User)
 def read_user(
     user_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_read_db),
+    current_user: models.User = Depends(deps.get_current_user_read),
 ) -> Any:
     """
     Get user by ID.
@@ -77,6 +108,49 @@ def read_user(
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
+@router.get("/{user_id}/eligibility", response_model=schemas.Eligibility)
+def read_user_eligibility(
+    user_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user_email: str = Depends(deps.get_current_user_email),
+) -> Any:
+    """
+    Amount-independent lane eligibility (KYC gate for Reg CF, 506(b), 506(c)).
+    Served from the verdict cache; the user row is only loaded on a miss.
+    """
+    verdicts = VerdictCache.eligibility(
+        user_id, lambda: db.query(models.User).filter(models.User.id == user_id).first()
+    )
+    if not verdicts:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {
+        "user_id": user_id,
+        "compliance_version": COMPLIANCE_VERSION,
+        "lanes": {
+            lane: {
+                "eligible": eligible,
+                "valid_until": datetime.fromtimestamp(valid_until, timezone.utc) if valid_until else None,
+            }
+            for lane, (eligible, valid_until) in verdicts.items()
+        },
+    }
+
+@router.post("/kyc/batch", response_model=schemas.KycBatchResult)
+def update_kyc_statuses(
+    batch_in: schemas.KycBatch,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Apply many KYC status changes in one transaction (e.g. a provider's result export).
+    """
+    if len(batch_in.updates) > settings.KYC_BATCH_MAX_UPDATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.KYC_BATCH_MAX_UPDATES} updates per request",
+        )
+    return KycService.apply_updates(db, ((u.user_id, u.kyc_status) for u in batch_in.updates))
+
 @router.post("/{user_id}/kyc", response_model=schemas.User)
 def update_kyc_status(
     user_id: int,
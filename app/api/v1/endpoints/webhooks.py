@@ -1,13 +1,20 @@
 
 from fastapi import APIRouter, Header, HTTPException, Request, Depends
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from app import models
+from starlette.concurrency import run_in_threadpool
+from app import models, schemas
 from app.api import deps
 from app.core import config
+from app.services.kyc import KycService, verify_provider_signature
+from app.services.orders import OrderService
+from app.services.positions import PositionService
 from app.services.stripe_service import StripeService
 
 router = APIRouter()
 
+TRADE_TYPES = ("trade_buy", "trade_sell")
+
 @router.post("/stripe")
 async def stripe_webhook(
     request: Request,
@@ -25,21 +32,63 @@ async def stripe_webhook(
 
     if event["type"] == "payment_intent.succeeded":
         payment_intent = event["data"]["object"]
-        # Find ledger entry by pi_id
-        ledger_entry = db.query(models.Ledger).filter(
+        # Find ledger entries by pi_id (a checkout PaymentIntent pays several)
+        ledger_entries = db.query(models.Ledger).filter(
             models.Ledger.stripe_payment_intent_id == payment_intent["id"]
-        ).first()
-        if ledger_entry:
+        ).all()
+        for ledger_entry in ledger_entries:
+            if ledger_entry.status == "cancelled": # Refunded out of a checkout before capture
+                continue
+            if ledger_entry.transaction_type in TRADE_TYPES and ledger_entry.status == "failed":
+                continue # Unwound already: the quantity went back to the seller
             ledger_entry.status = "settled"
+            # Opens the investment's lot, or releases the buyer's pending trade lot
+            PositionService.record_settlement(db, ledger_entry)
+        if ledger_entries:
             db.commit()
 
     elif event["type"] == "payment_intent.payment_failed":
         payment_intent = event["data"]["object"]
-        ledger_entry = db.query(models.Ledger).filter(
-             models.Ledger.stripe_payment_intent_id == payment_intent["id"]
-        ).first()
-        if ledger_entry:
-             ledger_entry.status = "failed"
-             db.commit()
+        await run_in_threadpool(_fail_payment, db, payment_intent["id"])
 
     return {"status": "success"}
+
+def _fail_payment(db: Session, payment_intent_id: str) -> None:
+    ledger_entries = db.query(models.Ledger).filter(
+         models.Ledger.stripe_payment_intent_id == payment_intent_id
+    ).all()
+    for ledger_entry in ledger_entries:
+        if ledger_entry.transaction_type == "trade_buy":
+            # Cancels the PaymentIntent and gives the seller back the quantity (both legs fail)
+            OrderService.fail_trade(db, ledger_entry)
+        elif ledger_entry.transaction_type != "trade_sell":
+            ledger_entry.status = "failed"
+    if ledger_entries:
+        db.commit()
+
+@router.post("/kyc")
+async def kyc_webhook(
+    request: Request,
+    x_kyc_signature: str = Header(None),
+    db: Session = Depends(deps.get_db),
+):
+    """
+    KYC provider callback carrying a burst of results, applied as one batch.
+    Signed with HMAC-SHA256 of the raw body (KYC_WEBHOOK_SECRET) in X-KYC-Signature.
+    """
+    if not config.settings.KYC_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="KYC webhook not configured")
+    payload = await request.body()
+    if not verify_provider_signature(payload, x_kyc_signature, config.settings.KYC_WEBHOOK_SECRET):
+        raise HTTPException(status_code=400, detail="Invalid KYC Signature")
+
+    try:
+        callback = schemas.KycProviderCallback.model_validate_json(payload)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Malformed KYC payload")
+    if len(callback.results) > config.settings.KYC_BATCH_MAX_UPDATES:
+        raise HTTPException(status_code=413, detail="Too many results in one callback")
+
+    updates, ignored = KycService.parse_provider_results(callback.results)
+    result = await run_in_threadpool(KycService.apply_updates, db, updates)
+    return {"status": "success", "ignored": len(ignored), **result}
@@ -17,3 +17,49 @@ celery_app = Celery(
 
 # Fix circular import: Import worker tasks after app is initialized
 celery_app.conf.imports = ["app.worker"]
+
+# Periodic jobs, run by `celery -A app.core.celery_app beat`
+celery_app.conf.beat_schedule = {
+    "purge-expired-idempotency-keys": {
+        "task": "app.worker.purge_expired_idempotency_keys",
+        "schedule": 3600.0,
+    },
+    # Idempotent; daily keeps months of premade partitions ahead of the inserts
+    "maintain-partitions": {
+        "task": "app.worker.maintain_partitions",
+        "schedule": 86400.0,
+    },
+    # Gives sellers back the quantity of fills the buyer did not pay for in time
+    "expire-unpaid-trades": {
+        "task": "app.worker.expire_unpaid_trades",
+        "schedule": 3600.0,
+    },
+    # Incremental: only campaigns with ledger changes since the last run
+    "refresh-campaign-stats": {
+        "task": "app.worker.refresh_campaign_stats",
+        "schedule": settings.ANALYTICS_REFRESH_SECONDS,
+    },
+}
+
+# --- Task duration metrics ---
+import time
+from celery.signals import task_prerun, task_postrun, worker_ready
+from app.core import metrics
+
+_task_start_times = {}
+
+@task_prerun.connect
+def _record_task_start(task_id=None, **kwargs):
+    _task_start_times[task_id] = time.perf_counter()
+
+@task_postrun.connect
+def _record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    start = _task_start_times.pop(task_id, None)
+    if start is not None:
+        metrics.CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+
+@worker_ready.connect
+def _start_metrics_exporter(**kwargs):
+    if settings.CELERY_METRICS_PORT:
+        from prometheus_client import start_http_server
+        start_http_server(settings.CELERY_METRICS_PORT, registry=metrics.get_registry())
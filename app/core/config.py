@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Union
 from pydantic import AnyHttpUrl, validator
 
 class Settings(BaseSettings):
@@ -23,15 +23,129 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: Optional[str] = None
     POSTGRES_DB: Optional[str] = None
     DATABASE_URL: Optional[str] = "sqlite:///./sql_app.db"
+    # Streaming replica for read-only endpoints (reads use the primary when unset)
+    READ_REPLICA_URL: Optional[str] = None
+    # After a client writes, its reads stay on the primary until the replica has replayed
+    # the write (Postgres LSN) or, at the latest, for this long
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Shares read-your-writes markers across API processes
+    READ_YOUR_WRITES_REDIS_URL: Optional[str] = None
     
     SENTRY_DSN: Optional[str] = None
+    # Fraction of requests traced by Sentry; tracing every request is too expensive in production
+    SENTRY_TRACES_SAMPLE_RATE: float = 0.05
+
+    METRICS_ENABLED: bool = True
+    # Port for the Celery worker's Prometheus exporter (disabled when unset)
+    CELERY_METRICS_PORT: Optional[int] = None
+
+    # Query profiler: always-on slow query log, per-request N+1 detection
+    QUERY_PROFILER_ENABLED: bool = False  # Profile every request (development)
+    QUERY_PROFILER_ALLOW_HEADER: bool = False  # Profile single requests sent with `X-Query-Profile: 1` (development only)
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+
+    # Admission control (app.core.rate_limit): token buckets in Redis, or per process
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    RATE_LIMIT_IP_PER_MINUTE: int = 1200
+    RATE_LIMIT_CLIENT_PER_MINUTE: int = 600 # Per token subject, or per IP when anonymous
+    # Extra per-client budgets, keyed by "METHOD /path"
+    RATE_LIMIT_ROUTES: Dict[str, int] = {
+        "POST /api/v1/login/access-token": 10,
+        "POST /api/v1/ledger/invest": 30,
+        "POST /api/v1/orders/": 30,
+    }
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/", "/metrics"]
+    # Form posts whose route budget also applies per submitted `username`, whatever the IP
+    RATE_LIMIT_USERNAME_ROUTES: List[str] = ["POST /api/v1/login/access-token"]
+    # Reverse proxies (IPs or CIDRs) whose X-Forwarded-For / X-Real-IP names the client;
+    # other peers are keyed by their own address
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = []
+    # In-flight request caps per process for expensive routes (argon2, Stripe)
+    CONCURRENCY_LIMITS: Dict[str, int] = {
+        "POST /api/v1/login/access-token": 8,
+        "POST /api/v1/ledger/invest": 32,
+    }
+    CONCURRENCY_QUEUE_SECONDS: float = 2.0
+    # Shed load (503) while sessions wait longer than this for a pooled connection; 0 disables
+    LOAD_SHED_POOL_WAIT_MS: float = 500.0
 
     STRIPE_SECRET_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
+    KYC_WEBHOOK_SECRET: Optional[str] = None # HMAC-SHA256 key for POST /webhooks/kyc
     
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
     
+    # Per-investor serialization of limit checks: auto | postgres | redis | local
+    INVESTOR_LOCK_BACKEND: str = "auto"
+    INVESTOR_LOCK_REDIS_URL: Optional[str] = None
+    INVESTOR_LOCK_TIMEOUT_SECONDS: float = 10.0
+
+    # Idempotency-Key replay window for /ledger/invest, /ledger/checkout and /orders
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # An in-progress key older than this is treated as abandoned (crashed worker)
+    IDEMPOTENCY_IN_PROGRESS_TIMEOUT_SECONDS: int = 120
+
+    # POST /ledger/checkout: campaigns per basket (each adds a PaymentIntent metadata key; Stripe allows 50)
+    CHECKOUT_MAX_ITEMS: int = 20
+
+    # GET /campaigns/search page size cap
+    CAMPAIGN_SEARCH_MAX_LIMIT: int = 100
+
+    # Memoized 506(b)/506(c)/KYC verdicts; Redis shares them (and their invalidation) across
+    # workers. Without Redis each process only caches "not eligible" verdicts.
+    VERDICT_CACHE_TTL_SECONDS: int = 300
+    VERDICT_CACHE_MAX_ENTRIES: int = 100000
+    VERDICT_CACHE_REDIS_URL: Optional[str] = None
+
+    # Monthly ledger/billing_log partitions (Postgres): created ahead, and archived to document
+    # storage then dropped after retention. Off when unset; at least 13 (the Reg CF limit looks back 12 months)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PARTITION_RETENTION_MONTHS: Optional[int] = None
+
+    # Document storage for accreditation proofs and audit exports: filesystem | s3 (S3-compatible, e.g. MinIO)
+    STORAGE_BACKEND: str = "filesystem"
+    STORAGE_ROOT: str = "./document_storage"
+    STORAGE_S3_BUCKET: Optional[str] = None
+    STORAGE_S3_ENDPOINT_URL: Optional[str] = None # Credentials come from the standard AWS env vars
+    ACCREDITATION_UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 256 * 1024
+    ACCREDITATION_VALIDITY_DAYS: int = 90 # Document verification is valid this long
+    ACCREDITATION_REVIEW_BATCH_MAX: int = 1000 # Users per bulk verify/reject request
+
+    # Bulk investor import (POST /admin/users/import, python -m app.import_users)
+    USER_IMPORT_MAX_ROWS: int = 50000 # Per API request; the CLI has no limit
+    USER_IMPORT_CHUNK_SIZE: int = 1000 # Rows per dedupe query, INSERT and commit
+    USER_IMPORT_HASH_WORKERS: Optional[int] = None # argon2 hashing processes; None = CPU count
+
+    # Batched KYC status updates (POST /users/kyc/batch, POST /webhooks/kyc)
+    KYC_BATCH_MAX_UPDATES: int = 10000
+    KYC_NOTIFY_BATCH_SIZE: int = 500 # Status changes per notification task
+
+    # Issuer dashboard summary tables (app.services.analytics)
+    ANALYTICS_REFRESH_SECONDS: float = 60.0 # Beat interval of refresh_campaign_stats
+    ANALYTICS_REFRESH_OVERLAP_SECONDS: int = 300 # Re-scan window for late-committing ledger writes
+    ANALYTICS_REFRESH_CHUNK_SIZE: int = 500 # Campaigns rebuilt per transaction
+
+    # Parquet audit exports of ledger/billing_log (app.services.exports)
+    EXPORT_FETCH_SIZE: int = 5000 # Rows per server-side cursor fetch
+    EXPORT_ROW_GROUP_SIZE: int = 50000 # Rows buffered per Parquet row group
+    EXPORT_COMPRESSION: str = "zstd"
+    # Users (by email) who may queue and download exports; nobody when empty
+    EXPORT_ALLOWED_EMAILS: List[str] = []
+
+    # Hash-chained compliance decision log, buffered in process (app.services.decision_log)
+    DECISION_LOG_FLUSH_SECONDS: float = 1.0
+    DECISION_LOG_BATCH_SIZE: int = 500 # Rows per INSERT; also wakes the flusher early
+    DECISION_LOG_MAX_BUFFER: int = 10000 # Past this, requests flush synchronously, or get 503 while that fails
+
+    # Secondary-market order books, in memory and rebuilt from order_events (app.services.orders)
+    ORDER_BOOK_DEPTH_LEVELS: int = 20 # Max price levels per side in GET /orders/book/{campaign_id}
+    # A buyer who has not paid for a fill within this long loses it; the seller gets the quantity back
+    TRADE_PAYMENT_WINDOW_HOURS: int = 24
+
     SMTP_HOST: Optional[str] = None
     SMTP_PORT: Optional[int] = 587
     SMTP_USER: Optional[str] = None
@@ -0,0 +1,179 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Latency buckets tuned for an API whose hot paths should stay well under a second
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed while serving a request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL statements while serving a request.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds",
+    "Latency of calls to third-party services (Stripe, SMTP).",
+    ["service", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time.",
+    ["task", "state"],
+    buckets=LATENCY_BUCKETS + (30.0, 60.0),
+)
+REJECTED_REQUESTS = Counter(
+    "rejected_requests_total",
+    "Requests refused by admission control (rate_limited, concurrency, load_shed).",
+    ["reason"],
+)
+
+
+@dataclass
+class RequestStats:
+    """
+    Per-request counters filled in by the SQLAlchemy event hooks.
+    """
+    query_count: int = 0
+    query_time: float = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+# Called as observer(conn, statement, parameters, executemany, elapsed) after every statement
+_query_observers: List[Callable] = []
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def observe_queries(observer: Callable) -> None:
+    """
+    Hands every statement's timing to `observer` (e.g. the query profiler), so
+    statements are timed by one pair of cursor hooks.
+    """
+    instrument_sqlalchemy()
+    if observer not in _query_observers:
+        _query_observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.query_count += 1
+        stats.query_time += elapsed
+    for observer in _query_observers:
+        observer(conn, statement, parameters, executemany, elapsed)
+
+
+def instrument_sqlalchemy() -> None:
+    """
+    Counts statements and DB time for every engine (the app engine and any test engine).
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_external_call(service: str, operation: str):
+    """
+    Times a third-party call, e.g. `with track_external_call("stripe", "refund"):`.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_CALL_DURATION.labels(service, operation, outcome).observe(time.perf_counter() - start)
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Gunicorn and Celery prefork run several processes; when PROMETHEUS_MULTIPROC_DIR
+    is set, aggregate the per-process files instead of exposing a single worker.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_latest() -> bytes:
+    return generate_latest(get_registry())
+
+
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware recording latency and DB usage per route template
+    (`/api/v1/ledger/{user_id}`, not the raw path, to keep label cardinality bounded).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, route_path, str(status_code)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(method, route_path).observe(stats.query_count)
+            DB_TIME_PER_REQUEST.labels(method, route_path).observe(stats.query_time)
+
@@ -0,0 +1,54 @@
+from decimal import ROUND_DOWN, Decimal, InvalidOperation
+from typing import Optional, Union
+from sqlalchemy import Numeric, cast
+from sqlalchemy.ext.hybrid import hybrid_property
+
+# Amounts are stored and compared as integer cents; dollars only exist at the API boundary.
+CENT = Decimal("0.01")
+
+Amount = Union[int, float, str, Decimal]
+
+
+def to_cents(amount: Amount, strict: bool = True) -> int:
+    """
+    Converts a dollar amount to integer cents. Floats go through their shortest
+    repr (so 0.1 is 10 cents, not 10.000000000000000555). Amounts with a fraction
+    of a cent are rejected, or truncated when `strict` is False (declared figures
+    such as income, where the fraction is meaningless).
+    """
+    if isinstance(amount, float):
+        amount = repr(amount)
+    try:
+        value = Decimal(amount)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount!r}")
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {amount!r}")
+    if value != value.quantize(CENT):
+        if not strict:
+            return int(value.quantize(CENT, rounding=ROUND_DOWN) * 100)
+        raise ValueError(f"Amount {amount!r} has a fraction of a cent")
+    return int(value * 100)
+
+
+def from_cents(cents: Optional[int]) -> Optional[Decimal]:
+    return None if cents is None else (Decimal(cents) / 100).quantize(CENT)
+
+
+def dollars_property(cents_attr: str) -> hybrid_property:
+    """
+    Dollar view (Decimal) over an integer-cents column, so `Ledger(amount=10.5)`
+    stores `amount_cents=1050`. In SQL it is a NUMERIC expression; aggregates
+    should use the cents column directly.
+    """
+    def fget(self):
+        return from_cents(getattr(self, cents_attr))
+
+    def fset(self, value):
+        setattr(self, cents_attr, None if value is None else to_cents(value))
+
+    def expr(cls):
+        return cast(getattr(cls, cents_attr), Numeric(18, 2)) / 100
+
+    return hybrid_property(fget, fset, expr=expr)
+
@@ -0,0 +1,250 @@
+import asyncio
+import ipaddress
+import json
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import REJECTED_REQUESTS
+from app.db import pool_monitor
+
+# KEYS[1]: bucket; ARGV: refill rate (tokens/s), capacity. Uses the Redis clock so
+# API processes with skewed clocks share one consistent bucket.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+_redis_client = None
+_redis_script = None
+
+
+def _get_redis_script():
+    global _redis_client, _redis_script
+    if _redis_script is None:
+        import redis.asyncio
+        _redis_client = redis.asyncio.Redis.from_url(settings.RATE_LIMIT_REDIS_URL)
+        _redis_script = _redis_client.register_script(_TOKEN_BUCKET_LUA)
+    return _redis_script
+
+
+class LocalTokenBuckets:
+    """
+    In-process token buckets for single-process deployments and development.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def take(self, key: str, per_minute: int, now: Optional[float] = None) -> float:
+        """
+        Takes one token; returns 0 when allowed, else seconds until a token is available.
+        """
+        now = time.monotonic() if now is None else now
+        rate = per_minute / 60.0
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (float(per_minute), now))
+            tokens = min(per_minute, tokens + max(0.0, now - ts) * rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+            if len(self._buckets) >= self._max_keys and key not in self._buckets:
+                self._buckets.clear() # A missing bucket is a full one: only lets bursts through again
+            self._buckets[key] = (tokens, now)
+        return retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+local_buckets = LocalTokenBuckets()
+
+
+async def take_token(key: str, per_minute: int) -> float:
+    if settings.RATE_LIMIT_REDIS_URL:
+        try:
+            retry_after = await _get_redis_script()(keys=[f"reg-router:rl:{key}"], args=[per_minute / 60.0, per_minute])
+            return float(retry_after)
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take the API down with it
+            logging.warning(f"Rate limiter unavailable, admitting request: {e}")
+            return 0.0
+    return local_buckets.take(key, per_minute)
+
+
+# Login forms are tiny; a larger body is passed on without looking for a username
+_MAX_FORM_BYTES = 16 * 1024
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    if not settings.RATE_LIMIT_TRUSTED_PROXIES:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in ipaddress.ip_network(network, strict=False) for network in settings.RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def client_ip(scope, headers: Dict[bytes, bytes]) -> str:
+    """
+    The peer's address, or the client a trusted proxy (RATE_LIMIT_TRUSTED_PROXIES)
+    forwarded the request for. Anyone else's forwarding headers are ignored.
+    """
+    peer = scope["client"][0] if scope.get("client") else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    forwarded_for = headers.get(b"x-forwarded-for")
+    if forwarded_for:
+        # The rightmost address our proxies did not add; the ones before it are client-supplied
+        for address in reversed(forwarded_for.decode("latin-1").split(",")):
+            address = address.strip()
+            if address and not _is_trusted_proxy(address):
+                return address
+    real_ip = headers.get(b"x-real-ip")
+    return real_ip.decode("latin-1").strip() if real_ip else peer
+
+
+async def _buffer_body(receive):
+    """
+    Reads the request body up front; returns it and a `receive` that replays it to the app.
+    """
+    messages = []
+    size = 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        size += len(message.get("body", b""))
+        if not message.get("more_body") or size > _MAX_FORM_BYTES:
+            break
+    body = b"".join(message.get("body", b"") for message in messages) if size <= _MAX_FORM_BYTES else b""
+
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return body, replay
+
+
+def _form_username(body: bytes) -> Optional[str]:
+    values = parse_qs(body.decode("latin-1")).get("username")
+    return values[0].strip().lower() if values and values[0].strip() else None
+
+
+def _buckets_for(route_key: str, ip: str, subject: Optional[str], username: Optional[str] = None) -> List[Tuple[str, int]]:
+    client = f"user:{subject}" if subject else f"ip:{ip}"
+    buckets = [
+        (f"ip:{ip}", settings.RATE_LIMIT_IP_PER_MINUTE),
+        (client, settings.RATE_LIMIT_CLIENT_PER_MINUTE),
+    ]
+    route_budget = settings.RATE_LIMIT_ROUTES.get(route_key)
+    if route_budget:
+        buckets.append((f"{client}:{route_key}", route_budget))
+        if username:
+            # Guessing one account's password from many IPs shares one budget
+            buckets.append((f"username:{username}:{route_key}", route_budget))
+    return buckets
+
+
+def _reject(status_code: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+    ]
+    return {"type": "http.response.start", "status": status_code, "headers": headers}, {"type": "http.response.body", "body": body}
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI middleware, applied before routing:
+
+    1. Load shedding: 503 while sessions wait longer than LOAD_SHED_POOL_WAIT_MS
+       for a DB connection, so a saturated pool does not queue every request.
+    2. Token buckets per IP, per client (token subject, else IP) and per client and
+       route (RATE_LIMIT_ROUTES), plus per submitted username on login routes:
+       429 with Retry-After when one is empty. Behind a trusted proxy the IP is
+       the forwarded client's.
+    3. Concurrency caps per route (CONCURRENCY_LIMITS, per process) for expensive
+       handlers such as argon2 logins: 503 when no slot frees up in time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in settings.RATE_LIMIT_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route_key = f"{scope['method']} {scope['path']}"
+
+        if settings.LOAD_SHED_POOL_WAIT_MS and pool_monitor.recent_wait_ms() > settings.LOAD_SHED_POOL_WAIT_MS:
+            await self._send_rejection(send, "load_shed", 503, "Server is overloaded, retry later", 1)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        authorization = headers.get(b"authorization")
+        subject = security.token_subject(authorization.decode("latin-1")) if authorization else None
+        ip = client_ip(scope, headers)
+        username = None
+        if route_key in settings.RATE_LIMIT_USERNAME_ROUTES:
+            body, receive = await _buffer_body(receive)
+            username = _form_username(body)
+        for key, per_minute in _buckets_for(route_key, ip, subject, username):
+            retry_after = await take_token(key, per_minute)
+            if retry_after:
+                await self._send_rejection(send, "rate_limited", 429, "Rate limit exceeded", retry_after)
+                return
+
+        limit = settings.CONCURRENCY_LIMITS.get(route_key)
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+
+        semaphore = self._semaphores.setdefault(route_key, asyncio.Semaphore(limit))
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=settings.CONCURRENCY_QUEUE_SECONDS)
+        except asyncio.TimeoutError:
+            await self._send_rejection(send, "concurrency", 503, "Too many concurrent requests, retry later", 1)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            semaphore.release()
+
+    @staticmethod
+    async def _send_rejection(send, reason: str, status_code: int, detail: str, retry_after: float) -> None:
+        REJECTED_REQUESTS.labels(reason).inc()
+        start, body = _reject(status_code, detail, retry_after)
+        await send(start)
+        await send(body)
@@ -26,3 +26,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    """
+    Subject of a valid `Bearer` token in an Authorization header, else None.
+    Signature check only, no database lookup.
+    """
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.JWTError:
+        return None
+    return payload.get("sub")
@@ -0,0 +1,9 @@
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Normalizes a timestamp read back from the database to aware UTC: SQLite
+    hands back naive UTC values, Postgres aware ones (in the session time zone).
+    """
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Samples older than this no longer influence load shedding
+WINDOW_SECONDS = 5.0
+
+_samples: Deque[Tuple[float, float]] = deque(maxlen=2048)  # (recorded at, wait seconds)
+_lock = threading.Lock()
+_installed = False
+
+
+def record_wait(seconds: float) -> None:
+    with _lock:
+        _samples.append((time.monotonic(), seconds))
+
+
+def recent_wait_ms() -> float:
+    """
+    Mean time sessions recently waited for a pooled connection. Decays to 0 when
+    no sessions start, so shedding stops as soon as traffic backs off.
+    """
+    horizon = time.monotonic() - WINDOW_SECONDS
+    with _lock:
+        while _samples and _samples[0][0] < horizon:
+            _samples.popleft()
+        if not _samples:
+            return 0.0
+        return sum(wait for _, wait in _samples) / len(_samples) * 1000
+
+
+def clear() -> None:
+    with _lock:
+        _samples.clear()
+
+
+def install_pool_monitor() -> None:
+    """
+    Times how long each session's first statement waits for a connection: from
+    the statement being issued outside a transaction until the session begins.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _note_connection_request(orm_execute_state):
+        session = orm_execute_state.session
+        if not session.in_transaction():
+            session.info["_connection_requested_at"] = time.perf_counter()
+
+    @event.listens_for(Session, "after_begin")
+    def _note_connection_acquired(session, transaction, connection):
+        requested_at = session.info.pop("_connection_requested_at", None)
+        if requested_at is not None:
+            record_wait(time.perf_counter() - requested_at)
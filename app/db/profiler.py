@@ -0,0 +1,183 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.profiler")
+
+PROFILE_HEADER = b"x-query-profile"
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    duration_ms: float
+    plan: Optional[str] = None
+
+
+@dataclass
+class QueryProfile:
+    """
+    Statements executed within one request (or one `capture()` block).
+    """
+    statements: Counter = field(default_factory=Counter)
+    executions: Counter = field(default_factory=Counter)
+    slow_queries: List[SlowQuery] = field(default_factory=list)
+    total_time: float = 0.0
+
+    @property
+    def query_count(self) -> int:
+        return sum(self.statements.values())
+
+    def record(self, statement: str, parameters, duration: float) -> None:
+        self.statements[statement] += 1
+        self.executions[(statement, repr(parameters))] += 1
+        self.total_time += duration
+
+    def duplicates(self) -> List[Tuple[str, int]]:
+        """
+        Identical statement *and* parameters executed more than once (e.g. re-loading a row).
+        """
+        return [(stmt, count) for (stmt, _), count in self.executions.items() if count > 1]
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Same statement shape executed `threshold`+ times with varying parameters,
+        the signature of lazy loading inside a loop.
+        """
+        threshold = threshold or settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+        return [(stmt, count) for stmt, count in self.statements.items() if count >= threshold]
+
+
+_active_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    """
+    Fetches the plan on the raw DBAPI connection so the EXPLAIN itself is not
+    re-entered into the event hooks. It runs in the request's own transaction,
+    so on Postgres it is wrapped in a savepoint: a failed EXPLAIN would
+    otherwise abort that transaction and fail the request's next statement.
+    """
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        dbapi_connection = conn.connection.dbapi_connection
+        # SQLite keeps its transaction usable after an error; autocommit has none to abort
+        savepoint = conn.dialect.name != "sqlite" and not getattr(dbapi_connection, "autocommit", False)
+        cursor = dbapi_connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT query_profiler_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+            except Exception:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_profiler_explain")
+                raise
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT query_profiler_explain")
+            return plan
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+
+
+def _observe_query(conn, statement, parameters, executemany, duration) -> None:
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.record(statement, parameters, duration)
+
+    # Slow-query logging is always on: timing is cheap and EXPLAIN only runs for offenders.
+    duration_ms = duration * 1000
+    if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        plan = None if executemany else _explain(conn, statement, parameters)
+        logger.warning(f"Slow query ({duration_ms:.1f} ms): {statement}\nPlan:\n{plan}")
+        if profile is not None:
+            profile.slow_queries.append(SlowQuery(statement, duration_ms, plan))
+
+
+def install_query_profiler() -> None:
+    """
+    Hooks every engine, which covers `SessionLocal` and the sessions used in tests.
+    Statements are timed by the metrics cursor hooks.
+    """
+    metrics.observe_queries(_observe_query)
+
+
+@contextmanager
+def capture():
+    """
+    Profiles the statements executed inside the block:
+
+        with capture() as profile:
+            ...
+        assert profile.query_count <= 3
+    """
+    install_query_profiler()
+    profile = QueryProfile()
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+def report(profile: QueryProfile, label: str) -> None:
+    for statement, count in profile.duplicates():
+        logger.warning(f"{label}: duplicate query executed {count}x: {statement}")
+    for statement, count in profile.n_plus_one():
+        logger.warning(f"{label}: possible N+1, statement executed {count}x: {statement}")
+
+
+class QueryProfilerMiddleware:
+    """
+    Profiles every request when QUERY_PROFILER_ENABLED is set, or a single request
+    that carries `X-Query-Profile: 1` when QUERY_PROFILER_ALLOW_HEADER is set.
+    Findings are logged and summarized in `X-Query-*` response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _wants_profile(self, scope) -> bool:
+        if settings.QUERY_PROFILER_ENABLED:
+            return True
+        if not settings.QUERY_PROFILER_ALLOW_HEADER:
+            return False
+        headers: Dict[bytes, bytes] = dict(scope.get("headers") or [])
+        return headers.get(PROFILE_HEADER, b"").lower() in (b"1", b"true")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _active_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-query-count", str(profile.query_count).encode()),
+                    (b"x-query-time-ms", f"{profile.total_time * 1000:.1f}".encode()),
+                    (b"x-query-duplicates", str(len(profile.duplicates())).encode()),
+                    (b"x-query-n-plus-one", str(len(profile.n_plus_one())).encode()),
+                ]
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active_profile.reset(token)
+            report(profile, f"{scope['method']} {scope['path']}")
@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+# client key -> (primary WAL LSN after the write, or None; expires at)
+_local: Dict[str, Tuple[Optional[str], float]] = {}
+_lock = threading.Lock()
+_redis_client = None
+
+
+def _get_redis():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(settings.READ_YOUR_WRITES_REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+def _redis_key(client_key: str) -> str:
+    return f"reg-router:ryw:{client_key}"
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+class ReadYourWrites:
+    """
+    Remembers clients that recently wrote to the primary, so their reads are not
+    served by a replica that has not replayed the write yet.
+    """
+
+    @staticmethod
+    def mark(client_key: str, lsn: Optional[str]) -> None:
+        ttl = settings.READ_YOUR_WRITES_SECONDS
+        if settings.READ_YOUR_WRITES_REDIS_URL:
+            _get_redis().set(_redis_key(client_key), lsn or "", px=max(1, int(ttl * 1000)))
+            return
+        now = time.monotonic()
+        with _lock:
+            if len(_local) > 10000:
+                for key in [k for k, (_, expires_at) in _local.items() if expires_at <= now]:
+                    del _local[key]
+            _local[client_key] = (lsn, now + ttl)
+
+    @staticmethod
+    def pending(client_key: str) -> Tuple[bool, Optional[str]]:
+        """
+        (True, lsn) while the client's last write may not be visible on the replica.
+        """
+        if settings.READ_YOUR_WRITES_REDIS_URL:
+            value = _get_redis().get(_redis_key(client_key))
+            return (False, None) if value is None else (True, value or None)
+        with _lock:
+            entry = _local.get(client_key)
+            if entry is None:
+                return False, None
+            lsn, expires_at = entry
+            if expires_at <= time.monotonic():
+                del _local[client_key]
+                return False, None
+            return True, lsn
+
+    @staticmethod
+    def primary_lsn(db: Session) -> Optional[str]:
+        if not _is_postgres(db):
+            return None
+        return db.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+
+    @staticmethod
+    def replica_caught_up(read_db: Session, lsn: Optional[str]) -> bool:
+        if lsn is None or not _is_postgres(read_db):
+            return False # No LSN to compare: wait out the stickiness window
+        return bool(read_db.execute(
+            text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"), {"lsn": lsn}
+        ).scalar())
+
+    @staticmethod
+    def clear() -> None:
+        with _lock:
+            _local.clear()
+
+
+# --- Write tracking on primary sessions ---
+# `db.info["committed_writes"]` is set once a transaction that flushed changes commits.
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["pending_writes"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _note_bulk_write(orm_execute_state):
+    # Bulk query.update()/delete() statements do not flush
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info["pending_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _note_commit(session):
+    if session.info.pop("pending_writes", False):
+        session.info["committed_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _note_rollback(session, previous_transaction):
+    session.info.pop("pending_writes", None)
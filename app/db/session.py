@@ -17,3 +17,10 @@ if "sqlite" in SQLALCHEMY_DATABASE_URL:
 else:
     engine = create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read-only traffic goes to the replica when one is configured (see app.db.replica)
+if settings.READ_REPLICA_URL:
+    read_engine = create_engine(settings.READ_REPLICA_URL)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
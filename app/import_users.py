@@ -0,0 +1,52 @@
+"""
+Bulk-imports investors from a CSV file with a header row.
+
+    python -m app.import_users investors.csv --errors rejected.csv
+
+Columns: email, stripe_id, password, and optionally kyc_status, is_accredited,
+net_worth, annual_income. Empty cells take the same defaults as POST /users/.
+Rejected rows are written to --errors (row is the 0-based data row).
+"""
+import argparse
+import csv
+import sys
+
+from app.core.config import settings
+
+
+def read_records(path: str) -> list:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [{key: value for key, value in row.items() if value not in ("", None)} for row in csv.DictReader(f)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_path")
+    parser.add_argument("--errors", help="Write rejected rows to this CSV file")
+    parser.add_argument("--chunk-size", type=int, default=settings.USER_IMPORT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.USER_IMPORT_HASH_WORKERS, help="Password hashing processes")
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+    from app.services.user_import import UserImportService
+
+    records = read_records(args.csv_path)
+    db = SessionLocal()
+    try:
+        result = UserImportService.import_users(db, records, chunk_size=args.chunk_size, hash_workers=args.workers)
+    finally:
+        db.close()
+
+    if args.errors:
+        with open(args.errors, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["row", "email", "error"])
+            writer.writeheader()
+            writer.writerows(result["errors"])
+    print(f"Created {result['created']} of {len(records)} users, {len(result['errors'])} rejected")
+    if result["errors"] and not args.errors:
+        for error in result["errors"][:20]:
+            print(f"  row {error['row']} ({error['email']}): {error['error']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,47 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.db.base import Base
-from app.db.session import engine
+from app.core import metrics
+from app.core.rate_limit import AdmissionControlMiddleware
+from app.db import pool_monitor
+from app.db import profiler
 from app import models
-
-import sentry_sdk
+from app.services.decision_log import decision_log
 
 if settings.SENTRY_DSN:
+    # Imported only when configured: sentry_sdk adds noticeably to worker boot time
+    import sentry_sdk
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
-        traces_sample_rate=1.0,
+        traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
     )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    decision_log.start()
+    yield
+    # Writes buffered compliance decisions before the worker exits
+    await run_in_threadpool(decision_log.stop)
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     description="Reg CF Compliance API (Reg-Router)",
     version="1.0.0",
 )
 
-# Set all CORS enabled origins
+profiler.install_query_profiler()
+app.add_middleware(profiler.QueryProfilerMiddleware)
+
+if settings.RATE_LIMIT_ENABLED:
+    pool_monitor.install_pool_monitor()
+    app.add_middleware(AdmissionControlMiddleware)
+
+# Set all CORS enabled origins. Added after the limiter so it wraps it, and
+# browsers can read 429/503 rejections.
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
@@ -30,6 +51,13 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+if settings.METRICS_ENABLED:
+    metrics.instrument_sqlalchemy()
+    app.add_middleware(metrics.PrometheusMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return Response(content=metrics.render_latest(), media_type=metrics.CONTENT_TYPE_LATEST)
 
 
 
@@ -2,3 +2,9 @@ from .user import User
 from .campaign import Campaign
 from .ledger import Ledger
 from .billing import BillingLog
+from .idempotency import IdempotencyKey
+from .analytics import AnalyticsWatermark, CampaignDailyInflow, CampaignStats, CampaignStatusTotal
+from .export_job import ExportJob
+from .compliance_decision import ComplianceDecision
+from .position import Position, PositionLot
+from .order_event import OrderEvent
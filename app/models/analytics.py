@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+# Issuer dashboard summaries, rebuilt per campaign by app.services.analytics.
+# Dashboards read only these tables, never aggregate the ledger.
+
+class CampaignStats(Base):
+    __tablename__ = "campaign_stats"
+
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), primary_key=True)
+    investor_count = Column(Integer, nullable=False, default=0) # Distinct investors with a counted investment
+    investment_count = Column(Integer, nullable=False, default=0)
+    committed_cents = Column(BigInteger, nullable=False, default=0) # pending_payment + pending_settlement + settled
+    settled_cents = Column(BigInteger, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class CampaignStatusTotal(Base):
+    __tablename__ = "campaign_status_totals"
+
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    entry_count = Column(Integer, nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)
+
+class CampaignDailyInflow(Base):
+    __tablename__ = "campaign_daily_inflow"
+
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), primary_key=True)
+    day = Column(Date, primary_key=True) # UTC day the investment was made
+    investment_count = Column(Integer, nullable=False)
+    amount_cents = Column(BigInteger, nullable=False) # Counted investments only
+
+class AnalyticsWatermark(Base):
+    __tablename__ = "analytics_watermarks"
+
+    name = Column(String, primary_key=True)
+    refreshed_through = Column(DateTime(timezone=True), nullable=False) # Ledger changes up to here are summarized
@@ -1,13 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.sql import func
+from app.core.money import dollars_property
 from app.db.base import Base
 
 class BillingLog(Base):
+    # On Postgres, range-partitioned by month on created_at (see app.services.partitions)
     __tablename__ = "billing_log"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id")) # Platform/User being billed
     transaction_id = Column(String, index=True) # Check ID or Ledger ID
-    fee_amount = Column(Float, default=2.00)
+    fee_amount_cents = Column(BigInteger, default=200)
+    fee_amount = dollars_property("fee_amount_cents")
     description = Column(String) # e.g. "Validation Check: Reg D 506(c)"
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
+from app.core.money import dollars_property
 from app.db.base import Base
 
 class Campaign(Base):
@@ -8,10 +9,18 @@ class Campaign(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
     issuer_id = Column(Integer, index=True) # FK to User
-    target_amount = Column(Float)
+    target_amount_cents = Column(BigInteger)
+    target_amount = dollars_property("target_amount_cents")
     deadline = Column(DateTime(timezone=True))
     funding_status = Column(String, default="active") # active, funded, failed
     regulation_type = Column(String, default="REG_CF") # REG_CF, 506_B, 506_C
     escrow_wallet_id = Column(String, nullable=True)
     stripe_account_id = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Campaign search: keyset pagination on (deadline, id), usually filtered by status.
+        # The name search indexes (tsvector, trigram) are Postgres-only, see migration f4c1b7e9a2d6.
+        Index("ix_campaigns_funding_status_deadline_id", "funding_status", "deadline", "id"),
+        Index("ix_campaigns_deadline_id", "deadline", "id"),
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Index, Integer, String, Text, UniqueConstraint
+from app.db.base import Base
+
+class ComplianceDecision(Base):
+    # Append-only (enforced by trigger on Postgres); written in batches by app.services.decision_log
+    __tablename__ = "compliance_decisions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    chain_id = Column(String(32), nullable=False) # One hash chain per writer process
+    seq = Column(BigInteger, nullable=False) # Position in the chain, from 1
+    decided_at = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(Integer, nullable=True, index=True)
+    campaign_id = Column(Integer, nullable=True)
+    regulation_type = Column(String, nullable=False) # Lane that ran: REG_CF, 506_B, 506_C
+    approved = Column(Boolean, nullable=False)
+    reason = Column(String, nullable=True) # Denial reason
+    inputs = Column(Text, nullable=False) # Canonical JSON of the facts the verdict was based on
+    compliance_version = Column(String, nullable=False)
+    prev_hash = Column(String(64), nullable=False)
+    hash = Column(String(64), nullable=False) # sha256(prev_hash + canonical record)
+
+    __table_args__ = (
+        UniqueConstraint("chain_id", "seq", name="uq_compliance_decisions_chain_seq"),
+        Index("ix_compliance_decisions_decided_at", "decided_at"),
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ExportJob(Base):
+    __tablename__ = "export_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    requested_by = Column(Integer, nullable=True) # Admin ID
+    status = Column(String, default="queued") # queued, running, completed, failed
+    tables = Column(String, nullable=False) # Comma-separated: ledger, billing_log
+    campaign_id = Column(Integer, nullable=True) # Ledger filter; billing_log has no campaign
+    period_start = Column(DateTime(timezone=True), nullable=True) # created_at >= period_start
+    period_end = Column(DateTime(timezone=True), nullable=True) # created_at < period_end
+    storage_key = Column(String, nullable=True) # Zip archive in document storage
+    row_count = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
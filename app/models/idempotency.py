@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner = Column(String, nullable=False) # Token subject the key belongs to
+    key = Column(String, nullable=False) # Client-supplied Idempotency-Key header
+    scope = Column(String, nullable=False) # e.g. "POST /ledger/invest"
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String, default="in_progress") # in_progress, completed
+    response_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("owner", "key", name="uq_idempotency_keys_owner_key"),
+    )
@@ -1,15 +1,28 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
+from app.core.money import dollars_property
 from app.db.base import Base
 
 class Ledger(Base):
+    # On Postgres, range-partitioned by month on created_at (see app.services.partitions)
     __tablename__ = "ledger"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     campaign_id = Column(Integer, ForeignKey("campaigns.id"))
-    amount = Column(Float)
+    amount_cents = Column(BigInteger)
+    amount = dollars_property("amount_cents")
     transaction_type = Column(String) # investment, payout, refund
     status = Column(String, default="pending_settlement") # pending_settlement, settled, failed, escrow_hold, cancelled
     stripe_payment_intent_id = Column(String, nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Drives the incremental campaign analytics refresh (app.services.analytics)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Serves the 12-month exposure lookup (SEC § 227.100) and per-user history
+        Index("ix_ledger_user_id_created_at", "user_id", "created_at"),
+        # Incremental analytics refresh: changed rows, then per-campaign aggregates
+        Index("ix_ledger_updated_at", "updated_at"),
+        Index("ix_ledger_campaign_id_status", "campaign_id", "status"),
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class OrderEvent(Base):
+    # Append-only log of the secondary-market order books (app.services.orders);
+    # replaying a campaign's events in id order rebuilds its book.
+    __tablename__ = "order_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, nullable=False)
+    event_type = Column(String, nullable=False) # placed, fill, cancelled
+    # placed: the order itself is this event (order id = event id)
+    order_id = Column(Integer, nullable=True) # fill: the incoming order; cancelled: the order cancelled
+    user_id = Column(Integer, nullable=True) # placed: the owner
+    side = Column(String, nullable=True) # placed: buy, sell
+    price_bps = Column(Integer, nullable=True) # placed: limit price (NULL: market order); fill: execution price
+    quantity_cents = Column(BigInteger, nullable=True) # placed: order size; fill: quantity traded (cents of par)
+    buy_order_id = Column(Integer, nullable=True) # fill
+    sell_order_id = Column(Integer, nullable=True) # fill
+    # fill: the trade's ledger rows, settled or failed together by the buyer's payment
+    buy_ledger_id = Column(Integer, nullable=True, unique=True, index=True)
+    sell_ledger_id = Column(Integer, nullable=True)
+    reason = Column(String, nullable=True) # cancelled: user, unfilled, self_trade or the compliance denial
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Catch-up replay of one campaign's book from a known position
+        Index("ix_order_events_campaign_id_id", "campaign_id", "id"),
+    )
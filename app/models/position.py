@@ -0,0 +1,39 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, false
+from sqlalchemy.sql import func, text
+from app.core.money import dollars_property
+from app.db.base import Base
+
+# Holdings, maintained by app.services.positions as investments settle and
+# secondary-market trades sell them down. Quantities are in cents of par.
+
+class Position(Base):
+    __tablename__ = "positions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), primary_key=True)
+    quantity_cents = Column(BigInteger, nullable=False, default=0) # Sum of remaining_cents over the lots that are not pending
+    quantity = dollars_property("quantity_cents")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class PositionLot(Base):
+    __tablename__ = "position_lots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    # Settled investment or trade_buy (or, for a failed trade, the seller's trade_sell) the lot came
+    # from; no FK, the partitioned ledger is keyed on (id, created_at)
+    ledger_id = Column(Integer, nullable=False, unique=True)
+    acquired_at = Column(DateTime(timezone=True), nullable=False) # Starts the SEC § 227.501 lockup
+    quantity_cents = Column(BigInteger, nullable=False)
+    remaining_cents = Column(BigInteger, nullable=False) # Not yet sold
+    # Bought in a trade whose payment has not settled: neither in the position nor sellable
+    pending = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    __table_args__ = (
+        # FIFO walk of a holder's open lots, oldest first; sold-out lots drop out of the index
+        Index(
+            "ix_position_lots_open_fifo", "user_id", "campaign_id", "acquired_at", "id",
+            postgresql_where=text("remaining_cents > 0"), sqlite_where=text("remaining_cents > 0"),
+        ),
+    )
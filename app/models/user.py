@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Boolean, Float, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -9,17 +9,30 @@ class User(Base):
     stripe_id = Column(String, unique=True, index=True)
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
-    kyc_status = Column(String, default="unverified") # unverified, pending, verified
+    kyc_status = Column(String, default="unverified") # unverified, pending, verified, rejected
     is_accredited = Column(Boolean, default=False)
     net_worth = Column(Float, nullable=True)
     annual_income = Column(Float, nullable=True)
     annual_income = Column(Float, nullable=True)
     
     # Accreditation & Compliance
-    accreditation_status = Column(String, default="NONE") # NONE, SELF_CERTIFIED, PENDING_REVIEW, VERIFIED_DOCS
+    accreditation_status = Column(String, default="NONE") # NONE, SELF_CERTIFIED, PENDING_REVIEW, VERIFIED_DOCS, REJECTED
     accreditation_expiry = Column(DateTime(timezone=True), nullable=True)
     accreditation_verified_at = Column(DateTime(timezone=True), nullable=True)
-    accreditation_verified_by = Column(Integer, nullable=True) # Admin ID
+    accreditation_verified_by = Column(Integer, nullable=True) # Admin ID (also set on rejection)
+    accreditation_document_key = Column(String, nullable=True) # Storage key of the uploaded proof
+
+    # SEC § 227.100 limit state, maintained by app.services.investment_limit.
+    # Integer cents. reg_cf_annual_limit_cents is NULL for accredited investors (no limit);
+    # reg_cf_invested_12mo_cents is NULL until first computed from the ledger.
+    reg_cf_annual_limit_cents = Column(BigInteger, nullable=True)
+    reg_cf_invested_12mo_cents = Column(BigInteger, nullable=True, default=0)
+    reg_cf_window_resets_at = Column(DateTime(timezone=True), nullable=True) # Oldest counted investment leaves the window
 
     stripe_connect_id = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Serves the admin review queue: status filter with keyset pagination on id
+        Index("ix_users_accreditation_status_id", "accreditation_status", "id"),
+    )
@@ -1,3 +1,9 @@
-from .user import User, UserCreate, UserUpdate, UserLogin, Token, TokenData
-from .campaign import Campaign, CampaignCreate, CampaignUpdate
-from .ledger import Ledger, LedgerCreate, LedgerUpdate
+from .user import User, UserCreate, UserUpdate, UserLogin, Token, TokenData, UserImport, UserImportError, UserImportResult
+from .campaign import Campaign, CampaignCreate, CampaignSearchPage, CampaignUpdate
+from .ledger import Checkout, CheckoutCreate, CheckoutItem, Ledger, LedgerCreate, LedgerUpdate
+from .compliance import DecisionChainVerification, Eligibility, InvestmentLimit, LaneEligibility
+from .accreditation import AccreditationReview, AccreditationReviewResult, ReviewQueue, ReviewQueueItem
+from .kyc import KycBatch, KycBatchResult, KycProviderCallback, KycUpdate
+from .analytics import CampaignStats, CampaignSummary, DailyInflow, IssuerStats, LaneTotals, StatusTotal
+from .export import ExportCreate, ExportJob
+from .order import BookLevel, Order, OrderBookDepth, OrderCancellation, OrderCreate, OrderFill
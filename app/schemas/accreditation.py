@@ -0,0 +1,23 @@
+from typing import List, Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+
+class ReviewQueueItem(BaseModel):
+    id: int
+    email: str
+    accreditation_document_key: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReviewQueue(BaseModel):
+    items: List[ReviewQueueItem]
+    next_after_id: Optional[int] = None # Pass as `after_id` for the next page; None on the last page
+
+class AccreditationReview(BaseModel):
+    user_ids: List[int] = Field(min_length=1)
+    decision: Literal["verify", "reject"]
+
+class AccreditationReviewResult(BaseModel):
+    updated: List[int]
+    skipped: List[int] # Not pending review (already reviewed or never submitted)
@@ -0,0 +1,43 @@
+from typing import Dict, List, Optional
+from datetime import date, datetime
+from pydantic import BaseModel
+
+class StatusTotal(BaseModel):
+    count: int
+    amount: float
+
+class DailyInflow(BaseModel):
+    day: date
+    count: int
+    amount: float
+
+class CampaignStats(BaseModel):
+    campaign_id: int
+    investor_count: int
+    investment_count: int
+    committed: float # pending_payment + pending_settlement + settled investments
+    settled: float
+    by_status: Dict[str, StatusTotal]
+    daily_inflow: List[DailyInflow]
+    refreshed_at: Optional[datetime] = None # None until the first refresh covers this campaign
+
+class CampaignSummary(BaseModel):
+    campaign_id: int
+    name: Optional[str] = None
+    regulation_type: Optional[str] = None
+    investor_count: int
+    investment_count: int
+    committed: float
+    settled: float
+
+class LaneTotals(BaseModel):
+    campaign_count: int
+    investment_count: int
+    committed: float
+    settled: float
+
+class IssuerStats(BaseModel):
+    issuer_id: int
+    campaigns: List[CampaignSummary]
+    by_regulation: Dict[str, LaneTotals] # Keyed by regulation_type
+    refreshed_at: Optional[datetime] = None
@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
+from app.core.money import to_cents
 
 class CampaignBase(BaseModel):
     name: str
@@ -14,6 +15,12 @@ class CampaignBase(BaseModel):
 class CampaignCreate(CampaignBase):
     issuer_id: int
 
+    @field_validator("target_amount")
+    @classmethod
+    def whole_cents(cls, v: float) -> float:
+        to_cents(v) # Rejects fractions of a cent
+        return v
+
 class CampaignUpdate(CampaignBase):
     name: Optional[str] = None
     target_amount: Optional[float] = None
@@ -28,3 +35,7 @@ class Campaign(CampaignBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class CampaignSearchPage(BaseModel):
+    items: List[Campaign]
+    next_cursor: Optional[str] = None # Pass as `cursor` for the next page; None on the last page
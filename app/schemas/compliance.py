@@ -0,0 +1,25 @@
+from typing import Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class LaneEligibility(BaseModel):
+    eligible: bool
+    valid_until: Optional[datetime] = None # Verdict may change at this time even without user changes
+
+class Eligibility(BaseModel):
+    user_id: int
+    compliance_version: str
+    lanes: Dict[str, LaneEligibility] # Keyed by regulation_type: REG_CF (KYC gate), 506_B, 506_C
+
+class InvestmentLimit(BaseModel):
+    # SEC § 227.100 limits; None for accredited investors (no limit)
+    annual_limit: Optional[float] = None
+    invested_12mo: float
+    remaining: Optional[float] = None
+    window_resets_at: Optional[datetime] = None # Oldest counted investment leaves the 12-month window
+
+class DecisionChainVerification(BaseModel):
+    chain_id: str
+    records: int # Records checked (up to the first invalid one)
+    valid: bool
+    first_invalid_seq: Optional[int] = None
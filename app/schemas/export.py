@@ -0,0 +1,34 @@
+from typing import List, Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+class ExportCreate(BaseModel):
+    tables: List[Literal["ledger", "billing_log"]] = Field(default=["ledger", "billing_log"], min_length=1)
+    campaign_id: Optional[int] = None # Applies to ledger only
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_period(self) -> "ExportCreate":
+        if self.period_start and self.period_end and self.period_end <= self.period_start:
+            raise ValueError("period_end must be after period_start")
+        return self
+
+class ExportJob(BaseModel):
+    id: int
+    status: str
+    tables: List[str]
+    campaign_id: Optional[int] = None
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+    row_count: Optional[int] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("tables", mode="before")
+    @classmethod
+    def split_tables(cls, value):
+        return value.split(",") if isinstance(value, str) else value
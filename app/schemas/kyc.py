@@ -0,0 +1,18 @@
+from typing import Any, Dict, List, Literal
+from pydantic import BaseModel, Field
+
+class KycUpdate(BaseModel):
+    user_id: int
+    kyc_status: Literal["unverified", "pending", "verified", "rejected"]
+
+class KycBatch(BaseModel):
+    updates: List[KycUpdate] = Field(min_length=1)
+
+class KycBatchResult(BaseModel):
+    updated: int
+    unchanged: int # Already in the requested status
+    not_found: List[int]
+
+class KycProviderCallback(BaseModel):
+    # Provider results: {"reference_id": <user id>, "status": "approved" | "declined" | ...}
+    results: List[Dict[str, Any]]
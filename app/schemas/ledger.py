@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from app.core.money import to_cents
 
 class LedgerBase(BaseModel):
     amount: float
@@ -10,6 +11,16 @@ class LedgerBase(BaseModel):
 class LedgerCreate(LedgerBase):
     campaign_id: int
 
+    @field_validator("amount")
+    @classmethod
+    def whole_cents(cls, v: float) -> float:
+        to_cents(v) # Rejects fractions of a cent
+        return v
+
+    @property
+    def amount_cents(self) -> int:
+        return to_cents(self.amount)
+
 class LedgerUpdate(LedgerBase):
     status: Optional[str] = None
 
@@ -22,3 +33,34 @@ class Ledger(LedgerBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class CheckoutItem(BaseModel):
+    campaign_id: int
+    amount: float = Field(gt=0)
+
+    @field_validator("amount")
+    @classmethod
+    def whole_cents(cls, v: float) -> float:
+        to_cents(v) # Rejects fractions of a cent
+        return v
+
+    @property
+    def amount_cents(self) -> int:
+        return to_cents(self.amount)
+
+class CheckoutCreate(BaseModel):
+    items: List[CheckoutItem] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def distinct_campaigns(self) -> "CheckoutCreate":
+        campaign_ids = [item.campaign_id for item in self.items]
+        if len(set(campaign_ids)) != len(campaign_ids):
+            raise ValueError("Each campaign may appear only once in a checkout")
+        return self
+
+class Checkout(BaseModel):
+    transfer_group: str # Shared by the PaymentIntent and the issuer transfers
+    amount: float # Charged in one PaymentIntent
+    stripe_payment_intent_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    investments: List[Ledger]
@@ -0,0 +1,64 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.core.money import to_cents
+
+class OrderCreate(BaseModel):
+    campaign_id: int
+    side: Literal["buy", "sell"]
+    order_type: Literal["limit", "market"] = "limit"
+    price_bps: Optional[int] = Field(default=None, gt=0) # Basis points of par; required for limit orders
+    quantity: float = Field(gt=0) # Par amount in dollars
+
+    @field_validator("quantity")
+    @classmethod
+    def whole_cents(cls, v: float) -> float:
+        to_cents(v) # Rejects fractions of a cent
+        return v
+
+    @model_validator(mode="after")
+    def check_price(self) -> "OrderCreate":
+        if self.order_type == "limit" and self.price_bps is None:
+            raise ValueError("Limit orders need a price_bps")
+        if self.order_type == "market" and self.price_bps is not None:
+            raise ValueError("Market orders take no price_bps")
+        return self
+
+    @property
+    def quantity_cents(self) -> int:
+        return to_cents(self.quantity)
+
+class OrderFill(BaseModel):
+    buy_order_id: int
+    sell_order_id: int
+    price_bps: int
+    quantity: float
+    amount: float # Paid by the buyer
+    # pending_payment until the buyer's PaymentIntent succeeds; failed when it could not be created
+    payment_status: str
+    # The buyer's payment to confirm; only shown to the buyer (see GET /orders/payments)
+    stripe_payment_intent_id: Optional[str] = None
+    client_secret: Optional[str] = None
+
+class OrderCancellation(BaseModel):
+    order_id: int
+    reason: str
+
+class Order(BaseModel):
+    id: int
+    campaign_id: int
+    side: str
+    price_bps: Optional[int] = None
+    quantity: float
+    remaining: float
+    status: Literal["open", "filled", "cancelled"]
+    fills: List[OrderFill] = []
+    cancelled: List[OrderCancellation] = [] # Orders cancelled while matching, this one included
+
+class BookLevel(BaseModel):
+    price_bps: int
+    quantity: float
+
+class OrderBookDepth(BaseModel):
+    campaign_id: int
+    bids: List[BookLevel] # Best (highest) first
+    asks: List[BookLevel] # Best (lowest) first
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, ConfigDict
 
@@ -45,3 +45,16 @@ class User(UserBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class UserImport(BaseModel):
+    # Validated row by row (as UserCreate), so one bad record does not reject the import
+    users: List[Dict[str, Any]]
+
+class UserImportError(BaseModel):
+    row: int # 0-based index in `users`
+    email: Optional[str] = None
+    error: str
+
+class UserImportResult(BaseModel):
+    created: int
+    errors: List[UserImportError]
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.user import User
+from app.services.verdict_cache import VerdictCache
+
+PENDING_REVIEW = "PENDING_REVIEW"
+
+
+class AccreditationService:
+    """
+    Admin review of uploaded accreditation documents.
+    """
+
+    @staticmethod
+    def review_queue(db: Session, after_id: Optional[int] = None, limit: int = 100) -> Tuple[list, Optional[int]]:
+        """
+        Users awaiting review, oldest first, as (rows, next cursor). Keyset paginated
+        on id over ix_users_accreditation_status_id, so deep pages cost the same as
+        the first; the cursor is None on the last page.
+        """
+        query = (
+            select(User.id, User.email, User.accreditation_document_key, User.created_at)
+            .where(User.accreditation_status == PENDING_REVIEW)
+            .order_by(User.id)
+            .limit(limit + 1)
+        )
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        rows = db.execute(query).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1].id
+        return rows, None
+
+    @staticmethod
+    def review(db: Session, user_ids: Sequence[int], approve: bool, reviewer_id: int) -> List[int]:
+        """
+        Verifies or rejects the given users in one UPDATE and returns the ids that
+        changed. Users no longer pending review (already handled by another reviewer,
+        or never submitted) are left untouched.
+        """
+        if not user_ids:
+            return []
+        now = datetime.now(timezone.utc)
+        values = {
+            "accreditation_status": "VERIFIED_DOCS" if approve else "REJECTED",
+            "accreditation_verified_at": now,
+            "accreditation_verified_by": reviewer_id,
+            "accreditation_expiry": now + timedelta(days=settings.ACCREDITATION_VALIDITY_DAYS) if approve else None,
+        }
+        result = db.execute(
+            update(User)
+            .where(User.id.in_(set(user_ids)), User.accreditation_status == PENDING_REVIEW)
+            .values(**values)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = sorted(result.scalars().all())
+        db.commit()
+        # Bulk statements bypass the ORM invalidation hooks
+        VerdictCache.invalidate_users(updated)
+        return updated
@@ -0,0 +1,190 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import case, delete, distinct, func, insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.money import from_cents
+from app.core.timestamps import as_utc
+from app.models.analytics import AnalyticsWatermark, CampaignDailyInflow, CampaignStats, CampaignStatusTotal
+from app.models.campaign import Campaign
+from app.models.ledger import Ledger
+from app.services.investment_limit import LIMIT_COUNTED_STATUSES
+
+WATERMARK = "campaign_stats"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_date(value) -> date:
+    # date() comes back as text on SQLite
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class AnalyticsService:
+    """
+    Issuer dashboard statistics, served from summary tables that a beat task keeps
+    up to date, so dashboard traffic never aggregates the OLTP ledger.
+    """
+
+    @staticmethod
+    def refresh_campaign_stats(db: Session, full: bool = False, now: Optional[datetime] = None) -> int:
+        """
+        Rebuilds the summaries of every campaign with ledger rows changed since the
+        last run (by `ledger.updated_at`), or of all campaigns on the first run or
+        when `full`. Returns the number of campaigns refreshed.
+
+        The scan starts ANALYTICS_REFRESH_OVERLAP_SECONDS before the watermark:
+        rows stamped by a transaction that committed after the previous run are
+        still picked up, and re-summarizing a campaign is idempotent.
+        """
+        started_at = now or _utcnow()
+        watermark = db.get(AnalyticsWatermark, WATERMARK)
+        if watermark is None or full:
+            campaign_ids = db.execute(select(Campaign.id)).scalars().all()
+        else:
+            since = as_utc(watermark.refreshed_through) - timedelta(seconds=settings.ANALYTICS_REFRESH_OVERLAP_SECONDS)
+            campaign_ids = db.execute(
+                select(distinct(Ledger.campaign_id)).where(Ledger.updated_at >= since, Ledger.campaign_id.is_not(None))
+            ).scalars().all()
+
+        chunk_size = settings.ANALYTICS_REFRESH_CHUNK_SIZE
+        for start in range(0, len(campaign_ids), chunk_size):
+            AnalyticsService._rebuild(db, campaign_ids[start:start + chunk_size], started_at)
+            db.commit() # Short transactions; a failed run resumes from the old watermark
+
+        if watermark is None:
+            db.add(AnalyticsWatermark(name=WATERMARK, refreshed_through=started_at))
+        else:
+            watermark.refreshed_through = started_at
+        db.commit()
+        return len(campaign_ids)
+
+    @staticmethod
+    def _rebuild(db: Session, campaign_ids: Sequence[int], refreshed_at: datetime) -> None:
+        for model in (CampaignStats, CampaignStatusTotal, CampaignDailyInflow):
+            db.execute(delete(model).where(model.campaign_id.in_(campaign_ids)))
+
+        investments = (Ledger.campaign_id.in_(campaign_ids), Ledger.transaction_type == "investment")
+        counted = investments + (Ledger.status.in_(LIMIT_COUNTED_STATUSES),)
+
+        status_rows = db.execute(
+            select(Ledger.campaign_id, Ledger.status, func.count(), func.coalesce(func.sum(Ledger.amount_cents), 0))
+            .where(*investments)
+            .group_by(Ledger.campaign_id, Ledger.status)
+        ).all()
+        if status_rows:
+            db.execute(insert(CampaignStatusTotal), [
+                {"campaign_id": campaign_id, "status": status or "unknown", "entry_count": count, "amount_cents": int(amount)}
+                for campaign_id, status, count, amount in status_rows
+            ])
+
+        totals = {
+            campaign_id: (investors, count, int(committed), int(settled))
+            for campaign_id, investors, count, committed, settled in db.execute(
+                select(
+                    Ledger.campaign_id,
+                    func.count(distinct(Ledger.user_id)),
+                    func.count(),
+                    func.coalesce(func.sum(Ledger.amount_cents), 0),
+                    func.coalesce(func.sum(case((Ledger.status == "settled", Ledger.amount_cents), else_=0)), 0),
+                ).where(*counted).group_by(Ledger.campaign_id)
+            )
+        }
+        stats_rows = []
+        for campaign_id in campaign_ids:
+            investors, count, committed, settled = totals.get(campaign_id, (0, 0, 0, 0))
+            stats_rows.append({
+                "campaign_id": campaign_id,
+                "investor_count": investors,
+                "investment_count": count,
+                "committed_cents": committed,
+                "settled_cents": settled,
+                "refreshed_at": refreshed_at,
+            })
+        db.execute(insert(CampaignStats), stats_rows)
+
+        day = func.date(Ledger.created_at)
+        daily_rows = db.execute(
+            select(Ledger.campaign_id, day, func.count(), func.coalesce(func.sum(Ledger.amount_cents), 0))
+            .where(*counted, Ledger.created_at.is_not(None))
+            .group_by(Ledger.campaign_id, day)
+        ).all()
+        if daily_rows:
+            db.execute(insert(CampaignDailyInflow), [
+                {"campaign_id": campaign_id, "day": _as_date(value), "investment_count": count, "amount_cents": int(amount)}
+                for campaign_id, value, count, amount in daily_rows
+            ])
+
+    @staticmethod
+    def campaign_stats(db: Session, campaign_id: int, days: int = 30) -> Dict:
+        stats = db.get(CampaignStats, campaign_id)
+        by_status = db.execute(
+            select(CampaignStatusTotal.status, CampaignStatusTotal.entry_count, CampaignStatusTotal.amount_cents)
+            .where(CampaignStatusTotal.campaign_id == campaign_id)
+        ).all()
+        since = _utcnow().date() - timedelta(days=days - 1)
+        daily = db.execute(
+            select(CampaignDailyInflow.day, CampaignDailyInflow.investment_count, CampaignDailyInflow.amount_cents)
+            .where(CampaignDailyInflow.campaign_id == campaign_id, CampaignDailyInflow.day >= since)
+            .order_by(CampaignDailyInflow.day)
+        ).all()
+        return {
+            "campaign_id": campaign_id,
+            "investor_count": stats.investor_count if stats else 0,
+            "investment_count": stats.investment_count if stats else 0,
+            "committed": from_cents(stats.committed_cents if stats else 0),
+            "settled": from_cents(stats.settled_cents if stats else 0),
+            "by_status": {status: {"count": count, "amount": from_cents(amount)} for status, count, amount in by_status},
+            "daily_inflow": [{"day": day, "count": count, "amount": from_cents(amount)} for day, count, amount in daily],
+            "refreshed_at": stats.refreshed_at if stats else None,
+        }
+
+    @staticmethod
+    def issuer_stats(db: Session, issuer_id: int) -> Dict:
+        rows = db.execute(
+            select(
+                Campaign.id, Campaign.name, Campaign.regulation_type,
+                CampaignStats.investor_count, CampaignStats.investment_count,
+                CampaignStats.committed_cents, CampaignStats.settled_cents, CampaignStats.refreshed_at,
+            )
+            .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+            .where(Campaign.issuer_id == issuer_id)
+            .order_by(Campaign.id)
+        ).all()
+
+        campaigns: List[Dict] = []
+        lanes: Dict[str, Dict] = {}
+        refreshed_at = None
+        for campaign_id, name, regulation_type, investors, count, committed, settled, campaign_refreshed_at in rows:
+            campaigns.append({
+                "campaign_id": campaign_id,
+                "name": name,
+                "regulation_type": regulation_type,
+                "investor_count": investors or 0,
+                "investment_count": count or 0,
+                "committed": from_cents(committed or 0),
+                "settled": from_cents(settled or 0),
+            })
+            lane = lanes.setdefault(regulation_type, {"campaign_count": 0, "investment_count": 0, "committed_cents": 0, "settled_cents": 0})
+            lane["campaign_count"] += 1
+            lane["investment_count"] += count or 0
+            lane["committed_cents"] += committed or 0
+            lane["settled_cents"] += settled or 0
+            if campaign_refreshed_at is not None and (refreshed_at is None or campaign_refreshed_at < refreshed_at):
+                refreshed_at = campaign_refreshed_at
+        return {
+            "issuer_id": issuer_id,
+            "campaigns": campaigns,
+            "by_regulation": {
+                regulation_type: {
+                    "campaign_count": lane["campaign_count"],
+                    "investment_count": lane["investment_count"],
+                    "committed": from_cents(lane["committed_cents"]),
+                    "settled": from_cents(lane["settled_cents"]),
+                }
+                for regulation_type, lane in lanes.items()
+            },
+            "refreshed_at": refreshed_at, # Oldest summary shown
+        }
@@ -0,0 +1,112 @@
+import base64
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.orm import Session
+from app.models.campaign import Campaign
+from app.models.user import User
+from app.services.investment_limit import InvestmentLimitService
+from app.services.verdict_cache import VerdictCache
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(deadline: datetime, campaign_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{deadline.isoformat()}|{campaign_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        deadline, campaign_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(deadline), int(campaign_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(str(e))
+
+
+def name_matches(db: Session, q: str):
+    """
+    Postgres: full-text match on words, or trigram-indexed substring match
+    (both expressions are indexed by migration f4c1b7e9a2d6). Elsewhere: LIKE.
+    """
+    substring = Campaign.name.icontains(q, autoescape=True)
+    if db.get_bind().dialect.name != "postgresql":
+        return substring
+    # Inlined constants, so the expression matches the index on any driver
+    config = literal_column("'simple'")
+    words = func.to_tsvector(config, func.coalesce(Campaign.name, literal_column("''"))).op("@@")(func.plainto_tsquery(config, q))
+    return or_(words, substring)
+
+
+class CampaignSearchService:
+    """
+    Campaign discovery, ordered by deadline (closing soonest first) and paged
+    with a keyset cursor on (deadline, id), so every page costs the same.
+    """
+
+    @staticmethod
+    def investable_lanes(user: User) -> List[str]:
+        """
+        Lanes the user passes now (memoized verdicts), minus Reg CF when the
+        stored 12-month exposure already uses up the § 227.100 limit.
+        """
+        verdicts = VerdictCache.eligibility(user.id, lambda: user)
+        lanes = [lane for lane, (eligible, _) in verdicts.items() if eligible]
+        limit_cents = user.reg_cf_annual_limit_cents
+        if ("REG_CF" in lanes and not user.is_accredited and limit_cents is not None
+                and InvestmentLimitService.exposure_is_current(user) and user.reg_cf_invested_12mo_cents >= limit_cents):
+            lanes.remove("REG_CF")
+        return lanes
+
+    @staticmethod
+    def search(
+        db: Session,
+        columns: Sequence,
+        *,
+        q: Optional[str] = None,
+        regulation_types: Optional[Sequence[str]] = None,
+        funding_status: Optional[str] = None,
+        deadline_after: Optional[datetime] = None,
+        deadline_before: Optional[datetime] = None,
+        lanes: Optional[Sequence[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Returns rows of `columns` (which must include Campaign.deadline and
+        Campaign.id) plus the cursor of the next page (None on the last one).
+        `lanes` restricts results to those regulation types, e.g.
+        investable_lanes(user). Campaigns without a deadline are not listed.
+        """
+        conditions = [Campaign.deadline.is_not(None)]
+        if q:
+            conditions.append(name_matches(db, q))
+        if regulation_types:
+            conditions.append(Campaign.regulation_type.in_(list(regulation_types)))
+        if lanes is not None:
+            conditions.append(Campaign.regulation_type.in_(list(lanes)))
+        if funding_status:
+            conditions.append(Campaign.funding_status == funding_status)
+        if deadline_after is not None:
+            conditions.append(Campaign.deadline > deadline_after)
+        if deadline_before is not None:
+            conditions.append(Campaign.deadline <= deadline_before)
+        if cursor:
+            after_deadline, after_id = decode_cursor(cursor)
+            conditions.append(or_(
+                Campaign.deadline > after_deadline,
+                and_(Campaign.deadline == after_deadline, Campaign.id > after_id),
+            ))
+
+        rows = db.execute(
+            select(*columns)
+            .where(*conditions)
+            .order_by(Campaign.deadline, Campaign.id)
+            .limit(limit + 1)
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].deadline, rows[-1].id)
+        return rows, next_cursor
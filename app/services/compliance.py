@@ -1,7 +1,16 @@
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from app.core.money import to_cents
 from app.schemas.user import User
 from app.schemas.campaign import Campaign
 
+# Bump whenever lane rules change so memoized verdicts are not reused
+COMPLIANCE_VERSION = "2026.10.1"
+
+# SEC § 227.100 investment limit parameters (as adjusted for inflation in 2022), in cents
+REG_CF_MIN_LIMIT_CENTS = 2500_00
+REG_CF_TIER_THRESHOLD_CENTS = 124000_00
+
 class ComplianceService:
     @staticmethod
     def check_kyc(user: User) -> bool:
@@ -20,33 +29,53 @@ class ComplianceService:
         return datetime.now(transaction_date.tzinfo) >= one_year_later
 
     @staticmethod
-    def check_escrow_threshold(campaign: Campaign, current_pledged: float) -> bool:
+    def lockup_cutoff(now: datetime) -> datetime:
+        """
+        Latest acquisition time that is out of the 1-year lockup at `now`.
+        """
+        try:
+            return now.replace(year=now.year - 1)
+        except ValueError: # Feb 29
+            return now.replace(year=now.year - 1, day=28)
+
+    @staticmethod
+    def check_escrow_threshold(campaign: Campaign, current_pledged_cents: int) -> bool:
         """
         Checks if a campaign has met its target amount (SEC § 227.303).
         """
-        return current_pledged >= campaign.target_amount
+        return current_pledged_cents >= campaign.target_amount_cents
 
     @staticmethod
-    def check_investment_limit(user: User, amount: float, past_12mo_investments: float) -> bool:
+    def annual_investment_limit(annual_income: Optional[float], net_worth: Optional[float]) -> int:
+        """
+        SEC § 227.100(a)(2) 12-month limit for a non-accredited investor, in cents.
+        Either income or net worth below $124k: greater of $2,500 or 5% of the greater of the two.
+        Both at or above $124k: 10% of the greater of the two, capped at $124k.
+        Missing income/net worth count as 0 (the stricter tier).
+        """
+        income_cents = to_cents(annual_income or 0, strict=False)
+        net_worth_cents = to_cents(net_worth or 0, strict=False)
+        limit_base = max(income_cents, net_worth_cents)
+        if income_cents < REG_CF_TIER_THRESHOLD_CENTS or net_worth_cents < REG_CF_TIER_THRESHOLD_CENTS:
+            return max(REG_CF_MIN_LIMIT_CENTS, limit_base * 5 // 100)
+        return min(limit_base // 10, REG_CF_TIER_THRESHOLD_CENTS)
+
+    @staticmethod
+    def check_investment_limit(user: User, amount_cents: int, past_12mo_investments_cents: int) -> bool:
         """
         Enforces SEC § 227.100 investment limits.
-        Non-accredited investors: Cap at greater of $2,500 or 5% of annual income/net worth (if <$124k).
-        Accredited investors: No limit (in this simplified version, though strictly it's different).
+        Accredited investors: No limit.
+        Non-accredited investors: the stored `reg_cf_annual_limit_cents` (see InvestmentLimitService),
+        or `annual_investment_limit` for users that do not carry one.
         """
         if user.is_accredited:
             return True
 
-        # Simplified Logic for Non-Accredited
-        # Limit is greater of $2,500 or 5% of lesser of annual_income or net_worth
-        # If income/net_worth are missing, default to stricter $2,500 limit
-        
-        income = user.annual_income or 0
-        net_worth = user.net_worth or 0
-        
-        limit_base = min(income, net_worth)
-        calculated_limit = max(2500, limit_base * 0.05)
-        
-        return (past_12mo_investments + amount) <= calculated_limit
+        limit_cents = getattr(user, "reg_cf_annual_limit_cents", None)
+        if limit_cents is None:
+            limit_cents = ComplianceService.annual_investment_limit(user.annual_income, user.net_worth)
+
+        return (past_12mo_investments_cents + amount_cents) <= limit_cents
 
     @staticmethod
     def check_reg_d_506b(user: User) -> bool:
@@ -55,19 +84,27 @@ class ComplianceService:
         Logic 1: Cool-Off (User > 30 days old)
         Logic 2: Accredited (Self-Certified)
         """
-        # 1. Cool-off Check
-        if not user.created_at:
-             return False # Should not happen if schema is enforcing
-        
-        thirty_days_ago = datetime.now(user.created_at.tzinfo) - timedelta(days=30)
-        if user.created_at > thirty_days_ago:
-            return False # User is too new
+        return ComplianceService.evaluate_reg_d_506b(user)[0]
 
-        # 2. Accreditation Check (Honor System)
+    @staticmethod
+    def evaluate_reg_d_506b(user: User) -> Tuple[bool, Optional[datetime]]:
+        """
+        506(b) verdict plus the time it stays valid until (None: until the user changes).
+        A user still in the cool-off period flips to eligible when it ends.
+        """
+        # 1. Accreditation Check (Honor System)
         if user.accreditation_status != "SELF_CERTIFIED" and user.accreditation_status != "VERIFIED_DOCS":
-            return False
+            return False, None
 
-        return True
+        # 2. Cool-off Check
+        if not user.created_at:
+             return False, None # Should not happen if schema is enforcing
+        
+        cool_off_ends = user.created_at + timedelta(days=30)
+        if datetime.now(user.created_at.tzinfo) < cool_off_ends:
+            return False, cool_off_ends # User is too new
+
+        return True, None
 
     @staticmethod
     def check_reg_d_506c(user: User) -> bool:
@@ -76,13 +113,21 @@ class ComplianceService:
         Logic 1: Proof (Verified Docs)
         Logic 2: Expiry Check (Within 90 days)
         """
+        return ComplianceService.evaluate_reg_d_506c(user)[0]
+
+    @staticmethod
+    def evaluate_reg_d_506c(user: User) -> Tuple[bool, Optional[datetime]]:
+        """
+        506(c) verdict plus the time it stays valid until: a verified user
+        stops being eligible when the accreditation expires.
+        """
         # 1. Verification Check
         if user.accreditation_status != "VERIFIED_DOCS":
-            return False
+            return False, None
 
         # 2. Expiry Check
         if not user.accreditation_expiry:
-            return False
+            return False, None
         
         # Ensure aware comparison
         expiry = user.accreditation_expiry
@@ -90,9 +135,9 @@ class ComplianceService:
              expiry = expiry.replace(tzinfo=datetime.now().tzinfo)
 
         if expiry < datetime.now(expiry.tzinfo):
-            return False # Verification expired
+            return False, None # Verification expired
 
-        return True
+        return True, expiry
 
     @staticmethod
     def check_cancellation_window(campaign_deadline: datetime) -> bool:
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models
+from app.services.investment_limit import InvestmentLimitService
+
+@dataclass(frozen=True)
+class ComplianceContext:
+    """
+    Everything the compliance lanes need for one investment decision.
+    """
+    user: models.User
+    campaign: Optional[models.Campaign]
+    past_12mo_investments_cents: int
+
+def load_compliance_context(db: Session, email: str, campaign_id: int) -> Optional[ComplianceContext]:
+    """
+    Loads the investor and the campaign in one round trip (campaign outer-joined).
+    The 12-month exposure is read from the investor row; the ledger is only
+    aggregated when that stored value went stale (see InvestmentLimitService).
+    Returns None if the investor does not exist; `campaign` is None if the campaign does not.
+    """
+    row = db.execute(
+        select(models.User, models.Campaign)
+        .outerjoin(models.Campaign, models.Campaign.id == campaign_id)
+        .where(models.User.email == email)
+    ).first()
+    if row is None:
+        return None
+    user, campaign = row
+    past_12mo_investments_cents = InvestmentLimitService.ensure_current(db, user)
+    return ComplianceContext(user=user, campaign=campaign, past_12mo_investments_cents=past_12mo_investments_cents)
+
+@dataclass(frozen=True)
+class BasketComplianceContext:
+    """
+    The investor and every campaign of a checkout basket.
+    """
+    user: models.User
+    campaigns: Dict[int, models.Campaign] # Missing campaign ids are absent
+    past_12mo_investments_cents: int
+
+def load_basket_compliance_context(db: Session, email: str, campaign_ids: Sequence[int]) -> Optional[BasketComplianceContext]:
+    """
+    Like load_compliance_context, for several campaigns: one row per campaign
+    found (or a single row with no campaign), still in one round trip.
+    """
+    rows = db.execute(
+        select(models.User, models.Campaign)
+        .outerjoin(models.Campaign, models.Campaign.id.in_(list(campaign_ids)))
+        .where(models.User.email == email)
+    ).all()
+    if not rows:
+        return None
+    user = rows[0][0]
+    campaigns = {campaign.id: campaign for _, campaign in rows if campaign is not None}
+    past_12mo_investments_cents = InvestmentLimitService.ensure_current(db, user)
+    return BasketComplianceContext(user=user, campaigns=campaigns, past_12mo_investments_cents=past_12mo_investments_cents)
@@ -0,0 +1,219 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.timestamps import as_utc
+from app.models.compliance_decision import ComplianceDecision
+from app.services.compliance import COMPLIANCE_VERSION
+
+GENESIS_HASH = "0" * 64
+
+
+class DecisionLogUnavailable(Exception):
+    # The buffer is full and cannot be written: the decision must not be acted on
+    pass
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def decision_hash(prev_hash: str, record: Dict[str, Any]) -> str:
+    """
+    Links a record to its predecessor: editing, reordering or removing a row
+    breaks every hash after it.
+    """
+    payload = canonical_json([
+        record["chain_id"],
+        record["seq"],
+        as_utc(record["decided_at"]).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        record["user_id"],
+        record["campaign_id"],
+        record["regulation_type"],
+        bool(record["approved"]),
+        record["reason"],
+        record["inputs"],
+        record["compliance_version"],
+    ])
+    return hashlib.sha256((prev_hash + payload).encode()).hexdigest()
+
+
+class DecisionLog:
+    """
+    In-process buffer of compliance decisions. `record()` only chains and queues
+    the row; a background thread writes queued rows as multi-row INSERTs every
+    DECISION_LOG_FLUSH_SECONDS or once DECISION_LOG_BATCH_SIZE rows are waiting.
+
+    Memory is bounded by DECISION_LOG_MAX_BUFFER: once it is reached, `record()`
+    flushes in the caller, and raises DecisionLogUnavailable when that fails
+    rather than queue more or drop decisions. Rows that fail to insert are put
+    back in order and retried. `stop()` flushes what is left on shutdown.
+
+    Each process writes its own chain (fresh chain_id, seq from 1), so chains
+    never need cross-process coordination.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self._session_factory = session_factory
+        self._lock = threading.Lock() # Chain state and queue
+        self._flush_lock = threading.Lock() # One writer at a time keeps rows in chain order
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._failed_at: Optional[float] = None # Last failed flush (monotonic)
+        self._pid: Optional[int] = None
+        self.chain_id: Optional[str] = None
+        self._seq = 0
+        self._prev_hash = GENESIS_HASH
+
+    def _ensure_chain(self) -> None:
+        # A forked worker must not continue its parent's chain
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self.chain_id = uuid.uuid4().hex
+            self._seq = 0
+            self._prev_hash = GENESIS_HASH
+            self._pending.clear()
+
+    def record(
+        self,
+        *,
+        user_id: Optional[int],
+        campaign_id: Optional[int],
+        regulation_type: str,
+        approved: bool,
+        reason: Optional[str] = None,
+        inputs: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if self.pending() >= settings.DECISION_LOG_MAX_BUFFER:
+            # Retried at most once per flush interval while the database is failing
+            if not self._failed_recently():
+                self.flush()
+            if self.pending() >= settings.DECISION_LOG_MAX_BUFFER:
+                raise DecisionLogUnavailable("Compliance decision log is unavailable")
+        row = {
+            "decided_at": datetime.now(timezone.utc),
+            "user_id": user_id,
+            "campaign_id": campaign_id,
+            "regulation_type": regulation_type,
+            "approved": approved,
+            "reason": reason,
+            "inputs": canonical_json(inputs or {}),
+            "compliance_version": COMPLIANCE_VERSION,
+        }
+        with self._lock:
+            self._ensure_chain()
+            self._seq += 1
+            row.update(chain_id=self.chain_id, seq=self._seq, prev_hash=self._prev_hash)
+            row["hash"] = decision_hash(self._prev_hash, row)
+            self._prev_hash = row["hash"]
+            self._pending.append(row)
+            queued = len(self._pending)
+
+        if queued >= settings.DECISION_LOG_MAX_BUFFER:
+            self.flush() # Backpressure: a compliance record is never dropped
+        elif queued >= settings.DECISION_LOG_BATCH_SIZE:
+            self._wake.set()
+        return row
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _failed_recently(self) -> bool:
+        failed_at = self._failed_at
+        return failed_at is not None and time.monotonic() - failed_at < settings.DECISION_LOG_FLUSH_SECONDS
+
+    def flush(self) -> int:
+        """
+        Writes every queued decision; returns how many were written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+            try:
+                self._insert(batch)
+            except Exception as e:
+                with self._lock:
+                    self._pending.extendleft(reversed(batch))
+                self._failed_at = time.monotonic()
+                logging.error(f"Failed to write {len(batch)} compliance decisions, will retry: {e}")
+                return 0
+            self._failed_at = None
+            return len(batch)
+
+    def _insert(self, batch) -> None:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        db = self._session_factory()
+        try:
+            for start in range(0, len(batch), settings.DECISION_LOG_BATCH_SIZE):
+                db.execute(insert(ComplianceDecision), batch[start:start + settings.DECISION_LOG_BATCH_SIZE])
+            db.commit()
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="decision-log-flusher", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(settings.DECISION_LOG_FLUSH_SECONDS)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+
+decision_log = DecisionLog()
+
+# Last resort for processes that exit without the API shutdown event
+atexit.register(decision_log.flush)
+
+
+def verify_chain(db: Session, chain_id: str) -> Dict[str, Any]:
+    """
+    Re-derives every hash of a chain in seq order. `first_invalid_seq` is the first
+    record that was altered, inserted or follows a removed one.
+    """
+    prev_hash = GENESIS_HASH
+    expected_seq = 1
+    records = 0
+    result = db.execute(
+        select(ComplianceDecision.__table__)
+        .where(ComplianceDecision.chain_id == chain_id)
+        .order_by(ComplianceDecision.seq)
+        .execution_options(yield_per=1000)
+    ).mappings()
+    for row in result:
+        records += 1
+        if row["seq"] != expected_seq or row["prev_hash"] != prev_hash or decision_hash(prev_hash, row) != row["hash"]:
+            return {"chain_id": chain_id, "records": records, "valid": False, "first_invalid_seq": row["seq"]}
+        prev_hash = row["hash"]
+        expected_seq += 1
+    return {"chain_id": chain_id, "records": records, "valid": True, "first_invalid_seq": None}
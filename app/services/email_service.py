@@ -3,6 +3,7 @@ import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
+from app.core.metrics import track_external_call
 
 class EmailService:
     @staticmethod
@@ -19,10 +20,11 @@ class EmailService:
         msg.attach(MIMEText(html_content, "html"))
 
         try:
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.EMAILS_FROM_EMAIL, to_email, msg.as_string())
-            server.quit()
+            with track_external_call("smtp", "send_email"):
+                server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+                server.starttls()
+                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+                server.sendmail(settings.EMAILS_FROM_EMAIL, to_email, msg.as_string())
+                server.quit()
         except Exception as e:
             logging.error(f"Failed to send email: {e}")
@@ -0,0 +1,216 @@
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, Numeric, Table, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.timestamps import as_utc
+from app.models.billing import BillingLog
+from app.models.export_job import ExportJob
+from app.models.ledger import Ledger
+from app.services.storage import get_storage
+
+# Exportable tables: (table, partition keys, sort order). Rows are read in an order
+# that keeps each partition contiguous, so only one Parquet file is open at a time.
+EXPORT_TABLES = {
+    "ledger": (Ledger.__table__, ("campaign_id", "month"), ("campaign_id", "created_at", "id")),
+    "billing_log": (BillingLog.__table__, ("month",), ("created_at", "id")),
+}
+
+
+def _arrow_type(pa, column):
+    if isinstance(column.type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, (Float, Numeric)):
+        return pa.float64()
+    return pa.string()
+
+
+def arrow_schema(pa, table: Table):
+    # Explicit, so every file of a table has the same schema even when a column is all NULL
+    return pa.schema([pa.field(column.name, _arrow_type(pa, column)) for column in table.columns])
+
+
+def partition_dir(table_name: str, row: Dict, keys) -> str:
+    """
+    Hive-style directory of a row, e.g. `ledger/campaign_id=12/month=2026-10`.
+    """
+    parts = [table_name]
+    for key in keys:
+        if key == "month":
+            created_at = row.get("created_at")
+            value = as_utc(created_at).strftime("%Y-%m") if created_at else "__HIVE_DEFAULT_PARTITION__"
+        else:
+            value = row.get(key)
+            value = "__HIVE_DEFAULT_PARTITION__" if value is None else value
+        parts.append(f"{key}={value}")
+    return os.path.join(*parts)
+
+
+class _PartitionedParquetWriter:
+    """
+    Writes rows to one Parquet file per partition, flushing a row group every
+    `row_group_size` rows: memory stays bounded by one row group.
+    """
+
+    def __init__(self, pa, pq, root: str, schema, row_group_size: int, compression: str):
+        self.pa, self.pq = pa, pq
+        self.root = root
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self._dir: Optional[str] = None
+        self._writer = None
+        self._buffer: Dict[str, list] = {}
+        self._buffered = 0
+        self._files_per_dir: Dict[str, int] = {}
+
+    def write(self, directory: str, row: Dict) -> None:
+        if directory != self._dir:
+            self.close()
+            part = self._files_per_dir.get(directory, 0) # >0 only if a partition is not contiguous
+            self._files_per_dir[directory] = part + 1
+            path = os.path.join(self.root, directory, f"part-{part}.parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._writer = self.pq.ParquetWriter(path, self.schema, compression=self.compression)
+            self._dir = directory
+            self._buffer = {name: [] for name in self.schema.names}
+        for name in self.schema.names:
+            value = row[name]
+            if isinstance(value, datetime):
+                value = as_utc(value)
+            self._buffer[name].append(value)
+        self._buffered += 1
+        if self._buffered >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffered:
+            self._writer.write_table(self.pa.Table.from_pydict(self._buffer, schema=self.schema))
+            self._buffer = {name: [] for name in self.schema.names}
+            self._buffered = 0
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+            self._dir = None
+
+
+class ExportService:
+    """
+    Audit extracts of ledger/billing_log as partitioned Parquet, zipped into
+    document storage. Run by the `run_export_job` Celery task.
+    """
+
+    @staticmethod
+    def enqueue(db: Session, job: ExportJob) -> None:
+        # Celery is only imported by processes that enqueue tasks
+        from app.worker import run_export_job
+        try:
+            run_export_job.delay(job.id)
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"Could not enqueue export: {e}"
+            db.commit()
+            raise
+
+    @staticmethod
+    def write_export(db: Session, job: ExportJob, root: str) -> Dict[str, int]:
+        """
+        Streams each requested table through a server-side cursor into
+        `<root>/<table>/<partition>/part-N.parquet`. Returns row counts per table.
+        """
+        # pyarrow is heavy and only needed by the export worker
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        counts = {}
+        for table_name in job.tables.split(","):
+            table, partition_keys, order_by = EXPORT_TABLES[table_name]
+            stmt = select(table).order_by(*(table.c[name] for name in order_by))
+            if job.period_start is not None:
+                stmt = stmt.where(table.c.created_at >= job.period_start)
+            if job.period_end is not None:
+                stmt = stmt.where(table.c.created_at < job.period_end)
+            if job.campaign_id is not None and "campaign_id" in table.c:
+                stmt = stmt.where(table.c.campaign_id == job.campaign_id)
+
+            writer = _PartitionedParquetWriter(
+                pa, pq, root, arrow_schema(pa, table), settings.EXPORT_ROW_GROUP_SIZE, settings.EXPORT_COMPRESSION,
+            )
+            count = 0
+            try:
+                result = db.execute(stmt.execution_options(yield_per=settings.EXPORT_FETCH_SIZE))
+                for partition in result.mappings().partitions():
+                    for row in partition:
+                        writer.write(partition_dir(table_name, row, partition_keys), row)
+                        count += 1
+            finally:
+                writer.close()
+            counts[table_name] = count
+        return counts
+
+    @staticmethod
+    def run(db: Session, job_id: int) -> Optional[ExportJob]:
+        job = db.get(ExportJob, job_id)
+        if job is None or job.status == "completed":
+            return job
+        job.status = "running"
+        db.commit()
+        try:
+            with tempfile.TemporaryDirectory() as work:
+                tree = os.path.join(work, "export")
+                counts = ExportService.write_export(db, job, tree)
+                archive = os.path.join(work, "export.zip")
+                ExportService._zip(tree, archive, {
+                    "export_job_id": job.id,
+                    "tables": counts,
+                    "campaign_id": job.campaign_id,
+                    "period_start": job.period_start.isoformat() if job.period_start else None,
+                    "period_end": job.period_end.isoformat() if job.period_end else None,
+                })
+                key = f"exports/{job.id}/export_{job.id}.zip"
+                with open(archive, "rb") as f:
+                    chunks = iter(lambda: f.read(settings.UPLOAD_CHUNK_SIZE), b"")
+                    get_storage().put_stream(key, chunks, "application/zip")
+        except Exception as e:
+            logging.exception(f"Export job {job_id} failed")
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)[:2000]
+            db.commit()
+            return job
+
+        job.status = "completed"
+        job.storage_key = key
+        job.row_count = sum(counts.values())
+        job.completed_at = datetime.now(timezone.utc)
+        db.commit()
+        logging.info(f"Export job {job_id} wrote {counts} to {key}")
+        return job
+
+    @staticmethod
+    def _zip(tree: str, archive: str, manifest: Dict) -> None:
+        # Parquet pages are already compressed: store them as-is
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
+            zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+            for directory, _, files in os.walk(tree):
+                for name in sorted(files):
+                    path = os.path.join(directory, name)
+                    zf.write(path, arcname=os.path.relpath(path, tree))
+
+    @staticmethod
+    def open_download(job: ExportJob) -> Iterator[bytes]:
+        return get_storage().open_stream(job.storage_key, settings.UPLOAD_CHUNK_SIZE)
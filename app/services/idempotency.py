@@ -0,0 +1,129 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.timestamps import as_utc
+from app.models.idempotency import IdempotencyKey
+
+
+class IdempotencyInProgress(Exception):
+    """
+    Another request with the same key is still running.
+    """
+
+
+class IdempotencyKeyReused(Exception):
+    """
+    The key was already used for a different request payload.
+    """
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def request_fingerprint(scope: str, payload: dict) -> str:
+    canonical = json.dumps({"scope": scope, "payload": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _discard_pending(db: Session) -> None:
+    if not db.is_active or db.new or db.dirty or db.deleted:
+        db.rollback()
+
+
+class IdempotencyService:
+    @staticmethod
+    def begin(db: Session, owner: str, key: str, scope: str, payload: dict) -> Tuple[Optional[IdempotencyKey], Optional[IdempotencyKey]]:
+        """
+        Claims `key` for this request. Returns `(claimed, None)` when the caller should
+        execute the request, or `(None, completed)` when a stored response must be replayed.
+        The claim is committed immediately so concurrent duplicates see it.
+        """
+        request_hash = request_fingerprint(scope, payload)
+        now = _utcnow()
+        expires_at = now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+        existing = db.query(IdempotencyKey).filter(
+            IdempotencyKey.owner == owner, IdempotencyKey.key == key
+        ).first()
+
+        if existing is None:
+            record = IdempotencyKey(
+                owner=owner, key=key, scope=scope, request_hash=request_hash,
+                status="in_progress", created_at=now, expires_at=expires_at,
+            )
+            db.add(record)
+            try:
+                db.commit()
+            except IntegrityError:
+                # Lost the race against a concurrent duplicate
+                db.rollback()
+                raise IdempotencyInProgress(key)
+            return record, None
+
+        stale_before = now - timedelta(seconds=settings.IDEMPOTENCY_IN_PROGRESS_TIMEOUT_SECONDS)
+        expired = as_utc(existing.expires_at) <= now
+        abandoned = existing.status == "in_progress" and as_utc(existing.created_at) <= stale_before
+        if expired or abandoned:
+            # Take the row over; the created_at guard lets only one concurrent retry win
+            taken = db.query(IdempotencyKey).filter(
+                IdempotencyKey.id == existing.id,
+                IdempotencyKey.created_at == existing.created_at,
+            ).update({
+                "scope": scope,
+                "request_hash": request_hash,
+                "status": "in_progress",
+                "response_code": None,
+                "response_body": None,
+                "created_at": now,
+                "expires_at": expires_at,
+            }, synchronize_session="fetch")
+            db.commit()
+            if not taken:
+                raise IdempotencyInProgress(key)
+            return existing, None
+
+        if existing.request_hash != request_hash:
+            raise IdempotencyKeyReused(key)
+        if existing.status == "in_progress":
+            raise IdempotencyInProgress(key)
+        return None, existing
+
+    @staticmethod
+    def complete(db: Session, record: IdempotencyKey, response_code: int, response_body: dict) -> None:
+        record.status = "completed"
+        record.response_code = response_code
+        record.response_body = json.dumps(response_body)
+        db.commit()
+
+    @staticmethod
+    def fail(db: Session, record: IdempotencyKey, response_code: int, response_body: dict) -> None:
+        """
+        Stores the error response of a request that failed after committing side
+        effects, so retries replay it instead of repeating them.
+        """
+        _discard_pending(db)
+        IdempotencyService.complete(db, record, response_code, response_body)
+
+    @staticmethod
+    def release(db: Session, record: IdempotencyKey) -> None:
+        """
+        Forgets a claim whose request failed, so the client can retry with the same key.
+        """
+        record_id = inspect(record).identity[0]
+        _discard_pending(db)
+        db.query(IdempotencyKey).filter(IdempotencyKey.id == record_id).delete(synchronize_session="fetch")
+        db.commit()
+
+    @staticmethod
+    def purge_expired(db: Session) -> int:
+        deleted = db.query(IdempotencyKey).filter(
+            IdempotencyKey.expires_at < _utcnow()
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+from app.core.timestamps import as_utc
+from app.models.ledger import Ledger
+from app.models.user import User
+from app.services.compliance import ComplianceService
+
+# Ledger statuses that count towards the SEC § 227.100 12-month limit
+LIMIT_COUNTED_STATUSES = ("pending_settlement", "settled", "pending_payment")
+
+LIMIT_WINDOW = timedelta(days=365)
+
+# Attributes the annual limit is derived from
+_LIMIT_INPUTS = ("annual_income", "net_worth", "is_accredited")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _counts(transaction_type: Optional[str], status: Optional[str]) -> bool:
+    return transaction_type == "investment" and status in LIMIT_COUNTED_STATUSES
+
+
+class InvestmentLimitService:
+    """
+    Keeps each investor's Reg CF limit and 12-month exposure materialized on the user row.
+
+    - `reg_cf_annual_limit_cents` is recomputed only when income, net worth or accreditation change.
+    - `reg_cf_invested_12mo_cents` is adjusted in the same transaction as every ledger row that
+      starts or stops counting, and recomputed from the ledger only once the oldest counted
+      investment ages out of the window (`reg_cf_window_resets_at`) or after a migration.
+    """
+
+    @staticmethod
+    def refresh_annual_limit(user: User) -> None:
+        user.reg_cf_annual_limit_cents = (
+            None if user.is_accredited
+            else ComplianceService.annual_investment_limit(user.annual_income, user.net_worth)
+        )
+
+    @staticmethod
+    def exposure_is_current(user: User, now: Optional[datetime] = None) -> bool:
+        if user.reg_cf_invested_12mo_cents is None:
+            return False
+        resets_at = user.reg_cf_window_resets_at
+        return resets_at is None or as_utc(resets_at) > (now or _utcnow())
+
+    @staticmethod
+    def recompute_exposure(db: Session, user: User) -> None:
+        """
+        Recomputes the 12-month exposure from the ledger and flushes it, so ledger
+        rows added later in the same flush are counted on top of it.
+        """
+        window_start = _utcnow() - LIMIT_WINDOW
+        total, oldest = db.execute(
+            select(func.coalesce(func.sum(Ledger.amount_cents), 0), func.min(Ledger.created_at)).where(
+                Ledger.user_id == user.id,
+                Ledger.created_at >= window_start,
+                Ledger.transaction_type == "investment",
+                Ledger.status.in_(LIMIT_COUNTED_STATUSES),
+            )
+        ).one()
+        user.reg_cf_invested_12mo_cents = int(total)
+        user.reg_cf_window_resets_at = as_utc(oldest) + LIMIT_WINDOW if oldest else None
+        db.flush()
+
+    @staticmethod
+    def ensure_current(db: Session, user: User) -> int:
+        """
+        Returns the stored 12-month exposure in cents, recomputing it first if it went stale.
+        """
+        if not InvestmentLimitService.exposure_is_current(user):
+            InvestmentLimitService.recompute_exposure(db, user)
+        return user.reg_cf_invested_12mo_cents
+
+    @staticmethod
+    def remaining_capacity(user: User) -> Optional[int]:
+        """
+        Cents the investor can still commit in the current window (None: unlimited).
+        Callers must have made the exposure current.
+        """
+        if user.is_accredited or user.reg_cf_annual_limit_cents is None:
+            return None
+        return max(0, user.reg_cf_annual_limit_cents - user.reg_cf_invested_12mo_cents)
+
+
+# --- Maintenance hooks ---
+
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _refresh_limit(mapper, connection, target):
+    state = inspect(target)
+    if state.has_identity and not any(state.attrs[name].history.has_changes() for name in _LIMIT_INPUTS):
+        return
+    InvestmentLimitService.refresh_annual_limit(target)
+
+
+def _adjust_exposure(connection, user_id: int, delta: int, ledger_id: int) -> None:
+    # A NULL exposure stays NULL (NULL + x) and is recomputed on the next read
+    stmt = update(User).where(User.id == user_id)
+    if delta > 0:
+        resets_at = _utcnow() + LIMIT_WINDOW
+        stmt = stmt.values(
+            reg_cf_invested_12mo_cents=User.reg_cf_invested_12mo_cents + delta,
+            reg_cf_window_resets_at=case(
+                (User.reg_cf_window_resets_at.is_(None), resets_at),
+                (User.reg_cf_window_resets_at > resets_at, resets_at),
+                else_=User.reg_cf_window_resets_at,
+            ),
+        )
+    else:
+        # Investments that already left the window were never part of the stored sum
+        created_at = select(Ledger.created_at).where(Ledger.id == ledger_id).scalar_subquery()
+        stmt = stmt.where(created_at >= _utcnow() - LIMIT_WINDOW).values(
+            reg_cf_invested_12mo_cents=User.reg_cf_invested_12mo_cents + delta,
+        )
+    connection.execute(stmt)
+
+
+@event.listens_for(Ledger, "after_insert")
+def _count_new_entry(mapper, connection, target):
+    if target.amount_cents and _counts(target.transaction_type, target.status):
+        _adjust_exposure(connection, target.user_id, target.amount_cents, target.id)
+
+
+@event.listens_for(Ledger, "before_update")
+def _recount_entry(mapper, connection, target):
+    state = inspect(target)
+    status = state.attrs.status.history
+    if not status.has_changes():
+        return
+    if status.deleted and not state.unloaded & {"user_id", "amount_cents", "transaction_type"}:
+        previous_status, user_id, amount_cents, transaction_type = status.deleted[0], target.user_id, target.amount_cents, target.transaction_type
+    else:
+        # Status was set on an expired instance (e.g. after a commit): read what is being replaced
+        previous_status, user_id, amount_cents, transaction_type = connection.execute(
+            select(Ledger.status, Ledger.user_id, Ledger.amount_cents, Ledger.transaction_type).where(Ledger.id == target.id)
+        ).one()
+    was_counted = _counts(transaction_type, previous_status)
+    is_counted = _counts(transaction_type, target.status)
+    if was_counted != is_counted and amount_cents:
+        _adjust_exposure(connection, user_id, amount_cents if is_counted else -amount_cents, target.id)
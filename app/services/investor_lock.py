@@ -0,0 +1,99 @@
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+# Striped process-local locks: bounded memory, and two investors only contend on a hash collision
+_LOCAL_STRIPES = [threading.Lock() for _ in range(1024)]
+
+_redis_client = None
+
+
+class InvestorLockTimeout(Exception):
+    pass
+
+
+def _lock_key(investor_key: str) -> bytes:
+    return hashlib.sha256(f"investor:{investor_key}".encode()).digest()
+
+
+def _advisory_lock_id(investor_key: str) -> int:
+    # pg advisory locks take a signed 64-bit key
+    return int.from_bytes(_lock_key(investor_key)[:8], "big", signed=True)
+
+
+def _get_redis():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(settings.INVESTOR_LOCK_REDIS_URL)
+    return _redis_client
+
+
+def _backend(db: Session) -> str:
+    backend = settings.INVESTOR_LOCK_BACKEND
+    if backend != "auto":
+        return backend
+    if db.get_bind().dialect.name == "postgresql":
+        return "postgres"
+    if settings.INVESTOR_LOCK_REDIS_URL:
+        return "redis"
+    return "local"
+
+
+class InvestorLock:
+    @staticmethod
+    @contextmanager
+    def hold(db: Session, investor_key: str):
+        """
+        Serializes limit checks for one investor while other investors proceed in parallel.
+
+        - postgres: `pg_advisory_xact_lock`, released when `db` commits or rolls back,
+          so callers must commit their reservation inside the block.
+        - redis: a Redis lock, for non-Postgres databases shared by several processes.
+        - local: striped in-process locks (single-process development/tests only).
+        """
+        backend = _backend(db)
+        if backend == "postgres":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _advisory_lock_id(investor_key)})
+            yield
+            return
+
+        if backend == "redis":
+            lock = _get_redis().lock(
+                f"reg-router:investor-lock:{_lock_key(investor_key).hex()}",
+                timeout=settings.INVESTOR_LOCK_TIMEOUT_SECONDS * 3,
+                blocking_timeout=settings.INVESTOR_LOCK_TIMEOUT_SECONDS,
+            )
+        else:
+            lock = _LOCAL_STRIPES[int.from_bytes(_lock_key(investor_key)[:4], "big") % len(_LOCAL_STRIPES)]
+            lock = _TimeoutLock(lock)
+
+        if not lock.acquire():
+            raise InvestorLockTimeout(investor_key)
+        try:
+            yield
+        finally:
+            try:
+                lock.release()
+            except Exception as e:
+                # e.g. the Redis lock expired while held; the reservation is already committed
+                logging.warning(f"Failed to release investor lock: {e}")
+
+
+class _TimeoutLock:
+    """
+    Gives threading.Lock the same acquire()/release() shape as redis' Lock.
+    """
+
+    def __init__(self, lock: threading.Lock):
+        self._lock = lock
+
+    def acquire(self) -> bool:
+        return self._lock.acquire(timeout=settings.INVESTOR_LOCK_TIMEOUT_SECONDS)
+
+    def release(self) -> None:
+        self._lock.release()
@@ -0,0 +1,113 @@
+import hashlib
+import hmac
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.user import User
+from app.services.verdict_cache import VerdictCache
+
+KYC_STATUSES = ("unverified", "pending", "verified", "rejected")
+
+# Provider result -> kyc_status
+PROVIDER_STATUS_MAP = {
+    "approved": "verified",
+    "verified": "verified",
+    "declined": "rejected",
+    "rejected": "rejected",
+    "pending": "pending",
+    "review": "pending",
+    "resubmission_requested": "unverified",
+}
+
+
+def verify_provider_signature(payload: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    HMAC-SHA256 of the raw body, hex encoded (optionally prefixed with `sha256=`).
+    """
+    if not signature:
+        return False
+    if signature.startswith("sha256="):
+        signature = signature[len("sha256="):]
+    expected = hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+class KycService:
+    @staticmethod
+    def apply_updates(db: Session, updates: Iterable[Tuple[int, str]]) -> Dict:
+        """
+        Applies (user_id, kyc_status) pairs in one transaction: one UPDATE per
+        distinct status, skipping users already in it, so a redelivered batch is a
+        no-op. The last update for a user wins. Once committed, cached verdicts of
+        the changed users are dropped together and their notifications enqueued.
+        """
+        latest: Dict[int, str] = {}
+        for user_id, kyc_status in updates:
+            latest[user_id] = kyc_status
+        if not latest:
+            return {"updated": 0, "unchanged": 0, "not_found": []}
+
+        by_status: Dict[str, List[int]] = {}
+        for user_id, kyc_status in latest.items():
+            by_status.setdefault(kyc_status, []).append(user_id)
+
+        existing = set(db.execute(select(User.id).where(User.id.in_(list(latest)))).scalars())
+        changed: List[Tuple[int, str]] = []
+        for kyc_status, user_ids in by_status.items():
+            result = db.execute(
+                update(User)
+                .where(User.id.in_(user_ids), or_(User.kyc_status.is_(None), User.kyc_status != kyc_status))
+                .values(kyc_status=kyc_status)
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            )
+            changed.extend((user_id, kyc_status) for user_id in result.scalars())
+        db.commit()
+
+        # Bulk statements bypass the ORM invalidation hooks
+        VerdictCache.invalidate_users(user_id for user_id, _ in changed)
+        KycService.enqueue_notifications(changed)
+        return {
+            "updated": len(changed),
+            "unchanged": len(existing) - len(changed),
+            "not_found": sorted(set(latest) - existing),
+        }
+
+    @staticmethod
+    def enqueue_notifications(changes: List[Tuple[int, str]]) -> None:
+        """
+        One task per KYC_NOTIFY_BATCH_SIZE changes rather than one per user.
+        Best effort: the status change is already committed.
+        """
+        if not changes:
+            return
+        # Celery is only imported by processes that enqueue tasks
+        from app.worker import notify_kyc_status_changes
+        batch_size = settings.KYC_NOTIFY_BATCH_SIZE
+        for start in range(0, len(changes), batch_size):
+            batch = [list(change) for change in changes[start:start + batch_size]]
+            try:
+                notify_kyc_status_changes.delay(batch)
+            except Exception as e:
+                logging.error(f"Failed to enqueue KYC notifications for {len(batch)} users: {e}")
+
+    @staticmethod
+    def parse_provider_results(results: Iterable[Dict]) -> Tuple[List[Tuple[int, str]], List[Dict]]:
+        """
+        Maps provider results ({"reference_id": <our user id>, "status": ...}) to
+        updates; results with an unknown status or reference are returned as rejected.
+        """
+        updates, rejected = [], []
+        for result in results:
+            kyc_status = PROVIDER_STATUS_MAP.get(str(result.get("status", "")).lower())
+            try:
+                user_id = int(result.get("reference_id"))
+            except (TypeError, ValueError):
+                user_id = None
+            if kyc_status is None or user_id is None:
+                rejected.append(result)
+                continue
+            updates.append((user_id, kyc_status))
+        return updates, rejected
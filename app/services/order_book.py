@@ -0,0 +1,211 @@
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+BUY, SELL = "buy", "sell"
+PAR_BPS = 10000 # Prices are in basis points of par: 10000 trades at face value
+
+
+@dataclass(eq=False)
+class Order:
+    id: int
+    user_id: int
+    side: str
+    price_bps: Optional[int] # None for market orders
+    quantity_cents: int # Of par
+    remaining_cents: int
+    active: bool = True
+    resting: bool = False # Queued on its price level
+
+    def crosses(self, price_bps: int) -> bool:
+        if self.price_bps is None:
+            return True
+        return price_bps <= self.price_bps if self.side == BUY else price_bps >= self.price_bps
+
+
+class Fill(NamedTuple):
+    buy_order: Order
+    sell_order: Order
+    price_bps: int # The resting order's price
+    quantity_cents: int
+
+    @property
+    def amount_cents(self) -> int:
+        # What the buyer pays
+        return self.quantity_cents * self.price_bps // PAR_BPS
+
+
+class Verdict(NamedTuple):
+    quantity_cents: int # May be less than proposed
+    reject_side: Optional[str] = None # Side whose remaining quantity is cancelled after the fill
+    reason: Optional[str] = None
+
+
+class MatchResult(NamedTuple):
+    fills: List[Fill]
+    cancelled: List[Tuple[Order, str]] # (order, reason)
+
+
+# Called before each fill with (buy order, sell order, proposed quantity)
+FillCheck = Callable[[Order, Order, int], Verdict]
+
+
+class _Side:
+    """
+    Price levels of one side: a heap of prices (negated for bids) over FIFO queues.
+    Cancelled orders are only marked inactive and skipped when they reach the
+    front, so cancels are O(1) and matching pops amortized O(log levels).
+    """
+
+    def __init__(self, side: str):
+        self.sign = -1 if side == BUY else 1
+        self.heap: List[int] = []
+        self.levels: Dict[int, Deque[Order]] = {}
+        self.volume: Dict[int, int] = {} # Active remaining quantity per price
+
+    def add(self, order: Order) -> None:
+        level = self.levels.get(order.price_bps)
+        if level is None:
+            level = self.levels[order.price_bps] = deque()
+            self.volume[order.price_bps] = 0
+            heapq.heappush(self.heap, self.sign * order.price_bps)
+        level.append(order)
+        order.resting = True
+        self.volume[order.price_bps] += order.remaining_cents
+
+    def best(self) -> Optional[Order]:
+        while self.heap:
+            price = self.sign * self.heap[0]
+            level = self.levels[price]
+            while level and not level[0].active:
+                level.popleft()
+            if level:
+                return level[0]
+            heapq.heappop(self.heap)
+            del self.levels[price], self.volume[price]
+        return None
+
+    def reduce(self, order: Order, quantity_cents: int) -> None:
+        self.volume[order.price_bps] -= quantity_cents
+
+    def depth(self, levels: int) -> List[Tuple[int, int]]:
+        prices = sorted((price for price, volume in self.volume.items() if volume > 0), key=lambda p: self.sign * p)
+        return [(price, self.volume[price]) for price in prices[:levels]]
+
+
+class OrderBook:
+    """
+    Price-time priority limit order book of one campaign. Pure in-memory state:
+    persistence and compliance are the caller's (see app.services.orders).
+    """
+
+    def __init__(self, campaign_id: int):
+        self.campaign_id = campaign_id
+        self.last_event_id = 0 # Order event log position this book reflects
+        self._sides = {BUY: _Side(BUY), SELL: _Side(SELL)}
+        self._orders: Dict[int, Order] = {} # Active orders by id
+
+    def get(self, order_id: int) -> Optional[Order]:
+        return self._orders.get(order_id)
+
+    def best_bid(self) -> Optional[int]:
+        order = self._sides[BUY].best()
+        return order.price_bps if order else None
+
+    def best_ask(self) -> Optional[int]:
+        order = self._sides[SELL].best()
+        return order.price_bps if order else None
+
+    def depth(self, levels: int = 10) -> Dict[str, List[Tuple[int, int]]]:
+        return {"bids": self._sides[BUY].depth(levels), "asks": self._sides[SELL].depth(levels)}
+
+    def submit(self, order: Order, check: Optional[FillCheck] = None) -> MatchResult:
+        """
+        Matches `order` against the opposite side while prices cross, then rests
+        what is left of a limit order; a market order's remainder is cancelled.
+        A resting order of the same user is cancelled rather than traded against.
+        """
+        fills: List[Fill] = []
+        cancelled: List[Tuple[Order, str]] = []
+        self._orders[order.id] = order
+        opposite = self._sides[SELL if order.side == BUY else BUY]
+
+        while order.remaining_cents:
+            maker = opposite.best()
+            if maker is None or not order.crosses(maker.price_bps):
+                break
+            if maker.user_id == order.user_id:
+                cancelled.append((self._cancel(maker), "self_trade"))
+                continue
+
+            buy, sell = (order, maker) if order.side == BUY else (maker, order)
+            proposed = min(order.remaining_cents, maker.remaining_cents)
+            verdict = check(buy, sell, proposed) if check else Verdict(proposed)
+            quantity = min(verdict.quantity_cents, proposed)
+            if quantity < proposed and verdict.reject_side is None:
+                raise ValueError("A partial verdict must name the side to cancel")
+
+            if quantity > 0:
+                self._fill(maker, order, quantity)
+                fills.append(Fill(buy, sell, maker.price_bps, quantity))
+            if verdict.reject_side is not None:
+                rejected = buy if verdict.reject_side == BUY else sell
+                if rejected.active and rejected.remaining_cents:
+                    cancelled.append((self._cancel(rejected), verdict.reason or "rejected"))
+                if rejected is order:
+                    break
+
+        if order.active:
+            if not order.remaining_cents:
+                self._close(order)
+            elif order.price_bps is None:
+                cancelled.append((self._cancel(order), "unfilled"))
+            else:
+                self._sides[order.side].add(order)
+        return MatchResult(fills, cancelled)
+
+    def cancel(self, order_id: int) -> Optional[Order]:
+        order = self._orders.get(order_id)
+        return self._cancel(order) if order is not None else None
+
+    # --- Replay of the order event log (no matching) ---
+
+    def restore(self, order: Order) -> None:
+        """
+        Re-adds a placed order in log order, which preserves time priority.
+        """
+        self._orders[order.id] = order
+        if order.price_bps is not None:
+            self._sides[order.side].add(order)
+
+    def apply_fill(self, buy_order_id: int, sell_order_id: int, quantity_cents: int) -> None:
+        for order_id in (buy_order_id, sell_order_id):
+            order = self._orders.get(order_id)
+            if order is None:
+                continue
+            if order.resting:
+                self._sides[order.side].reduce(order, quantity_cents)
+            order.remaining_cents -= quantity_cents
+            if not order.remaining_cents:
+                self._close(order)
+
+    # --- Internals ---
+
+    def _fill(self, maker: Order, taker: Order, quantity_cents: int) -> None:
+        self._sides[maker.side].reduce(maker, quantity_cents)
+        maker.remaining_cents -= quantity_cents
+        taker.remaining_cents -= quantity_cents
+        if not maker.remaining_cents:
+            self._close(maker)
+
+    def _cancel(self, order: Order) -> Order:
+        if order.active and order.resting and order.remaining_cents:
+            self._sides[order.side].reduce(order, order.remaining_cents)
+        self._close(order)
+        return order
+
+    def _close(self, order: Order) -> None:
+        # Left in its level queue; best() drops it once it reaches the front
+        order.active = False
+        self._orders.pop(order.id, None)
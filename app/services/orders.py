@@ -0,0 +1,318 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.campaign import Campaign
+from app.models.ledger import Ledger
+from app.models.order_event import OrderEvent
+from app.models.position import Position, PositionLot
+from app.models.user import User
+from app.services.decision_log import decision_log
+from app.services.investor_lock import InvestorLock
+from app.services.order_book import BUY, SELL, Fill, MatchResult, Order, OrderBook, Verdict
+from app.services.positions import PositionService
+from app.services.verdict_cache import VerdictCache
+
+LOCKUP_DENIAL = "Asset is under 1-year lockup period (SEC Rule 501)"
+BUYER_DENIAL = "Buyer is not eligible for this offering"
+
+# One book per campaign, rebuilt lazily from the order event log. The log is the
+# source of truth: each process catches its copy up before touching it.
+_books: Dict[int, OrderBook] = {}
+# Guards each in-memory book within this process. Writers also hold the
+# cross-process matching lock; readers only need this one, since the log is
+# appended by one writer at a time and they just replay its committed prefix.
+_book_locks: Dict[int, threading.Lock] = {}
+_book_locks_guard = threading.Lock()
+
+
+class OrderRejected(Exception):
+    pass
+
+
+class TradePayment(NamedTuple):
+    # The buyer's payment for one fill, in MatchResult.fills order
+    buy_ledger_id: int
+    status: str # pending_payment, or failed when no PaymentIntent could be created (the trade is unwound)
+    stripe_payment_intent_id: Optional[str] = None
+    client_secret: Optional[str] = None
+
+
+class OrderService:
+    """
+    Secondary-market order books. Every change to a book is appended to
+    `order_events` and committed together with the fills' position and ledger
+    changes, all under a per-campaign lock.
+
+    A fill moves the quantity out of the seller's lots into a pending lot of
+    the buyer and asks the buyer for payment (one PaymentIntent per fill). The
+    Stripe webhook settles the lot into the buyer's position; a failed or
+    expired payment gives the quantity back to the seller. The fill itself
+    stays in the book's log.
+    """
+
+    @staticmethod
+    def place(
+        db: Session,
+        user: User,
+        campaign: Campaign,
+        side: str,
+        price_bps: Optional[int],
+        quantity_cents: int,
+        now: Optional[datetime] = None,
+    ) -> Tuple[Order, MatchResult, List[TradePayment]]:
+        """
+        Places a limit order (or a market order when `price_bps` is None) and
+        matches it. Lockup and buyer eligibility are checked again at match time,
+        since a resting order can match long after it was placed.
+        """
+        now = now or datetime.now(timezone.utc)
+        if side == SELL and PositionService.sellable(db, user.id, campaign.id, now) < quantity_cents:
+            position = db.get(Position, (user.id, campaign.id))
+            held = position.quantity_cents if position else 0
+            raise OrderRejected(LOCKUP_DENIAL if held >= quantity_cents else "Insufficient holdings in this campaign")
+        if side == BUY and not OrderService._buyer_eligible(db, user.id, campaign, {}):
+            raise OrderRejected(BUYER_DENIAL)
+
+        with InvestorLock.hold(db, _lock_key(campaign.id)), _book_lock(campaign.id):
+            book = OrderService._sync(db, campaign.id)
+            try:
+                placed = OrderEvent(
+                    campaign_id=campaign.id, event_type="placed", user_id=user.id, side=side,
+                    price_bps=price_bps, quantity_cents=quantity_cents,
+                )
+                db.add(placed)
+                db.flush()
+                order = Order(placed.id, user.id, side, price_bps, quantity_cents, quantity_cents)
+                result = book.submit(order, OrderService._fill_check(db, campaign, now))
+
+                events = [placed]
+                trades = []
+                for fill in result.fills:
+                    buy_ledger_id, sell_ledger_id = OrderService._settle(db, campaign, fill, now)
+                    trades.append((fill, buy_ledger_id, sell_ledger_id))
+                    events.append(OrderEvent(
+                        campaign_id=campaign.id, event_type="fill", order_id=order.id, price_bps=fill.price_bps,
+                        quantity_cents=fill.quantity_cents, buy_order_id=fill.buy_order.id, sell_order_id=fill.sell_order.id,
+                        buy_ledger_id=buy_ledger_id, sell_ledger_id=sell_ledger_id,
+                    ))
+                for cancelled, reason in result.cancelled:
+                    events.append(OrderEvent(campaign_id=campaign.id, event_type="cancelled", order_id=cancelled.id, reason=reason))
+                OrderService._commit(db, book, events)
+            except Exception:
+                OrderService._discard(db, campaign.id)
+                raise
+        # Outside the book lock: Stripe calls must not hold up matching
+        payments = [OrderService._request_payment(db, campaign, *trade) for trade in trades]
+        return order, result, payments
+
+    @staticmethod
+    def fail_trade(db: Session, buy_entry: Ledger) -> bool:
+        """
+        Unwinds the trade of an unpaid trade_buy row: its PaymentIntent is
+        cancelled so it can no longer be paid, then the quantity goes back to the
+        seller and both ledger rows fail. Stages the changes for the caller to
+        commit. False (nothing done) when the trade is no longer pending or the
+        PaymentIntent could not be cancelled, e.g. because it just succeeded.
+        """
+        if buy_entry.transaction_type != "trade_buy" or buy_entry.status != "pending_payment":
+            return False
+        if buy_entry.stripe_payment_intent_id:
+            try:
+                from app.services.stripe_service import StripeService
+                StripeService.cancel_payment_intent(buy_entry.stripe_payment_intent_id)
+            except Exception as e:
+                logging.warning(f"Could not cancel the payment of trade {buy_entry.id}: {e}")
+                return False
+        fill = db.execute(select(OrderEvent).where(OrderEvent.buy_ledger_id == buy_entry.id)).scalar_one()
+        sell_entry = db.get(Ledger, fill.sell_ledger_id)
+        PositionService.unwind_purchase(db, buy_entry, sell_entry)
+        buy_entry.status = sell_entry.status = "failed"
+        return True
+
+    @staticmethod
+    def expire_unpaid_trades(db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Fails trades whose buyer has not paid within TRADE_PAYMENT_WINDOW_HOURS,
+        so the seller's quantity is not held forever. Returns the number unwound.
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=settings.TRADE_PAYMENT_WINDOW_HOURS)
+        unpaid = db.execute(
+            select(Ledger).where(
+                Ledger.transaction_type == "trade_buy",
+                Ledger.status == "pending_payment",
+                Ledger.created_at < cutoff,
+            )
+        ).scalars().all()
+        expired = 0
+        for buy_entry in unpaid:
+            if OrderService.fail_trade(db, buy_entry):
+                db.commit()
+                expired += 1
+        return expired
+
+    @staticmethod
+    def cancel(db: Session, user: User, order_id: int) -> Optional[Order]:
+        """
+        Cancels an open order of `user`; None when it is not open (unknown,
+        filled or already cancelled).
+        """
+        placed = db.get(OrderEvent, order_id)
+        if placed is None or placed.event_type != "placed" or placed.user_id != user.id:
+            return None
+        with InvestorLock.hold(db, _lock_key(placed.campaign_id)), _book_lock(placed.campaign_id):
+            book = OrderService._sync(db, placed.campaign_id)
+            try:
+                order = book.cancel(order_id)
+                if order is None:
+                    return None
+                event = OrderEvent(campaign_id=placed.campaign_id, event_type="cancelled", order_id=order_id, reason="user")
+                OrderService._commit(db, book, [event])
+            except Exception:
+                OrderService._discard(db, placed.campaign_id)
+                raise
+        return order
+
+    @staticmethod
+    def depth(db: Session, campaign_id: int, levels: int) -> Dict[str, List[Tuple[int, int]]]:
+        # Reads never take the matching lock, so book views cannot hold up order placement
+        with _book_lock(campaign_id):
+            return OrderService._sync(db, campaign_id).depth(levels)
+
+    @staticmethod
+    def reset() -> None:
+        """
+        Forgets every in-memory book; they are rebuilt from the log on next use.
+        """
+        _books.clear()
+
+    # --- Internals ---
+
+    @staticmethod
+    def _sync(db: Session, campaign_id: int) -> OrderBook:
+        # Replays the events appended since this copy last saw the log
+        book = _books.get(campaign_id) or OrderBook(campaign_id)
+        events = db.execute(
+            select(OrderEvent)
+            .where(OrderEvent.campaign_id == campaign_id, OrderEvent.id > book.last_event_id)
+            .order_by(OrderEvent.id)
+        ).scalars()
+        for event in events:
+            if event.event_type == "placed":
+                book.restore(Order(event.id, event.user_id, event.side, event.price_bps, event.quantity_cents, event.quantity_cents))
+            elif event.event_type == "fill":
+                book.apply_fill(event.buy_order_id, event.sell_order_id, event.quantity_cents)
+            elif event.event_type == "cancelled":
+                book.cancel(event.order_id)
+            book.last_event_id = event.id
+        _books[campaign_id] = book
+        return book
+
+    @staticmethod
+    def _commit(db: Session, book: OrderBook, events: List[OrderEvent]) -> None:
+        db.add_all(events)
+        db.flush()
+        last_event_id = max(event.id for event in events)
+        db.commit()
+        book.last_event_id = last_event_id
+
+    @staticmethod
+    def _discard(db: Session, campaign_id: int) -> None:
+        # The book may hold matches that were never logged
+        db.rollback()
+        _books.pop(campaign_id, None)
+
+    @staticmethod
+    def _fill_check(db: Session, campaign: Campaign, now: datetime):
+        sellable: Dict[int, int] = {} # Seller -> quantity out of lockup not yet matched
+        eligible: Dict[int, bool] = {}
+
+        def check(buy: Order, sell: Order, quantity_cents: int) -> Verdict:
+            if not OrderService._buyer_eligible(db, buy.user_id, campaign, eligible, order_id=buy.id):
+                return Verdict(0, BUY, BUYER_DENIAL)
+            if sell.user_id not in sellable:
+                sellable[sell.user_id] = PositionService.sellable(db, sell.user_id, campaign.id, now)
+            available = min(sellable[sell.user_id], quantity_cents)
+            sellable[sell.user_id] -= available
+            if available < quantity_cents:
+                return Verdict(available, SELL, LOCKUP_DENIAL)
+            return Verdict(quantity_cents)
+
+        return check
+
+    @staticmethod
+    def _buyer_eligible(db: Session, user_id: int, campaign: Campaign, memo: Dict[int, bool], order_id: Optional[int] = None) -> bool:
+        if user_id not in memo:
+            lane = campaign.regulation_type
+            verdict = VerdictCache.eligibility(user_id, lambda: db.get(User, user_id)).get(lane)
+            memo[user_id] = bool(verdict and verdict[0])
+            if order_id is not None:
+                decision_log.record(
+                    user_id=user_id,
+                    campaign_id=campaign.id,
+                    regulation_type=lane,
+                    approved=memo[user_id],
+                    reason=None if memo[user_id] else BUYER_DENIAL,
+                    inputs={"secondary_buy_order_id": order_id},
+                )
+        return memo[user_id]
+
+    @staticmethod
+    def _settle(db: Session, campaign: Campaign, fill: Fill, now: datetime) -> Tuple[int, int]:
+        """
+        Moves the quantity from the seller's lots (FIFO) to a pending lot of the
+        buyer, and books the cash legs on the ledger, awaiting the buyer's
+        payment. Returns the (trade_buy, trade_sell) ledger ids.
+        """
+        seller_id, buyer_id = fill.sell_order.user_id, fill.buy_order.user_id
+        taken = PositionService.sell(db, seller_id, campaign.id, fill.quantity_cents, now)
+        # The buyer's lot keeps the latest acquisition date of the lots sold
+        acquired_at = max(db.get(PositionLot, lot_id).acquired_at for lot_id, _ in taken)
+
+        sell_entry = Ledger(user_id=seller_id, campaign_id=campaign.id, amount_cents=fill.amount_cents,
+                            transaction_type="trade_sell", status="pending_payment")
+        buy_entry = Ledger(user_id=buyer_id, campaign_id=campaign.id, amount_cents=fill.amount_cents,
+                           transaction_type="trade_buy", status="pending_payment")
+        db.add_all([sell_entry, buy_entry])
+        db.flush()
+        PositionService.acquire(db, buy_entry, fill.quantity_cents, acquired_at)
+        return buy_entry.id, sell_entry.id
+
+    @staticmethod
+    def _request_payment(db: Session, campaign: Campaign, fill: Fill, buy_ledger_id: int, sell_ledger_id: int) -> TradePayment:
+        buy_entry = db.get(Ledger, buy_ledger_id)
+        try:
+            from app.services.stripe_service import StripeService
+            payment_intent = StripeService.create_payment_intent(
+                amount_cents=fill.amount_cents,
+                metadata={
+                    "user_id": fill.buy_order.user_id,
+                    "campaign_id": campaign.id,
+                    "transaction_type": "trade",
+                    "buy_order_id": fill.buy_order.id,
+                    "sell_order_id": fill.sell_order.id,
+                },
+            )
+        except Exception as e:
+            logging.warning(f"Payment request for trade {buy_ledger_id} failed: {e}")
+            OrderService.fail_trade(db, buy_entry)
+            db.commit()
+            return TradePayment(buy_ledger_id, "failed")
+
+        # Both legs settle (or fail) with this payment in the Stripe webhook
+        buy_entry.stripe_payment_intent_id = payment_intent.id
+        db.get(Ledger, sell_ledger_id).stripe_payment_intent_id = payment_intent.id
+        db.commit()
+        return TradePayment(buy_ledger_id, "pending_payment", payment_intent.id, payment_intent.client_secret)
+
+
+def _lock_key(campaign_id: int) -> str:
+    return f"order-book:{campaign_id}"
+
+
+def _book_lock(campaign_id: int) -> threading.Lock:
+    with _book_locks_guard:
+        return _book_locks.setdefault(campaign_id, threading.Lock())
@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+import logging
+import re
+import tempfile
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.storage import get_storage
+
+# Tables range-partitioned by month on created_at (Postgres only, see migration 2b8d6f0e5c93)
+PARTITIONED_TABLES = ("ledger", "billing_log")
+
+# The SEC § 227.100 exposure looks back 12 months; keep the current month on top of that
+MIN_RETENTION_MONTHS = 13
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_name(name: str) -> Optional[Tuple[str, date]]:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return match["table"], date(int(match["year"]), int(match["month"]), 1)
+
+
+def partition_bounds(month: date) -> Tuple[date, date]:
+    """
+    [from, to) range of the partition holding `month`.
+    """
+    return month, add_months(month, 1)
+
+
+def archive_cutoff(today: date, retention_months: int) -> date:
+    """
+    Partitions for months before the returned month are archived.
+    """
+    if retention_months < MIN_RETENTION_MONTHS:
+        raise ValueError(f"Retention must cover the 12-month limit window (>= {MIN_RETENTION_MONTHS} months)")
+    return add_months(month_start(today), -(retention_months - 1))
+
+
+def _sha256(chunks: Iterable[bytes]) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+class PartitionArchiveError(Exception):
+    pass
+
+
+class PartitionManager:
+    """
+    Creates upcoming monthly partitions and archives expired ones. Both are no-ops
+    on databases other than Postgres, where the tables are not partitioned.
+    """
+
+    @staticmethod
+    def list_partitions(db: Session, table: str) -> List[str]:
+        return db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table ORDER BY c.relname"
+        ), {"table": table}).scalars().all()
+
+    @staticmethod
+    def ensure_future_partitions(db: Session, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+        """
+        Creates partitions from the current month through `months_ahead` months out.
+        Run ahead of time so new rows never land in the default partition.
+        """
+        if not _is_postgres(db):
+            return []
+        months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+        current = month_start(today or datetime.now(timezone.utc).date())
+        created = []
+        for table in PARTITIONED_TABLES:
+            existing = set(PartitionManager.list_partitions(db, table))
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(table, month)
+                if name in existing:
+                    continue
+                start, end = partition_bounds(month)
+                db.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+                created.append(name)
+        db.commit()
+        return created
+
+    @staticmethod
+    def archive_old_partitions(db: Session, retention_months: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+        """
+        Archives each partition older than the retention window to document
+        storage as `partition-archive/<table>/<partition>.csv.gz` (COPY ... CSV
+        HEADER), then detaches and drops it. The partition is only dropped once
+        the stored object reads back with the checksum that was written, so a
+        failed run leaves it in place for the next one. Off unless
+        PARTITION_RETENTION_MONTHS is set.
+        """
+        retention_months = settings.PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+        if not _is_postgres(db) or retention_months is None:
+            return []
+        cutoff = archive_cutoff(today or datetime.now(timezone.utc).date(), retention_months)
+
+        archived = []
+        for table in PARTITIONED_TABLES:
+            for name in PartitionManager.list_partitions(db, table):
+                parsed = parse_partition_name(name)
+                if parsed is None or parsed[1] >= cutoff:
+                    continue # Default partition or still retained
+                key = f"partition-archive/{table}/{name}.csv.gz"
+                with tempfile.TemporaryFile() as staged:
+                    # Held until the drop commits, so no write can miss the archive
+                    db.execute(text(f'LOCK TABLE "{name}" IN SHARE MODE'))
+                    with gzip.GzipFile(fileobj=staged, mode="wb") as out, db.connection().connection.cursor() as cursor:
+                        cursor.copy_expert(f'COPY "{name}" TO STDOUT WITH (FORMAT csv, HEADER)', out)
+                    staged.seek(0)
+                    written = _sha256(iter(lambda: staged.read(settings.UPLOAD_CHUNK_SIZE), b""))
+                    staged.seek(0)
+                    get_storage().put_stream(key, iter(lambda: staged.read(settings.UPLOAD_CHUNK_SIZE), b""), "application/gzip")
+                stored = _sha256(get_storage().open_stream(key, settings.UPLOAD_CHUNK_SIZE))
+                if stored != written:
+                    db.rollback()
+                    raise PartitionArchiveError(f"Archive of {name} at {key} does not match what was written")
+
+                db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+                db.execute(text(f'DROP TABLE "{name}"'))
+                db.commit()
+                logging.info(f"Archived partition {name} to {key}")
+                archived.append(name)
+        return archived
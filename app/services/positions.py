@@ -0,0 +1,202 @@
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.ledger import Ledger
+from app.models.position import Position, PositionLot
+from app.services.compliance import ComplianceService
+
+
+class InsufficientHoldings(Exception):
+    pass
+
+
+class LockedHoldings(Exception):
+    """
+    The holder owns enough, but not enough of it is past the lockup.
+    """
+
+
+class PositionService:
+    """
+    Keeps `positions`/`position_lots` in step with the ledger. Callers own the
+    transaction: each method only stages changes, so the holding moves in the
+    same commit as the ledger row that caused it.
+    """
+
+    @staticmethod
+    def record_settlement(db: Session, ledger_entry: Ledger) -> Optional[PositionLot]:
+        """
+        Adds the lot acquired by a settled investment. Idempotent per ledger row,
+        so redelivered webhooks and retried tasks do not double the position.
+        """
+        if ledger_entry.transaction_type == "trade_buy":
+            return PositionService.settle_purchase(db, ledger_entry)
+        if ledger_entry.transaction_type != "investment":
+            return None
+        if db.execute(select(PositionLot.id).where(PositionLot.ledger_id == ledger_entry.id)).first():
+            return None
+
+        return PositionService._open_lot(
+            db, ledger_entry, ledger_entry.amount_cents, ledger_entry.created_at or datetime.now(timezone.utc),
+        )
+
+    @staticmethod
+    def acquire(db: Session, ledger_entry: Ledger, quantity_cents: int, acquired_at: datetime) -> PositionLot:
+        """
+        Adds the lot bought in a secondary trade, pending until the buyer's
+        payment settles. `acquired_at` is carried over from the lots sold, so a
+        transfer does not shorten the lockup.
+        """
+        return PositionService._open_lot(db, ledger_entry, quantity_cents, acquired_at, pending=True)
+
+    @staticmethod
+    def settle_purchase(db: Session, buy_entry: Ledger) -> Optional[PositionLot]:
+        """
+        The buyer's payment settled: the pending lot joins the position.
+        Idempotent; None when there is no pending lot (settled or unwound).
+        """
+        lot = PositionService._lot(db, buy_entry.id)
+        if lot is None or not lot.pending or not lot.remaining_cents:
+            return None
+        lot.pending = False
+        PositionService._add_to_position(db, lot.user_id, lot.campaign_id, lot.remaining_cents)
+        db.flush()
+        return lot
+
+    @staticmethod
+    def unwind_purchase(db: Session, buy_entry: Ledger, sell_entry: Ledger) -> int:
+        """
+        The buyer's payment failed: drops the pending lot and gives the quantity
+        back to the seller as a lot keyed on the trade_sell row. It is dated like
+        the buyer's lot, i.e. at the latest acquisition of the lots sold, which
+        were all out of lockup. Idempotent; returns the quantity given back.
+        """
+        lot = PositionService._lot(db, buy_entry.id)
+        if lot is None or not lot.pending or not lot.remaining_cents:
+            return 0
+        returned = lot.remaining_cents
+        lot.remaining_cents = 0
+        PositionService._open_lot(db, sell_entry, returned, lot.acquired_at)
+        return returned
+
+    @staticmethod
+    def sellable(db: Session, user_id: int, campaign_id: int, now: Optional[datetime] = None) -> int:
+        """
+        Quantity held out of lockup.
+        """
+        cutoff = ComplianceService.lockup_cutoff(now or datetime.now(timezone.utc))
+        return db.execute(
+            select(func.coalesce(func.sum(PositionLot.remaining_cents), 0)).where(
+                PositionLot.user_id == user_id,
+                PositionLot.campaign_id == campaign_id,
+                PositionLot.remaining_cents > 0,
+                PositionLot.pending.is_(False),
+                PositionLot.acquired_at <= cutoff,
+            )
+        ).scalar_one()
+
+    @staticmethod
+    def sold_from(db: Session, ledger_entry: Ledger) -> int:
+        """
+        Quantity already sold out of the lot of a settled investment.
+        """
+        lot = db.execute(select(PositionLot).where(PositionLot.ledger_id == ledger_entry.id)).scalar_one_or_none()
+        return lot.quantity_cents - lot.remaining_cents if lot is not None else 0
+
+    @staticmethod
+    def release(db: Session, ledger_entry: Ledger) -> int:
+        """
+        Drops what is left of the lot of a settled investment that is being
+        unwound (e.g. cancelled and refunded). Returns the quantity removed.
+        """
+        lot = db.execute(
+            select(PositionLot).where(PositionLot.ledger_id == ledger_entry.id).with_for_update()
+        ).scalar_one_or_none()
+        if lot is None or not lot.remaining_cents:
+            return 0
+        released = lot.remaining_cents
+        lot.remaining_cents = 0
+        position = PositionService._position(db, lot.user_id, lot.campaign_id)
+        if position is not None:
+            position.quantity_cents -= released
+        return released
+
+    @staticmethod
+    def sell(db: Session, user_id: int, campaign_id: int, amount_cents: int, now: Optional[datetime] = None) -> List[Tuple[int, int]]:
+        """
+        Sells `amount_cents` out of the holder's lots, oldest first (FIFO).
+        Only lots acquired at least a year ago may be sold (SEC § 227.501); as
+        they are the oldest, the walk stops at the first locked lot.
+        Returns the (lot id, quantity taken) pairs.
+        """
+        position = PositionService._position(db, user_id, campaign_id)
+        if position is None or position.quantity_cents < amount_cents:
+            raise InsufficientHoldings()
+
+        cutoff = ComplianceService.lockup_cutoff(now or datetime.now(timezone.utc))
+        lots = db.execute(
+            select(PositionLot)
+            .where(
+                PositionLot.user_id == user_id,
+                PositionLot.campaign_id == campaign_id,
+                PositionLot.remaining_cents > 0,
+                PositionLot.pending.is_(False),
+                PositionLot.acquired_at <= cutoff,
+            )
+            .order_by(PositionLot.acquired_at, PositionLot.id)
+            .with_for_update()
+        ).scalars()
+
+        taken: List[Tuple[int, int]] = []
+        outstanding = amount_cents
+        for lot in lots:
+            take = min(lot.remaining_cents, outstanding)
+            taken.append((lot, take))
+            outstanding -= take
+            if not outstanding:
+                break
+        if outstanding:
+            raise LockedHoldings()
+
+        for lot, take in taken:
+            lot.remaining_cents -= take
+        position.quantity_cents -= amount_cents
+        return [(lot.id, take) for lot, take in taken]
+
+    @staticmethod
+    def _open_lot(db: Session, ledger_entry: Ledger, quantity_cents: int, acquired_at: datetime, pending: bool = False) -> PositionLot:
+        lot = PositionLot(
+            user_id=ledger_entry.user_id,
+            campaign_id=ledger_entry.campaign_id,
+            ledger_id=ledger_entry.id,
+            acquired_at=acquired_at,
+            quantity_cents=quantity_cents,
+            remaining_cents=quantity_cents,
+            pending=pending,
+        )
+        db.add(lot)
+        if not pending:
+            PositionService._add_to_position(db, ledger_entry.user_id, ledger_entry.campaign_id, quantity_cents)
+        db.flush() # Visible to a second settlement in the same transaction
+        return lot
+
+    @staticmethod
+    def _add_to_position(db: Session, user_id: int, campaign_id: int, quantity_cents: int) -> None:
+        position = PositionService._position(db, user_id, campaign_id)
+        if position is None:
+            db.add(Position(user_id=user_id, campaign_id=campaign_id, quantity_cents=quantity_cents))
+        else:
+            position.quantity_cents += quantity_cents
+
+    @staticmethod
+    def _lot(db: Session, ledger_id: int) -> Optional[PositionLot]:
+        return db.execute(
+            select(PositionLot).where(PositionLot.ledger_id == ledger_id).with_for_update()
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def _position(db: Session, user_id: int, campaign_id: int) -> Optional[Position]:
+        return db.execute(
+            select(Position).where(Position.user_id == user_id, Position.campaign_id == campaign_id).with_for_update()
+        ).scalar_one_or_none()
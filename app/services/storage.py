@@ -0,0 +1,147 @@
+import logging
+import os
+import uuid
+from typing import BinaryIO, Iterator, Optional
+from app.core.config import settings
+
+PDF_MAGIC = b"%PDF-"
+
+# S3 multipart parts must be at least 5 MiB (except the last one)
+S3_PART_SIZE = 8 * 1024 * 1024
+
+
+class DocumentRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def iter_validated_pdf(file: BinaryIO, max_bytes: int, chunk_size: int) -> Iterator[bytes]:
+    """
+    Yields `file` in chunks, checking the PDF signature on the first chunk and
+    the size limit as bytes arrive, so an oversized upload is cut off without
+    ever being held in memory.
+    """
+    total = 0
+    first = True
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        if first:
+            if not chunk.startswith(PDF_MAGIC):
+                raise DocumentRejected(400, "Only PDF files are accepted.")
+            first = False
+        total += len(chunk)
+        if total > max_bytes:
+            raise DocumentRejected(413, f"File exceeds the {max_bytes // (1024 * 1024)} MB limit.")
+        yield chunk
+    if first:
+        raise DocumentRejected(400, "Empty file.")
+
+
+class FilesystemStorage:
+    """
+    Local directory backend for development and tests.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def put_stream(self, key: str, chunks: Iterator[bytes], content_type: str) -> None:
+        path = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.partial"
+        try:
+            with open(partial, "wb") as out:
+                for chunk in chunks:
+                    out.write(chunk)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+    def open_stream(self, key: str, chunk_size: int) -> Iterator[bytes]:
+        with open(os.path.join(self.root, key), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+
+class S3Storage:
+    """
+    S3-compatible backend (AWS, or MinIO via STORAGE_S3_ENDPOINT_URL) using a
+    multipart upload, so at most one part is buffered per upload.
+    """
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None):
+        # boto3 is heavy to import and only needed by processes that store documents
+        import boto3
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def put_stream(self, key: str, chunks: Iterator[bytes], content_type: str) -> None:
+        upload = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=key, ContentType=content_type, ServerSideEncryption="AES256",
+        )
+        upload_id = upload["UploadId"]
+        parts = []
+        buffer = bytearray()
+        try:
+            for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= S3_PART_SIZE:
+                    parts.append(self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+                    buffer.clear()
+            if buffer or not parts:
+                parts.append(self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            try:
+                self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            except Exception as e:
+                logging.warning(f"Failed to abort multipart upload {upload_id}: {e}")
+            raise
+
+    def open_stream(self, key: str, chunk_size: int) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def _upload_part(self, key: str, upload_id: str, number: int, body: bytes) -> dict:
+        part = self.client.upload_part(Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body)
+        return {"PartNumber": number, "ETag": part["ETag"]}
+
+
+_storage = None
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "s3":
+            _storage = S3Storage(settings.STORAGE_S3_BUCKET, settings.STORAGE_S3_ENDPOINT_URL)
+        else:
+            _storage = FilesystemStorage(settings.STORAGE_ROOT)
+    return _storage
+
+
+class StorageService:
+    @staticmethod
+    def store_accreditation_document(user_id: int, file: BinaryIO) -> str:
+        """
+        Streams a validated PDF to storage and returns its key. Blocking: call it
+        from a worker thread, not the event loop.
+        """
+        key = f"accreditation/{user_id}/{uuid.uuid4().hex}.pdf"
+        chunks = iter_validated_pdf(file, settings.ACCREDITATION_UPLOAD_MAX_BYTES, settings.UPLOAD_CHUNK_SIZE)
+        get_storage().put_stream(key, chunks, "application/pdf")
+        return key
@@ -1,35 +1,82 @@
-
-import stripe
+from typing import TYPE_CHECKING, Optional
 from app.core import config
 from app.core.config import settings
+from app.core.metrics import track_external_call
+
+if TYPE_CHECKING:
+    import stripe
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
+_stripe_module = None
+
+def _stripe():
+    """
+    Imports and configures the Stripe SDK on first use; importing it eagerly
+    costs >100ms on every worker boot even for processes that never call Stripe.
+    """
+    global _stripe_module
+    if _stripe_module is None:
+        import stripe
+        stripe.api_key = settings.STRIPE_SECRET_KEY
+        _stripe_module = stripe
+    return _stripe_module
 
 class StripeService:
     @staticmethod
-    def create_payment_intent(amount: float, currency: str = "usd", metadata: dict = None, transfer_group: str = None) -> stripe.PaymentIntent:
+    def create_payment_intent(amount_cents: int, currency: str = "usd", metadata: dict = None, transfer_group: str = None) -> "stripe.PaymentIntent":
         """
         Creates a PaymentIntent for an investment.
         Amount is in cents.
         """
+        stripe = _stripe()
         try:
-            return stripe.PaymentIntent.create(
-                amount=int(amount * 100),  # Convert to cents
-                currency=currency,
-                metadata=metadata or {},
-                transfer_group=transfer_group,
-                capture_method="manual",  # Hold funds in escrow
-            )
+            with track_external_call("stripe", "create_payment_intent"):
+                return stripe.PaymentIntent.create(
+                    amount=amount_cents,
+                    currency=currency,
+                    metadata=metadata or {},
+                    transfer_group=transfer_group,
+                    capture_method="manual",  # Hold funds in escrow
+                )
         except stripe.error.StripeError as e:
             raise Exception(f"Stripe Error: {str(e)}")
 
     @staticmethod
-    def refund_payment(payment_intent_id: str) -> stripe.Refund:
+    def refund_payment(payment_intent_id: str, amount_cents: Optional[int] = None, idempotency_key: Optional[str] = None) -> "stripe.Refund":
         """
-        Refunds a payment intent.
+        Refunds a payment intent, in full or `amount_cents` of it (one
+        investment of a multi-campaign checkout). Stripe answers a repeated
+        `idempotency_key` with the first refund instead of refunding again.
         """
+        stripe = _stripe()
+        params = {"payment_intent": payment_intent_id}
+        if amount_cents is not None:
+            params["amount"] = amount_cents
+        if idempotency_key is not None:
+            params["idempotency_key"] = idempotency_key
+        try:
+            with track_external_call("stripe", "refund"):
+                return stripe.Refund.create(**params)
+        except stripe.error.StripeError as e:
+            raise Exception(f"Stripe Error: {str(e)}")
+
+    @staticmethod
+    def cancel_payment_intent(payment_intent_id: str) -> "stripe.PaymentIntent":
+        """
+        Cancels a PaymentIntent that has not succeeded, so it can no longer be paid.
+        """
+        stripe = _stripe()
+        try:
+            with track_external_call("stripe", "cancel_payment_intent"):
+                return stripe.PaymentIntent.cancel(payment_intent_id)
+        except stripe.error.StripeError as e:
+            raise Exception(f"Stripe Error: {str(e)}")
+
+    @staticmethod
+    def retrieve_payment_intent(payment_intent_id: str) -> "stripe.PaymentIntent":
+        stripe = _stripe()
         try:
-            return stripe.Refund.create(payment_intent=payment_intent_id)
+            with track_external_call("stripe", "retrieve_payment_intent"):
+                return stripe.PaymentIntent.retrieve(payment_intent_id)
         except stripe.error.StripeError as e:
             raise Exception(f"Stripe Error: {str(e)}")
 
@@ -38,6 +85,6 @@ class StripeService:
         """
         Verifies and reconstructs a webhook event.
         """
-        return stripe.Webhook.construct_event(
+        return _stripe().Webhook.construct_event(
             payload, sig_header, secret
         )
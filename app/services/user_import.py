@@ -0,0 +1,151 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core import security
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.compliance import ComplianceService
+
+# Below this many passwords, pool start-up costs more than hashing inline
+MIN_POOL_BATCH = 32
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_hash_pool(workers: int) -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        # spawn, not fork: forking a threaded API process can deadlock the child
+        _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _hash_pool
+
+
+def hash_passwords(passwords: List[str], workers: Optional[int] = None) -> List[str]:
+    """
+    argon2 hashes in input order. argon2 is deliberately CPU-bound, so large
+    batches are spread over a process pool (USER_IMPORT_HASH_WORKERS, default: CPU count).
+    """
+    workers = settings.USER_IMPORT_HASH_WORKERS if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < MIN_POOL_BATCH:
+        return [security.get_password_hash(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(_get_hash_pool(workers).map(security.get_password_hash, passwords, chunksize=chunksize))
+
+
+def _error(index: int, email: Optional[str], message: str) -> Dict[str, Any]:
+    return {"row": index, "email": email, "error": message}
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors())
+
+
+def _existing(db: Session, emails: Iterable[str], stripe_ids: Iterable[str]) -> tuple:
+    rows = db.execute(
+        select(User.email, User.stripe_id).where(or_(User.email.in_(list(emails)), User.stripe_id.in_(list(stripe_ids))))
+    ).all()
+    return {email for email, _ in rows}, {stripe_id for _, stripe_id in rows}
+
+
+class UserImportService:
+    """
+    Bulk investor onboarding for portal migrations.
+    """
+
+    @staticmethod
+    def import_users(db: Session, records: List[Dict[str, Any]], chunk_size: Optional[int] = None, hash_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Validates, dedupes and inserts `records` (UserCreate fields) chunk by chunk.
+
+        Per chunk: one query finds emails/stripe ids that already exist, the passwords
+        are hashed in the process pool and the survivors go in as one multi-row INSERT,
+        committed on its own. A bad row is reported in `errors` (0-based `row`) and
+        never fails the rest of the import.
+        """
+        chunk_size = chunk_size or settings.USER_IMPORT_CHUNK_SIZE
+        errors: List[Dict[str, Any]] = []
+        valid = []
+        seen_emails, seen_stripe_ids = set(), set()
+        for index, record in enumerate(records):
+            try:
+                user_in = UserCreate.model_validate(record)
+            except ValidationError as e:
+                email = record.get("email") if isinstance(record, dict) else None
+                errors.append(_error(index, email, _validation_message(e)))
+                continue
+            if user_in.email in seen_emails or user_in.stripe_id in seen_stripe_ids:
+                errors.append(_error(index, user_in.email, "Duplicate email or stripe_id in this import"))
+                continue
+            seen_emails.add(user_in.email)
+            seen_stripe_ids.add(user_in.stripe_id)
+            valid.append((index, user_in))
+
+        created = 0
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            chunk = UserImportService._drop_existing(db, chunk, errors)
+            if not chunk:
+                continue
+            hashes = hash_passwords([user_in.password for _, user_in in chunk], hash_workers)
+            rows = [UserImportService._row(user_in, hashed) for (_, user_in), hashed in zip(chunk, hashes)]
+            try:
+                db.execute(insert(User), rows)
+                db.commit()
+            except IntegrityError:
+                # Lost a race with a concurrent signup: drop the newly taken rows and retry once
+                db.rollback()
+                kept = UserImportService._drop_existing(db, chunk, errors)
+                kept_indexes = {index for index, _ in kept}
+                rows = [row for (index, _), row in zip(chunk, rows) if index in kept_indexes]
+                if rows:
+                    db.execute(insert(User), rows)
+                    db.commit()
+                chunk = kept
+            created += len(chunk)
+
+        errors.sort(key=lambda error: error["row"])
+        logging.info(f"Imported {created} users, {len(errors)} rows rejected")
+        return {"created": created, "errors": errors}
+
+    @staticmethod
+    def _drop_existing(db: Session, chunk: list, errors: List[Dict[str, Any]]) -> list:
+        existing_emails, existing_stripe_ids = _existing(
+            db, (user_in.email for _, user_in in chunk), (user_in.stripe_id for _, user_in in chunk)
+        )
+        if not existing_emails and not existing_stripe_ids:
+            return chunk
+        kept = []
+        for index, user_in in chunk:
+            if user_in.email in existing_emails:
+                errors.append(_error(index, user_in.email, "The user with this username already exists in the system."))
+            elif user_in.stripe_id in existing_stripe_ids:
+                errors.append(_error(index, user_in.email, "A user with this stripe_id already exists."))
+            else:
+                kept.append((index, user_in))
+        return kept
+
+    @staticmethod
+    def _row(user_in: UserCreate, hashed_password: str) -> Dict[str, Any]:
+        is_accredited = bool(user_in.is_accredited)
+        return {
+            "email": user_in.email,
+            "stripe_id": user_in.stripe_id,
+            "hashed_password": hashed_password,
+            "kyc_status": user_in.kyc_status or "unverified",
+            "is_accredited": is_accredited,
+            "net_worth": user_in.net_worth,
+            "annual_income": user_in.annual_income,
+            # Core inserts skip the ORM hook that maintains the limit (app.services.investment_limit)
+            "reg_cf_annual_limit_cents": None if is_accredited else ComplianceService.annual_investment_limit(
+                user_in.annual_income, user_in.net_worth
+            ),
+            "reg_cf_invested_12mo_cents": 0,
+        }
@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.user import User
+from app.services.compliance import COMPLIANCE_VERSION, ComplianceService
+
+# Lanes whose verdict depends only on the user and the clock, not the amount.
+# REG_CF here is its KYC gate; the § 227.100 limit is checked per investment.
+CACHED_LANES = ("REG_CF", "506_B", "506_C")
+
+Verdict = Tuple[bool, Optional[float]]  # (eligible, valid-until epoch seconds or None)
+
+_lock = threading.Lock()
+_local: "OrderedDict[Tuple[int, str, str], Tuple[bool, Optional[float], float]]" = OrderedDict()
+_redis_client = None
+
+
+def _evaluate(user: User, lane: str) -> Tuple[bool, Optional[datetime]]:
+    if lane == "REG_CF":
+        return ComplianceService.check_kyc(user), None
+    if lane == "506_B":
+        return ComplianceService.evaluate_reg_d_506b(user)
+    if lane == "506_C":
+        return ComplianceService.evaluate_reg_d_506c(user)
+    raise ValueError(f"Unknown lane {lane}")
+
+
+def _get_redis():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(settings.VERDICT_CACHE_REDIS_URL)
+    return _redis_client
+
+
+def _redis_key(user_id: int, lane: str) -> str:
+    return f"reg-router:verdict:{COMPLIANCE_VERSION}:{user_id}:{lane}"
+
+
+class VerdictCache:
+    """
+    Memoizes amount-independent lane verdicts per (user id, lane, COMPLIANCE_VERSION).
+
+    Each entry expires at the earlier of the rule's own validity window (end of the
+    506(b) cool-off, 506(c) accreditation expiry) and VERDICT_CACHE_TTL_SECONDS, and is
+    dropped when the user row changes. Set VERDICT_CACHE_REDIS_URL to share the cache
+    (and its invalidation) across worker processes. Without it, only "not eligible"
+    verdicts are kept: invalidation reaches just the process that made the change,
+    and a revoked KYC or accreditation must not stay eligible in the others.
+    """
+
+    @staticmethod
+    def get(user_id: int, lane: str) -> Optional[Verdict]:
+        now = time.time()
+        if settings.VERDICT_CACHE_REDIS_URL:
+            raw = _get_redis().get(_redis_key(user_id, lane))
+            if raw is None:
+                return None
+            eligible, valid_until = json.loads(raw)
+            return None if valid_until is not None and valid_until <= now else (eligible, valid_until)
+
+        key = (user_id, lane, COMPLIANCE_VERSION)
+        with _lock:
+            entry = _local.get(key)
+            if entry is None:
+                return None
+            eligible, valid_until, expires_at = entry
+            if expires_at <= now:
+                del _local[key]
+                return None
+            _local.move_to_end(key)
+            return eligible, valid_until
+
+    @staticmethod
+    def put(user_id: int, lane: str, eligible: bool, valid_until: Optional[datetime]) -> Verdict:
+        now = time.time()
+        valid_until_ts = valid_until.timestamp() if valid_until else None
+        expires_at = now + settings.VERDICT_CACHE_TTL_SECONDS
+        if valid_until_ts is not None:
+            expires_at = min(expires_at, valid_until_ts)
+        if expires_at > now:
+            if settings.VERDICT_CACHE_REDIS_URL:
+                _get_redis().set(
+                    _redis_key(user_id, lane),
+                    json.dumps([eligible, valid_until_ts]),
+                    ex=max(1, int(expires_at - now)),
+                )
+            elif not eligible:
+                with _lock:
+                    _local[(user_id, lane, COMPLIANCE_VERSION)] = (eligible, valid_until_ts, expires_at)
+                    _local.move_to_end((user_id, lane, COMPLIANCE_VERSION))
+                    while len(_local) > settings.VERDICT_CACHE_MAX_ENTRIES:
+                        _local.popitem(last=False)
+        return eligible, valid_until_ts
+
+    @staticmethod
+    def check(user: User, lane: str) -> bool:
+        cached = VerdictCache.get(user.id, lane)
+        if cached is not None:
+            return cached[0]
+        return VerdictCache.put(user.id, lane, *_evaluate(user, lane))[0]
+
+    @staticmethod
+    def eligibility(user_id: int, load_user) -> Dict[str, Verdict]:
+        """
+        Verdicts for every cached lane; `load_user()` is only called on a cache miss.
+        """
+        verdicts = {lane: VerdictCache.get(user_id, lane) for lane in CACHED_LANES}
+        missing = [lane for lane, verdict in verdicts.items() if verdict is None]
+        if missing:
+            user = load_user()
+            if user is None:
+                return {}
+            for lane in missing:
+                verdicts[lane] = VerdictCache.put(user_id, lane, *_evaluate(user, lane))
+        return verdicts
+
+    @staticmethod
+    def invalidate_users(user_ids: Iterable[int]) -> None:
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        if settings.VERDICT_CACHE_REDIS_URL:
+            _get_redis().delete(*[_redis_key(user_id, lane) for user_id in user_ids for lane in CACHED_LANES])
+            return
+        with _lock:
+            for user_id in user_ids:
+                for lane in CACHED_LANES:
+                    _local.pop((user_id, lane, COMPLIANCE_VERSION), None)
+
+    @staticmethod
+    def clear() -> None:
+        with _lock:
+            _local.clear()
+
+
+# --- Invalidation on user mutation ---
+# ORM updates are collected per session and dropped from the cache once committed,
+# so a concurrent reader cannot re-cache the pre-commit row. Bulk `query.update()`
+# statements bypass these hooks and must call VerdictCache.invalidate_users().
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_dirty(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("verdict_cache_dirty", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    dirty = session.info.pop("verdict_cache_dirty", None)
+    if dirty:
+        VerdictCache.invalidate_users(dirty)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop("verdict_cache_dirty", None)
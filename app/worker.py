@@ -1,8 +1,17 @@
 import time
 import logging
+from typing import List
 from app.core.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.models.ledger import Ledger
+from app.models.user import User
+from app.services.email_service import EmailService
+from app.services.analytics import AnalyticsService
+from app.services.exports import ExportService
+from app.services.idempotency import IdempotencyService
+from app.services.orders import OrderService
+from app.services.partitions import PartitionManager
+from app.services.positions import PositionService
 
 @celery_app.task(acks_late=True)
 def settle_investment_task(ledger_id: int):
@@ -14,6 +23,7 @@ def settle_investment_task(ledger_id: int):
         ledger_entry = db.query(Ledger).filter(Ledger.id == ledger_id).first()
         if ledger_entry and ledger_entry.status == "pending_settlement":
             ledger_entry.status = "settled"
+            PositionService.record_settlement(db, ledger_entry)
             db.commit()
             logging.info(f"Investment {ledger_id} settled successfully.")
         else:
@@ -22,3 +32,75 @@ def settle_investment_task(ledger_id: int):
         logging.error(f"Error settling investment {ledger_id}: {e}")
     finally:
         db.close()
+
+@celery_app.task
+def purge_expired_idempotency_keys():
+    db = SessionLocal()
+    try:
+        deleted = IdempotencyService.purge_expired(db)
+        logging.info(f"Purged {deleted} expired idempotency keys.")
+    finally:
+        db.close()
+
+@celery_app.task
+def maintain_partitions():
+    db = SessionLocal()
+    try:
+        created = PartitionManager.ensure_future_partitions(db)
+        archived = PartitionManager.archive_old_partitions(db)
+        logging.info(f"Partitions created: {created}; archived: {archived}.")
+    finally:
+        db.close()
+
+@celery_app.task
+def expire_unpaid_trades():
+    db = SessionLocal()
+    try:
+        expired = OrderService.expire_unpaid_trades(db)
+        logging.info(f"Unwound {expired} unpaid trades.")
+    finally:
+        db.close()
+
+@celery_app.task
+def refresh_campaign_stats():
+    db = SessionLocal()
+    try:
+        refreshed = AnalyticsService.refresh_campaign_stats(db)
+        logging.info(f"Refreshed stats for {refreshed} campaigns.")
+    finally:
+        db.close()
+
+@celery_app.task(acks_late=True)
+def run_export_job(job_id: int):
+    db = SessionLocal()
+    try:
+        job = ExportService.run(db, job_id)
+        if job is not None:
+            logging.info(f"Export job {job_id} {job.status}.")
+    finally:
+        db.close()
+
+KYC_STATUS_MESSAGES = {
+    "verified": "Your identity verification is complete. You can now invest.",
+    "rejected": "We could not verify your identity. Please contact support.",
+    "pending": "Your identity verification is under review.",
+    "unverified": "Please resubmit your identity verification.",
+}
+
+@celery_app.task
+def notify_kyc_status_changes(changes: List[list]):
+    """
+    Emails users about KYC status changes, [[user_id, kyc_status], ...], loading all recipients in one query.
+    """
+    statuses = {user_id: kyc_status for user_id, kyc_status in changes}
+    db = SessionLocal()
+    try:
+        recipients = db.query(User.id, User.email).filter(User.id.in_(list(statuses))).all()
+    finally:
+        db.close()
+    for user_id, email in recipients:
+        EmailService.send_email(
+            to_email=email,
+            subject="Identity Verification Update",
+            html_content=KYC_STATUS_MESSAGES.get(statuses[user_id], f"Your verification status is now {statuses[user_id]}."),
+        )
@@ -0,0 +1,67 @@
+"""
+Microbenchmarks for the ComplianceService lanes.
+
+    python -m benchmarks.compliance_bench --number 200000
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.compliance import ComplianceService
+
+
+def _fixtures():
+    now = datetime.now(timezone.utc)
+    user = SimpleNamespace(
+        kyc_status="verified",
+        is_accredited=False,
+        annual_income=90000.0,
+        net_worth=150000.0,
+        accreditation_status="VERIFIED_DOCS",
+        accreditation_expiry=now + timedelta(days=30),
+        created_at=now - timedelta(days=90),
+    )
+    campaign = SimpleNamespace(target_amount_cents=100000_00, deadline=now + timedelta(days=10))
+    return now, user, campaign
+
+
+def run(number: int = 100000, repeat: int = 5) -> dict:
+    """
+    Returns the best-of-`repeat` throughput (calls/sec) for each check.
+    """
+    now, user, campaign = _fixtures()
+    cases = {
+        "check_kyc": lambda: ComplianceService.check_kyc(user),
+        "check_investment_limit": lambda: ComplianceService.check_investment_limit(user, 500_00, 1500_00),
+        "check_reg_d_506b": lambda: ComplianceService.check_reg_d_506b(user),
+        "check_reg_d_506c": lambda: ComplianceService.check_reg_d_506c(user),
+        "check_lockup_period": lambda: ComplianceService.check_lockup_period(now - timedelta(days=400)),
+        "check_escrow_threshold": lambda: ComplianceService.check_escrow_threshold(campaign, 50000_00),
+        "check_cancellation_window": lambda: ComplianceService.check_cancellation_window(campaign.deadline),
+    }
+    results = {}
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=number, repeat=repeat))
+        results[name] = {"calls_per_sec": round(number / best), "ns_per_call": round(best / number * 1e9, 1)}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-record", action="store_true", help="Print only, do not write a results file")
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat)
+    for name, stats in results.items():
+        print(f"{name:28s} {stats['calls_per_sec']:>12,} calls/s {stats['ns_per_call']:>10} ns/call")
+
+    if not args.no_record:
+        from benchmarks.record import record_results
+        print(f"Recorded -> {record_results('compliance', results)}")
+
+
+if __name__ == "__main__":
+    main()
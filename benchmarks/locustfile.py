@@ -0,0 +1,89 @@
+"""
+Load-test scenarios for the hot endpoints. Seed data and start the stubbed API first:
+
+    python -m benchmarks.seed --users 2000 --campaigns 200
+    python -m benchmarks.serve --workers 4
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 \\
+        --headless -u 200 -r 20 -t 2m --csv benchmarks/results/run
+    python -m benchmarks.record locust benchmarks/results/run_stats.csv --name invest-mix
+"""
+import json
+import os
+import random
+import uuid
+from pathlib import Path
+
+from locust import HttpUser, between, task
+
+MANIFEST_PATH = Path(os.environ.get("BENCH_MANIFEST", Path(__file__).parent / "results" / "seed_manifest.json"))
+MANIFEST = json.loads(MANIFEST_PATH.read_text())
+API = "/api/v1"
+
+# Compliance rejections are legitimate outcomes, not load-test failures
+EXPECTED_INVEST_STATUSES = {200, 403}
+
+
+class InvestorUser(HttpUser):
+    wait_time = between(0.1, 0.5)
+
+    def on_start(self):
+        account = random.choice(MANIFEST["users"])
+        self.user_id = account["id"]
+        res = self.client.post(
+            f"{API}/login/access-token",
+            data={"username": account["email"], "password": MANIFEST["password"]},
+            name="/login/access-token",
+        )
+        self.headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    @task(5)
+    def invest(self):
+        with self.client.post(
+            f"{API}/ledger/invest",
+            json={
+                "campaign_id": random.choice(MANIFEST["campaign_ids"]),
+                "amount": float(random.choice([10, 25, 50, 100])),
+                "transaction_type": "investment",
+            },
+            headers=self.headers,
+            name="/ledger/invest",
+            catch_response=True,
+        ) as res:
+            if res.status_code in EXPECTED_INVEST_STATUSES:
+                res.success()
+
+    @task(5)
+    def read_ledger(self):
+        self.client.get(f"{API}/ledger/{self.user_id}", headers=self.headers, name="/ledger/{user_id}")
+
+    @task(8)
+    def list_campaigns(self):
+        self.client.get(f"{API}/campaigns/?skip=0&limit=100", name="/campaigns/")
+
+    @task(1)
+    def login(self):
+        account = random.choice(MANIFEST["users"])
+        self.client.post(
+            f"{API}/login/access-token",
+            data={"username": account["email"], "password": MANIFEST["password"]},
+            name="/login/access-token",
+        )
+
+
+class StripeWebhookUser(HttpUser):
+    """
+    Replays Stripe events; signature checks are disabled by `benchmarks.stubs`.
+    """
+    wait_time = between(0.5, 1.0)
+    weight = 1
+
+    @task
+    def payment_succeeded(self):
+        self.client.post(
+            f"{API}/webhooks/stripe",
+            json={
+                "type": "payment_intent.succeeded",
+                "data": {"object": {"id": f"pi_bench_{uuid.uuid4().hex}"}},
+            },
+            name="/webhooks/stripe",
+        )
@@ -0,0 +1,82 @@
+"""
+Matching throughput of the in-memory order book (app.services.order_book) on one
+core: a seeded stream of limit orders around par, with a share of market orders
+and cancels, submitted to a single campaign's book.
+
+    python -m benchmarks.order_book_bench --orders 200000
+
+Measures the engine only: the event log writes and position moves that
+OrderService adds per order are database round trips, covered by the locust runs.
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from app.services.order_book import BUY, SELL, Order, OrderBook, Verdict
+
+
+def _stream(orders: int, seed: int) -> List[Tuple]:
+    rng = random.Random(seed)
+    stream = []
+    for order_id in range(1, orders + 1):
+        kind = rng.random()
+        if kind < 0.1 and order_id > 1:
+            stream.append(("cancel", rng.randrange(1, order_id)))
+            continue
+        side = BUY if rng.random() < 0.5 else SELL
+        price = None if kind < 0.15 else 10000 + rng.randint(-50, 50) * 10
+        stream.append(("order", Order(order_id, rng.randrange(1, 1000), side, price, 0, 0), rng.randint(1, 100) * 100))
+    return stream
+
+
+def _replay(stream: List[Tuple], check) -> Tuple[float, int]:
+    book = OrderBook(1)
+    fills = 0
+    start = time.perf_counter()
+    for item in stream:
+        if item[0] == "cancel":
+            book.cancel(item[1])
+            continue
+        template, quantity = item[1], item[2]
+        order = Order(template.id, template.user_id, template.side, template.price_bps, quantity, quantity)
+        fills += len(book.submit(order, check).fills)
+    return time.perf_counter() - start, fills
+
+
+def run(orders: int = 200000, repeat: int = 3, seed: int = 42) -> dict:
+    """
+    Best-of-`repeat` orders/sec with no fill check and with a pass-through one
+    (the cost of the compliance hook's call, not of its lookups).
+    """
+    stream = _stream(orders, seed)
+    cases = {
+        "match_no_check": None,
+        "match_with_check": lambda buy, sell, quantity: Verdict(quantity),
+    }
+    results = {}
+    for name, check in cases.items():
+        best, fills = min(_replay(stream, check) for _ in range(repeat))
+        results[name] = {"orders_per_sec": round(orders / best), "us_per_order": round(best / orders * 1e6, 2), "fills": fills}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-record", action="store_true", help="Print only, do not write a results file")
+    args = parser.parse_args()
+
+    results = run(args.orders, args.repeat, args.seed)
+    for name, stats in results.items():
+        print(f"{name:20s} {stats['orders_per_sec']:>10,} orders/s {stats['us_per_order']:>8} us/order {stats['fills']:>9,} fills")
+
+    if not args.no_record:
+        from benchmarks.record import record_results
+        print(f"Recorded -> {record_results('order_book', results)}")
+
+
+if __name__ == "__main__":
+    main()
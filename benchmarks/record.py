@@ -0,0 +1,98 @@
+"""
+Stores benchmark results tagged with the git commit so runs can be compared across commits.
+
+    python -m benchmarks.record locust benchmarks/results/run_stats.csv --name invest-mix
+    python -m benchmarks.record compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import csv
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def record_results(name: str, results: dict, out_dir: Path = RESULTS_DIR) -> Path:
+    commit = _git("rev-parse", "--short", "HEAD")
+    payload = {
+        "name": name,
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{name}-{commit}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.json"
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def parse_locust_stats(csv_path: Path) -> dict:
+    """
+    Keeps throughput, failure count and latency percentiles per endpoint from locust's `*_stats.csv`.
+    """
+    results = {}
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            results[row["Name"]] = {
+                "requests": int(row["Request Count"]),
+                "failures": int(row["Failure Count"]),
+                "requests_per_sec": float(row["Requests/s"]),
+                "p50_ms": float(row["50%"]),
+                "p95_ms": float(row["95%"]),
+                "p99_ms": float(row["99%"]),
+            }
+    return results
+
+
+def compare(baseline: dict, candidate: dict) -> list:
+    """
+    Percentage change for every numeric metric present in both result sets.
+    """
+    rows = []
+    for case, base_stats in baseline["results"].items():
+        cand_stats = candidate["results"].get(case)
+        if not cand_stats:
+            continue
+        for metric, base_value in base_stats.items():
+            cand_value = cand_stats.get(metric)
+            if isinstance(base_value, (int, float)) and isinstance(cand_value, (int, float)) and base_value:
+                rows.append((case, metric, base_value, cand_value, (cand_value - base_value) / base_value * 100))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    locust_cmd = sub.add_parser("locust", help="Record a locust *_stats.csv file")
+    locust_cmd.add_argument("csv_path", type=Path)
+    locust_cmd.add_argument("--name", default="locust")
+    compare_cmd = sub.add_parser("compare", help="Compare two recorded result files")
+    compare_cmd.add_argument("baseline", type=Path)
+    compare_cmd.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "locust":
+        print(f"Recorded -> {record_results(args.name, parse_locust_stats(args.csv_path))}")
+    else:
+        baseline = json.loads(args.baseline.read_text())
+        candidate = json.loads(args.candidate.read_text())
+        print(f"{baseline['commit']} -> {candidate['commit']}")
+        for case, metric, base_value, cand_value, change in compare(baseline, candidate):
+            print(f"{case:28s} {metric:16s} {base_value:>14,.1f} {cand_value:>14,.1f} {change:>+8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Seeds users, campaigns and ledger rows at a configurable scale.
+
+    python -m benchmarks.seed --users 10000 --campaigns 500 --ledger-per-user 5
+
+Writes a manifest (user emails/ids, campaign ids) that the locust scenarios read.
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core import security
+from app.db.base import Base
+
+BENCH_PASSWORD = "benchmark-password"
+DEFAULT_MANIFEST = Path(__file__).parent / "results" / "seed_manifest.json"
+
+REGULATION_TYPES = ["REG_CF", "REG_CF", "506_B", "506_C"]
+ACCREDITATION_STATUSES = ["NONE", "NONE", "SELF_CERTIFIED", "VERIFIED_DOCS", "PENDING_REVIEW"]
+LEDGER_STATUSES = ["pending_payment", "pending_settlement", "settled", "settled", "cancelled"]
+
+
+def seed(
+    db: Session,
+    users: int = 1000,
+    campaigns: int = 100,
+    ledger_per_user: int = 5,
+    random_seed: int = 42,
+    chunk_size: int = 5000,
+) -> dict:
+    """
+    Inserts the data set in multi-row chunks and returns the manifest.
+    Every user shares one password hash: argon2 is deliberately slow and
+    hashing per row would dominate seeding time.
+    """
+    rng = random.Random(random_seed)
+    now = datetime.now(timezone.utc)
+    run_tag = f"{int(now.timestamp())}_{rng.randrange(10**6)}"
+    hashed_password = security.get_password_hash(BENCH_PASSWORD)
+
+    user_rows = []
+    for i in range(users):
+        accreditation_status = rng.choice(ACCREDITATION_STATUSES)
+        user_rows.append({
+            "email": f"bench_{run_tag}_{i}@example.com",
+            "stripe_id": f"cus_bench_{run_tag}_{i}",
+            "hashed_password": hashed_password,
+            "kyc_status": "verified" if rng.random() < 0.9 else "unverified",
+            "is_accredited": accreditation_status == "VERIFIED_DOCS",
+            "annual_income": rng.choice([40000, 80000, 150000, 300000]),
+            "net_worth": rng.choice([50000, 100000, 250000, 1000000]),
+            "accreditation_status": accreditation_status,
+            "accreditation_expiry": now + timedelta(days=60) if accreditation_status == "VERIFIED_DOCS" else None,
+            "created_at": now - timedelta(days=rng.randint(0, 400)),
+        })
+    _insert_chunked(db, models.User, user_rows, chunk_size)
+
+    campaign_rows = [
+        {
+            "name": f"Bench Campaign {run_tag} {i}",
+            "issuer_id": 1,
+            "target_amount_cents": rng.choice([50000, 100000, 500000, 1000000]) * 100,
+            "deadline": now + timedelta(days=rng.randint(3, 120)),
+            "funding_status": "active",
+            "regulation_type": rng.choice(REGULATION_TYPES),
+        }
+        for i in range(campaigns)
+    ]
+    _insert_chunked(db, models.Campaign, campaign_rows, chunk_size)
+    db.commit()
+
+    user_ids = db.execute(
+        select(models.User.id, models.User.email).where(models.User.email.like(f"bench_{run_tag}_%"))
+    ).all()
+    campaign_ids = db.execute(
+        select(models.Campaign.id).where(models.Campaign.name.like(f"Bench Campaign {run_tag} %"))
+    ).scalars().all()
+
+    ledger_rows = []
+    for user_id, _ in user_ids:
+        for _ in range(ledger_per_user):
+            ledger_rows.append({
+                "user_id": user_id,
+                "campaign_id": rng.choice(campaign_ids),
+                "amount_cents": rng.choice([100, 250, 500, 1000]) * 100,
+                "transaction_type": "investment",
+                "status": rng.choice(LEDGER_STATUSES),
+                "created_at": now - timedelta(days=rng.randint(0, 500)),
+            })
+            if len(ledger_rows) >= chunk_size:
+                _insert_chunked(db, models.Ledger, ledger_rows, chunk_size)
+                ledger_rows = []
+    _insert_chunked(db, models.Ledger, ledger_rows, chunk_size)
+    db.commit()
+
+    return {
+        "run_tag": run_tag,
+        "password": BENCH_PASSWORD,
+        "users": [{"id": user_id, "email": email} for user_id, email in user_ids],
+        "campaign_ids": list(campaign_ids),
+    }
+
+
+def _insert_chunked(db: Session, model, rows: list, chunk_size: int) -> None:
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        if chunk:
+            db.execute(insert(model), chunk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--campaigns", type=int, default=100)
+    parser.add_argument("--ledger-per-user", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal, engine
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        manifest = seed(db, args.users, args.campaigns, args.ledger_per_user, args.seed)
+    finally:
+        db.close()
+
+    args.manifest.parent.mkdir(parents=True, exist_ok=True)
+    args.manifest.write_text(json.dumps(manifest))
+    print(f"Seeded {len(manifest['users'])} users, {len(manifest['campaign_ids'])} campaigns -> {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
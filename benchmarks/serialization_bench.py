@@ -0,0 +1,113 @@
+"""
+Serialization cost of the list endpoints: ORM objects validated through the
+response schema and encoded with json (the default FastAPI path) versus column
+tuples encoded with orjson (the path read_campaigns/read_transactions use).
+
+    python -m benchmarks.serialization_bench --rows 5000 --page-size 100
+
+Runs against an in-memory SQLite database, so it measures the per-worker CPU
+spent between the query and the response bytes.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.api.fast_json import FastJSONResponse
+from app.api.v1.endpoints.campaigns import _CAMPAIGN_LIST_COLUMNS, _campaign_list_item
+from app.api.v1.endpoints.ledger import _LEDGER_LIST_COLUMNS, _ledger_list_item
+from app.db.base import Base
+
+
+def _seed(db: Session, rows: int) -> None:
+    now = datetime.now(timezone.utc)
+    db.execute(insert(models.Campaign), [
+        {"name": f"Campaign {i}", "issuer_id": 1, "target_amount_cents": 1_000_000 + i, "deadline": now + timedelta(days=30),
+         "funding_status": "active", "regulation_type": "REG_CF", "created_at": now}
+        for i in range(rows)
+    ])
+    db.execute(insert(models.Ledger), [
+        {"user_id": 1, "campaign_id": i % 50 + 1, "amount_cents": 10_000 + i, "transaction_type": "investment",
+         "status": "settled", "stripe_payment_intent_id": f"pi_{i}", "created_at": now}
+        for i in range(rows)
+    ])
+    db.commit()
+
+
+def _schema_path(db: Session, model, schema, page_size: int, rows: int) -> int:
+    adapter = TypeAdapter(List[schema])
+    encoded = 0
+    for offset in range(0, rows, page_size):
+        objects = db.query(model).offset(offset).limit(page_size).all()
+        content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+        encoded += len(json.dumps(content).encode())
+        db.expunge_all()
+    return encoded
+
+
+def _tuple_path(db: Session, columns, to_dict, page_size: int, rows: int) -> int:
+    encoded = 0
+    for offset in range(0, rows, page_size):
+        page = db.execute(select(*columns).offset(offset).limit(page_size)).all()
+        encoded += len(FastJSONResponse([to_dict(row) for row in page]).body)
+    return encoded
+
+
+def run(rows: int = 5000, page_size: int = 100, repeat: int = 3) -> dict:
+    """
+    Best-of-`repeat` rows/sec for each endpoint and path (one process, one thread).
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    results = {}
+    with Session(engine) as db:
+        _seed(db, rows)
+        cases = {
+            "campaigns_schema": lambda: _schema_path(db, models.Campaign, schemas.Campaign, page_size, rows),
+            "campaigns_tuples_orjson": lambda: _tuple_path(db, _CAMPAIGN_LIST_COLUMNS, _campaign_list_item, page_size, rows),
+            "ledger_schema": lambda: _schema_path(db, models.Ledger, schemas.Ledger, page_size, rows),
+            "ledger_tuples_orjson": lambda: _tuple_path(db, _LEDGER_LIST_COLUMNS, _ledger_list_item, page_size, rows),
+        }
+        for name, fn in cases.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - start)
+            results[name] = {"rows_per_sec": round(rows / best), "us_per_row": round(best / rows * 1e6, 2)}
+    for endpoint in ("campaigns", "ledger"):
+        results[f"{endpoint}_speedup"] = round(
+            results[f"{endpoint}_tuples_orjson"]["rows_per_sec"] / results[f"{endpoint}_schema"]["rows_per_sec"], 2
+        )
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-record", action="store_true", help="Print only, do not write a results file")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.page_size, args.repeat)
+    for name, stats in results.items():
+        if isinstance(stats, dict):
+            print(f"{name:26s} {stats['rows_per_sec']:>10,} rows/s {stats['us_per_row']:>8} us/row")
+        else:
+            print(f"{name:26s} {stats:>10}x")
+
+    if not args.no_record:
+        from benchmarks.record import record_results
+        print(f"Recorded -> {record_results('serialization', results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Runs the API with Stripe/SMTP stubbed, for load tests:
+
+    python -m benchmarks.serve --workers 4
+"""
+import argparse
+
+import uvicorn
+
+from benchmarks import stubs
+
+
+def create_app():
+    stubs.install()
+    from app.main import app
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "benchmarks.serve:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
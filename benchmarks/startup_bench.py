@@ -0,0 +1,61 @@
+"""
+Profiles application import time with `python -X importtime`.
+
+    python -m benchmarks.startup_bench --top 25
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def profile_imports(module: str = "app.main", env: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Imports `module` in a fresh interpreter and returns cumulative import time
+    (microseconds) for every module it pulled in.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-record", action="store_true")
+    args = parser.parse_args()
+
+    profile_imports(args.module)  # warm the bytecode cache
+    runs = [profile_imports(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda r: r[args.module])
+
+    for name, micros in sorted(best.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"{micros / 1000:>9.1f} ms  {name}")
+
+    if not args.no_record:
+        from benchmarks.record import record_results
+        results = {args.module: {"import_ms": round(best[args.module] / 1000, 1), "modules": len(best)}}
+        print(f"Recorded -> {record_results('startup', results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Local stand-ins for Stripe and SMTP so load tests measure Reg-Router, not third parties.
+Set BENCH_STRIPE_LATENCY_MS to simulate a realistic Stripe round trip.
+"""
+import json
+import os
+import time
+import uuid
+from types import SimpleNamespace
+
+from app.services.email_service import EmailService
+from app.services.stripe_service import StripeService
+
+
+def _stripe_latency() -> None:
+    latency_ms = float(os.environ.get("BENCH_STRIPE_LATENCY_MS", "0"))
+    if latency_ms:
+        time.sleep(latency_ms / 1000)
+
+
+def _create_payment_intent(*args, **kwargs):
+    _stripe_latency()
+    pi_id = f"pi_bench_{uuid.uuid4().hex}"
+    return SimpleNamespace(id=pi_id, client_secret=f"{pi_id}_secret")
+
+
+def _refund_payment(payment_intent_id: str, amount_cents=None, idempotency_key=None):
+    _stripe_latency()
+    return SimpleNamespace(id=f"re_bench_{uuid.uuid4().hex}", status="succeeded")
+
+
+def _cancel_payment_intent(payment_intent_id: str):
+    _stripe_latency()
+    return SimpleNamespace(id=payment_intent_id, status="canceled")
+
+
+def _retrieve_payment_intent(payment_intent_id: str):
+    _stripe_latency()
+    return SimpleNamespace(id=payment_intent_id, client_secret=f"{payment_intent_id}_secret")
+
+
+def _construct_event(payload: bytes, sig_header: str, secret: str):
+    # No signature verification: locust posts unsigned events
+    return json.loads(payload)
+
+
+def _send_email(to_email: str, subject: str, html_content: str):
+    return None
+
+
+def install() -> None:
+    StripeService.create_payment_intent = staticmethod(_create_payment_intent)
+    StripeService.refund_payment = staticmethod(_refund_payment)
+    StripeService.cancel_payment_intent = staticmethod(_cancel_payment_intent)
+    StripeService.retrieve_payment_intent = staticmethod(_retrieve_payment_intent)
+    StripeService.construct_event = staticmethod(_construct_event)
+    EmailService.send_email = staticmethod(_send_email)
@@ -9,9 +9,11 @@ from app.db.base import Base
 from app.models.user import User
 from app.models.campaign import Campaign
 from app.models.ledger import Ledger
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
 from app.core.config import settings
 from app.main import app
+from app.services.orders import OrderService
+from app.services.verdict_cache import VerdictCache
 
 # Use the database URL from settings (Postgres)
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
@@ -19,6 +21,17 @@ SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs DATABASE_URL to point at Postgres (run in CI)")
+
+def pytest_collection_modifyitems(config, items):
+    if engine.dialect.name == "postgresql":
+        return
+    skip = pytest.mark.skip(reason="needs Postgres")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
 @pytest.fixture(scope="session")
 def db_engine():
     Base.metadata.create_all(bind=engine)
@@ -45,5 +58,13 @@ def override_get_db(db):
     def _get_db_override():
         yield db
     app.dependency_overrides[get_db] = _get_db_override
+    app.dependency_overrides[get_read_db] = _get_db_override
     yield
     app.dependency_overrides.clear()
+
+@pytest.fixture(autouse=True)
+def clear_verdict_cache():
+    # Rolled-back test transactions let SQLite reuse user ids across tests
+    VerdictCache.clear()
+    OrderService.reset() # Books replayed from a rolled-back log would be stale
+    yield
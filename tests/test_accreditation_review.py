@@ -0,0 +1,68 @@
+import uuid
+from app import models
+from app.core import security
+from app.services.accreditation import AccreditationService
+from app.services.verdict_cache import VerdictCache
+
+def _create_user(db, status="PENDING_REVIEW"):
+    user = models.User(
+        email=f"review_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}",
+        hashed_password="x", accreditation_status=status,
+        accreditation_document_key=f"accreditation/{uuid.uuid4().hex}.pdf",
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+def _headers(user):
+    return {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+def test_review_queue_keyset_pagination(db):
+    pending = [_create_user(db) for _ in range(5)]
+    _create_user(db, status="VERIFIED_DOCS")
+    pending_ids = sorted(u.id for u in pending)
+
+    seen, after_id = [], None
+    while True:
+        rows, after_id = AccreditationService.review_queue(db, after_id=after_id, limit=2)
+        seen.extend(row.id for row in rows)
+        if after_id is None:
+            break
+    assert [i for i in seen if i in pending_ids] == pending_ids
+    assert all(db.get(models.User, i).accreditation_status == "PENDING_REVIEW" for i in seen)
+
+def test_bulk_verify_updates_pending_only_and_invalidates_cache(client, override_get_db, db):
+    admin = _create_user(db, status="NONE")
+    pending = [_create_user(db) for _ in range(3)]
+    verified = _create_user(db, status="VERIFIED_DOCS")
+    for user in pending:
+        assert VerdictCache.check(user, "506_C") is False
+
+    res = client.post("/api/v1/admin/accreditation/review", json={
+        "user_ids": [u.id for u in pending] + [verified.id], "decision": "verify",
+    }, headers=_headers(admin))
+    assert res.status_code == 200
+    assert res.json() == {"updated": sorted(u.id for u in pending), "skipped": [verified.id]}
+
+    for user in pending:
+        db.refresh(user)
+        assert user.accreditation_status == "VERIFIED_DOCS"
+        assert user.accreditation_verified_by == admin.id
+        assert user.accreditation_verified_at is not None
+        assert user.accreditation_expiry is not None
+        # Cached "not eligible" verdict was dropped by the bulk update
+        assert VerdictCache.check(user, "506_C") is True
+
+def test_bulk_reject(client, override_get_db, db):
+    admin = _create_user(db, status="NONE")
+    user = _create_user(db)
+
+    res = client.post("/api/v1/admin/accreditation/review", json={"user_ids": [user.id], "decision": "reject"}, headers=_headers(admin))
+    assert res.status_code == 200
+    assert res.json()["updated"] == [user.id]
+    db.refresh(user)
+    assert user.accreditation_status == "REJECTED"
+    assert user.accreditation_expiry is None
+
+    res = client.get("/api/v1/admin/accreditation/queue", headers=_headers(admin))
+    assert user.id not in [item["id"] for item in res.json()["items"]]
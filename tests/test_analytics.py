@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from app import models
+from app.core import security
+from app.services.analytics import AnalyticsService
+
+def _setup(db):
+    issuer_id = 700000 + uuid.uuid4().int % 100000
+    users = []
+    for _ in range(2):
+        user = models.User(email=f"stats_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x")
+        db.add(user)
+        users.append(user)
+    reg_cf = models.Campaign(name="Stats CF", issuer_id=issuer_id, target_amount_cents=10_000_00, regulation_type="REG_CF",
+                             deadline=datetime.now(timezone.utc) + timedelta(days=30))
+    reg_d = models.Campaign(name="Stats 506c", issuer_id=issuer_id, target_amount_cents=50_000_00, regulation_type="506_C",
+                            deadline=datetime.now(timezone.utc) + timedelta(days=30))
+    db.add_all([reg_cf, reg_d])
+    db.commit()
+    for user, amount, status in [(users[0], 100_00, "settled"), (users[0], 50_00, "pending_settlement"),
+                                 (users[1], 200_00, "settled"), (users[1], 75_00, "cancelled")]:
+        db.add(models.Ledger(user_id=user.id, campaign_id=reg_cf.id, amount_cents=amount, transaction_type="investment", status=status))
+    db.commit()
+    return issuer_id, users, reg_cf, reg_d
+
+def test_refresh_builds_summaries(db):
+    issuer_id, users, reg_cf, reg_d = _setup(db)
+    AnalyticsService.refresh_campaign_stats(db, full=True)
+
+    stats = AnalyticsService.campaign_stats(db, reg_cf.id)
+    assert stats["investor_count"] == 2
+    assert stats["investment_count"] == 3
+    assert stats["committed"] == 350
+    assert stats["settled"] == 300
+    assert stats["by_status"]["cancelled"] == {"count": 1, "amount": 75}
+    assert sum(day["amount"] for day in stats["daily_inflow"]) == 350
+
+    issuer = AnalyticsService.issuer_stats(db, issuer_id)
+    assert [c["campaign_id"] for c in issuer["campaigns"]] == [reg_cf.id, reg_d.id]
+    assert issuer["by_regulation"]["REG_CF"]["committed"] == 350
+    assert issuer["by_regulation"]["506_C"]["investment_count"] == 0
+
+def test_incremental_refresh_only_touches_changed_campaigns(db):
+    issuer_id, users, reg_cf, reg_d = _setup(db)
+    AnalyticsService.refresh_campaign_stats(db, full=True)
+
+    entry = db.query(models.Ledger).filter(models.Ledger.campaign_id == reg_cf.id, models.Ledger.status == "pending_settlement").one()
+    entry.status = "settled"
+    db.add(models.Ledger(user_id=users[0].id, campaign_id=reg_d.id, amount_cents=1000_00, transaction_type="investment", status="settled"))
+    db.commit()
+
+    assert AnalyticsService.refresh_campaign_stats(db) >= 2
+    assert AnalyticsService.campaign_stats(db, reg_cf.id)["settled"] == 350
+    assert AnalyticsService.campaign_stats(db, reg_d.id)["investor_count"] == 1
+
+def test_stats_endpoints(client, override_get_db, db):
+    issuer_id, users, reg_cf, reg_d = _setup(db)
+    AnalyticsService.refresh_campaign_stats(db, full=True)
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': users[0].email})}"}
+
+    res = client.get(f"/api/v1/campaigns/{reg_cf.id}/stats", headers=headers)
+    assert res.status_code == 200
+    assert res.json()["committed"] == 350
+
+    res = client.get(f"/api/v1/campaigns/issuer/{issuer_id}/stats", headers=headers)
+    assert res.status_code == 200
+    assert set(res.json()["by_regulation"]) == {"REG_CF", "506_C"}
+
+    assert client.get("/api/v1/campaigns/999999/stats", headers=headers).status_code == 404
@@ -1,5 +1,8 @@
 import pytest
 from datetime import datetime, timedelta
+from typing import List
+from pydantic import TypeAdapter
+from app import models, schemas
 
 def test_create_campaign(client, override_get_db):
     response = client.post(
@@ -33,3 +36,14 @@ def test_read_campaigns(client, override_get_db):
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 1
+
+def test_read_campaigns_fast_path_matches_schema(client, override_get_db, db):
+    client.post("/api/v1/campaigns/", json={
+        "name": "Fast Path", "target_amount": 1234.56, "deadline": (datetime.now() + timedelta(days=30)).isoformat(), "issuer_id": 1,
+    })
+    response = client.get("/api/v1/campaigns/?limit=1000")
+    assert response.headers["content-type"] == "application/json"
+
+    adapter = TypeAdapter(List[schemas.Campaign])
+    expected = adapter.dump_python(adapter.validate_python(db.query(models.Campaign).limit(1000).all(), from_attributes=True), mode="json")
+    assert response.json() == expected
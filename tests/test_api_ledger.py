@@ -1,5 +1,7 @@
 import pytest
 from datetime import datetime, timedelta
+from app import models
+from app.core import security
 
 def test_invest_compliance(client, override_get_db):
     # 1. Create User (Unverified)
@@ -63,45 +65,8 @@ def test_invest_compliance(client, override_get_db):
     assert res.status_code == 200
     assert res.json()["status"] == "pending_payment"
 
-def test_trade_lockup(client, override_get_db):
-    # Setup: User & Campaign
-    user_res = client.post("/api/v1/users/", json={"email": "trader@example.com", "stripe_id": "cus_trd", "password": "password123"})
-    user_id = user_res.json()["id"]
-
-    # Login
-    login_res = client.post(
-        "/api/v1/login/access-token",
-        data={"username": "trader@example.com", "password": "password123"}
-    )
-    token = login_res.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    camp_res = client.post("/api/v1/campaigns/", json={"name": "Trade Camp", "target_amount": 1000.0, "deadline": datetime.now().isoformat(), "issuer_id": 1})
-    campaign_id = camp_res.json()["id"]
-
-    # 1. Try Trade with recent original transaction (Should Fail)
-    recent_date = (datetime.now() - timedelta(days=10)).isoformat()
-    res = client.post(
-        f"/api/v1/ledger/trade?original_transaction_date={recent_date}",
-        json={
-            "campaign_id": campaign_id,
-            "amount": 100.0,
-            "transaction_type": "trade"
-        },
-        headers=headers
-    )
-    assert res.status_code == 403
-    assert "lockup" in res.json()["detail"]
-
-    # 2. Try Trade with old original transaction (Should Pass)
-    old_date = (datetime.now() - timedelta(days=400)).isoformat()
-    res = client.post(
-        f"/api/v1/ledger/trade?original_transaction_date={old_date}",
-        json={
-            "campaign_id": campaign_id,
-            "amount": 100.0,
-            "transaction_type": "trade"
-        },
-        headers=headers
-    )
-    # Note: It might fail if User/Campaign logic in /trade endpoint is stricter, but based on code it just checks lockup and creates ledger
-    assert res.status_code == 200
+def test_trade_endpoint_retired(client, override_get_db, db):
+    # Sales go through the order book (POST /orders/), which has a counterparty who pays
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': 'trader@example.com'})}"}
+    res = client.post("/api/v1/ledger/trade", json={"campaign_id": 1, "amount": 100.0, "transaction_type": "trade_sell"}, headers=headers)
+    assert res.status_code == 405
@@ -0,0 +1,35 @@
+import json
+import pytest
+from app import models
+from benchmarks import compliance_bench, order_book_bench, record, seed, serialization_bench
+
+def test_seed_generates_requested_scale(db):
+    manifest = seed.seed(db, users=20, campaigns=5, ledger_per_user=3)
+
+    assert len(manifest["users"]) == 20
+    assert len(manifest["campaign_ids"]) == 5
+    user_ids = [u["id"] for u in manifest["users"]]
+    assert db.query(models.Ledger).filter(models.Ledger.user_id.in_(user_ids)).count() == 60
+
+def test_compliance_microbench_recorded_and_compared(tmp_path):
+    results = compliance_bench.run(number=100, repeat=1)
+    assert results["check_investment_limit"]["calls_per_sec"] > 0
+
+    path = record.record_results("compliance", results, out_dir=tmp_path)
+    stored = json.loads(path.read_text())
+    assert stored["name"] == "compliance"
+    assert stored["commit"]
+
+    rows = record.compare(stored, stored)
+    assert rows and all(change == 0 for *_, change in rows)
+
+def test_serialization_bench_reports_both_paths():
+    results = serialization_bench.run(rows=200, page_size=50, repeat=1)
+    assert results["ledger_schema"]["rows_per_sec"] > 0
+    assert results["ledger_tuples_orjson"]["rows_per_sec"] > 0
+    assert "campaigns_speedup" in results
+
+def test_order_book_bench_matches_orders():
+    results = order_book_bench.run(orders=2000, repeat=1)
+    assert results["match_no_check"]["orders_per_sec"] > 0
+    assert results["match_no_check"]["fills"] == results["match_with_check"]["fills"] > 0
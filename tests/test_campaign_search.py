@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from app import models
+from app.core import security
+
+def _seed(db):
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.now(timezone.utc)
+    specs = [
+        ("Solar Farm", "REG_CF", 10, "active"),
+        ("solar roofs", "506_C", 20, "active"),
+        ("Wind Park", "REG_CF", 30, "active"),
+        ("Solar 50% Fund", "506_B", 40, "active"),
+        ("Old Solar", "REG_CF", -5, "active"),
+        ("Funded Solar", "REG_CF", 50, "funded"),
+    ]
+    campaigns = {}
+    for name, regulation_type, days, status in specs:
+        campaign = models.Campaign(name=f"{tag} {name}", issuer_id=1, target_amount_cents=1_000_00, regulation_type=regulation_type,
+                                   funding_status=status, deadline=now + timedelta(days=days))
+        db.add(campaign)
+        campaigns[name] = campaign
+    db.commit()
+    return tag, campaigns
+
+def _names(res):
+    return [item["name"].split(" ", 1)[1] for item in res.json()["items"]]
+
+def test_search_filters_and_keyset_pages(client, override_get_db, db):
+    tag, campaigns = _seed(db)
+
+    # Case-insensitive; past and funded campaigns are listed unless filtered out
+    res = client.get("/api/v1/campaigns/search", params={"q": tag})
+    assert res.status_code == 200
+    assert _names(res) == ["Old Solar", "Solar Farm", "solar roofs", "Wind Park", "Solar 50% Fund", "Funded Solar"]
+    assert _names(client.get("/api/v1/campaigns/search", params={"q": f"{tag} solar"})) == ["Solar Farm", "solar roofs", "Solar 50% Fund"]
+    assert res.json()["items"][0]["target_amount"] == 1000.0
+
+    res = client.get("/api/v1/campaigns/search", params={"q": tag, "regulation_type": ["506_B", "506_C"]})
+    assert _names(res) == ["solar roofs", "Solar 50% Fund"]
+    # LIKE wildcards in the query are literal
+    assert _names(client.get("/api/v1/campaigns/search", params={"q": f"{tag} Solar 50%"})) == ["Solar 50% Fund"]
+    assert _names(client.get("/api/v1/campaigns/search", params={"q": f"{tag} Solar 5_%"})) == []
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": tag, "funding_status": "active", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/campaigns/search", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    expected = ["Old Solar", "Solar Farm", "solar roofs", "Wind Park", "Solar 50% Fund"]
+    assert seen == [campaigns[name].id for name in expected]
+
+    assert client.get("/api/v1/campaigns/search", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_search_investable_by_caller(client, override_get_db, db):
+    tag, campaigns = _seed(db)
+    assert client.get("/api/v1/campaigns/search", params={"q": tag, "investable": True}).status_code == 401
+
+    user = models.User(email=f"search_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x",
+                       kyc_status="verified", annual_income=100000, net_worth=100000)
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+    # KYC verified, not accredited: open Reg CF campaigns only
+    res = client.get("/api/v1/campaigns/search", params={"q": tag, "investable": True}, headers=headers)
+    assert _names(res) == ["Solar Farm", "Wind Park"]
+
+    # No Reg CF capacity left in the 12-month window
+    user.reg_cf_invested_12mo_cents = user.reg_cf_annual_limit_cents
+    user.reg_cf_window_resets_at = datetime.now(timezone.utc) + timedelta(days=100)
+    db.commit()
+    res = client.get("/api/v1/campaigns/search", params={"q": tag, "investable": True}, headers=headers)
+    assert _names(res) == []
@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from app import models
+from app.core import security
+
+def _investor(db):
+    # Reg CF limit: greater of $2,500 and 5% of $100k = $5,000
+    user = models.User(email=f"basket_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x",
+                       kyc_status="verified", annual_income=100000, net_worth=100000)
+    db.add(user)
+    db.commit()
+    return user, {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+def _campaigns(db, count):
+    campaigns = [
+        models.Campaign(name=f"Basket {i}", issuer_id=1, target_amount_cents=100_000_00, regulation_type="REG_CF",
+                        deadline=datetime.now(timezone.utc) + timedelta(days=30))
+        for i in range(count)
+    ]
+    db.add_all(campaigns)
+    db.commit()
+    return campaigns
+
+def test_checkout_reserves_basket_with_one_payment_intent(client, override_get_db, db):
+    user, headers = _investor(db)
+    first, second = _campaigns(db, 2)
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as mock_stripe, \
+         patch("app.api.v1.endpoints.ledger.EmailService.send_email") as mock_email:
+        mock_stripe.return_value = MagicMock(id="pi_basket", client_secret="secret_basket")
+        res = client.post("/api/v1/ledger/checkout", json={"items": [
+            {"campaign_id": first.id, "amount": 3000.0}, {"campaign_id": second.id, "amount": 1500.5},
+        ]}, headers=headers)
+
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["amount"] == 4500.5
+    assert body["client_secret"] == "secret_basket"
+    assert [(i["campaign_id"], i["amount"], i["status"]) for i in body["investments"]] == [
+        (first.id, 3000.0, "pending_payment"), (second.id, 1500.5, "pending_payment"),
+    ]
+    mock_stripe.assert_called_once()
+    kwargs = mock_stripe.call_args.kwargs
+    assert kwargs["amount_cents"] == 4500_50
+    assert kwargs["transfer_group"] == body["transfer_group"]
+    assert kwargs["metadata"][f"campaign_{first.id}"] == 3000_00
+    assert kwargs["metadata"][f"campaign_{second.id}"] == 1500_50
+    mock_email.assert_called_once()
+
+    entries = db.query(models.Ledger).filter(models.Ledger.stripe_payment_intent_id == "pi_basket").all()
+    assert len(entries) == 2
+    fees = db.query(models.BillingLog).filter(models.BillingLog.user_id == user.id).count()
+    assert fees == 2
+
+    # One payment settles every investment of the basket
+    event = {"type": "payment_intent.succeeded", "data": {"object": {"id": "pi_basket"}}}
+    with patch("app.api.v1.endpoints.webhooks.StripeService.construct_event", return_value=event):
+        assert client.post("/api/v1/webhooks/stripe", content=b"{}", headers={"Stripe-Signature": "t"}).status_code == 200
+    db.expire_all()
+    assert {entry.status for entry in entries} == {"settled"}
+    assert db.get(models.Position, (user.id, first.id)).quantity_cents == 3000_00
+
+def test_checkout_counts_whole_basket_against_reg_cf_limit(client, override_get_db, db):
+    user, headers = _investor(db)
+    first, second = _campaigns(db, 2)
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as mock_stripe:
+        # Each fits under the $5,000 limit on its own, together they do not
+        res = client.post("/api/v1/ledger/checkout", json={"items": [
+            {"campaign_id": first.id, "amount": 3000.0}, {"campaign_id": second.id, "amount": 3000.0},
+        ]}, headers=headers)
+    assert res.status_code == 403
+    assert res.json()["detail"].startswith(f"Campaign {first.id}: Investment exceeds")
+    mock_stripe.assert_not_called()
+    assert db.query(models.Ledger).filter(models.Ledger.user_id == user.id).count() == 0
+    assert db.query(models.BillingLog).filter(models.BillingLog.user_id == user.id).count() == 0
+
+def test_checkout_rejects_bad_baskets(client, override_get_db, db):
+    _, headers = _investor(db)
+    (campaign,) = _campaigns(db, 1)
+    res = client.post("/api/v1/ledger/checkout", json={"items": [
+        {"campaign_id": campaign.id, "amount": 10.0}, {"campaign_id": campaign.id, "amount": 20.0},
+    ]}, headers=headers)
+    assert res.status_code == 422
+    res = client.post("/api/v1/ledger/checkout", json={"items": [
+        {"campaign_id": campaign.id, "amount": 10.0}, {"campaign_id": 987654321, "amount": 20.0},
+    ]}, headers=headers)
+    assert res.status_code == 404
+    assert "987654321" in res.json()["detail"]
+
+def test_cancel_refunds_one_basket_investment_once(client, override_get_db, db):
+    user, headers = _investor(db)
+    first, second = _campaigns(db, 2)
+    entries = [
+        models.Ledger(user_id=user.id, campaign_id=campaign.id, amount_cents=amount_cents, transaction_type="investment",
+                      status="pending_settlement", stripe_payment_intent_id="pi_basket")
+        for campaign, amount_cents in ((first, 1000_00), (second, 1500_00))
+    ]
+    unpaid = models.Ledger(user_id=user.id, campaign_id=second.id, amount_cents=500_00, transaction_type="investment",
+                           status="pending_payment", stripe_payment_intent_id="pi_unpaid")
+    db.add_all(entries + [unpaid])
+    db.commit()
+
+    with patch("app.services.stripe_service.StripeService.refund_payment") as refund, \
+         patch("app.api.v1.endpoints.ledger.EmailService.send_email"):
+        res = client.post(f"/api/v1/ledger/investments/{entries[0].id}/cancel", headers=headers)
+        assert res.status_code == 200
+        res = client.post(f"/api/v1/ledger/investments/{entries[0].id}/cancel", headers=headers)
+        assert res.status_code == 409
+        # Nothing was charged yet, so nothing is refunded
+        assert client.post(f"/api/v1/ledger/investments/{unpaid.id}/cancel", headers=headers).status_code == 200
+
+    refund.assert_called_once_with("pi_basket", amount_cents=1000_00, idempotency_key=f"refund_{entries[0].id}")
+    db.expire_all()
+    assert [entry.status for entry in entries] == ["cancelled", "pending_settlement"]
@@ -45,11 +45,61 @@ def test_lockup_period():
     assert ComplianceService.check_lockup_period(recent_date) is False
 
 def test_escrow_threshold():
-    campaign = create_mock_campaign(target_amount=10000.0)
+    from app import models
+    campaign = models.Campaign(target_amount=10000.0)
     
-    # Fully funded
-    assert ComplianceService.check_escrow_threshold(campaign, 10000.0) is True
-    assert ComplianceService.check_escrow_threshold(campaign, 15000.0) is True
+    # Fully funded (pledged amounts in cents)
+    assert ComplianceService.check_escrow_threshold(campaign, 10000_00) is True
+    assert ComplianceService.check_escrow_threshold(campaign, 15000_00) is True
     
     # Underfunded
-    assert ComplianceService.check_escrow_threshold(campaign, 5000.0) is False
+    assert ComplianceService.check_escrow_threshold(campaign, 9999_99) is False
+
+def test_compliance_context_single_round_trip(db):
+    from app import models
+    from app.db import profiler
+    from app.services.compliance_context import load_compliance_context
+
+    user = models.User(email="ctx@example.com", stripe_id="cus_ctx", hashed_password="x", kyc_status="verified")
+    campaign = models.Campaign(name="Ctx Campaign", target_amount=10000.0, deadline=datetime.now() + timedelta(days=30), issuer_id=1)
+    db.add_all([user, campaign])
+    db.commit()
+    db.add_all([
+        models.Ledger(user_id=user.id, campaign_id=campaign.id, amount=400.0, transaction_type="investment", status="settled"),
+        models.Ledger(user_id=user.id, campaign_id=campaign.id, amount=100.0, transaction_type="investment", status="pending_payment"),
+        models.Ledger(user_id=user.id, campaign_id=campaign.id, amount=900.0, transaction_type="investment", status="cancelled"),
+    ])
+    db.commit()
+    campaign_id = campaign.id
+
+    with profiler.capture() as profile:
+        context = load_compliance_context(db, "ctx@example.com", campaign_id)
+    assert profile.query_count == 1
+    assert context.user.email == "ctx@example.com"
+    assert context.campaign.id == campaign_id
+    assert context.past_12mo_investments_cents == 500_00
+
+    missing_campaign = load_compliance_context(db, "ctx@example.com", 99999)
+    assert missing_campaign.campaign is None
+    assert load_compliance_context(db, "nobody@example.com", campaign_id) is None
+
+def test_annual_investment_limit_tiers():
+    # Either below $124k: greater of $2,500 or 5% of the greater of income/net worth
+    assert ComplianceService.annual_investment_limit(30000, 40000) == 2500_00
+    assert ComplianceService.annual_investment_limit(80000, 200000) == 10000_00
+    assert ComplianceService.annual_investment_limit(None, None) == 2500_00
+    # Both at or above $124k: 10% of the greater, capped at $124k
+    assert ComplianceService.annual_investment_limit(150000, 300000) == 30000_00
+    assert ComplianceService.annual_investment_limit(2000000, 5000000) == 124000_00
+
+def test_money_to_cents():
+    import pytest
+    from decimal import Decimal
+    from app.core.money import from_cents, to_cents
+    assert to_cents(0.1) == 10
+    assert to_cents(19.99) == 1999
+    assert to_cents("1000") == 100000
+    assert from_cents(1999) == Decimal("19.99")
+    with pytest.raises(ValueError):
+        to_cents(10.005)
+    assert to_cents(10.005, strict=False) == 1000
@@ -0,0 +1,58 @@
+import uuid
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from sqlalchemy import func
+from app import models
+from app.core import security
+from app.db.session import SessionLocal
+
+@pytest.fixture
+def committed_investor(db_engine):
+    """
+    Real committed rows (not the rolled-back test transaction), so concurrent
+    requests on separate sessions can see them.
+    """
+    session = SessionLocal()
+    email = f"race_{uuid.uuid4()}@example.com"
+    user = models.User(
+        email=email, stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x",
+        kyc_status="verified", annual_income=50000, net_worth=50000,  # $2,500 limit
+    )
+    campaign = models.Campaign(name=f"Race {uuid.uuid4()}", target_amount=100000, deadline=datetime.now() + timedelta(days=30), issuer_id=1, regulation_type="REG_CF")
+    session.add_all([user, campaign])
+    session.commit()
+    ids = (user.id, campaign.id)
+    yield email, ids[0], ids[1], session
+
+    session.query(models.Ledger).filter(models.Ledger.user_id == ids[0]).delete()
+    session.query(models.BillingLog).filter(models.BillingLog.user_id == ids[0]).delete()
+    session.query(models.Campaign).filter(models.Campaign.id == ids[1]).delete()
+    session.query(models.User).filter(models.User.id == ids[0]).delete()
+    session.commit()
+    session.close()
+
+def test_concurrent_invest_never_exceeds_reg_cf_limit(client, committed_investor):
+    email, user_id, campaign_id, session = committed_investor
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': email})}"}
+
+    def invest(_):
+        return client.post(
+            "/api/v1/ledger/invest",
+            json={"campaign_id": campaign_id, "amount": 1000.0, "transaction_type": "investment"},
+            headers=headers,
+        ).status_code
+
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as mock_stripe:
+        mock_stripe.side_effect = lambda **kwargs: MagicMock(id=f"pi_{uuid.uuid4().hex}", client_secret="secret")
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            statuses = list(pool.map(invest, range(10)))
+
+    committed = session.query(func.sum(models.Ledger.amount_cents)).filter(
+        models.Ledger.user_id == user_id,
+        models.Ledger.status.in_(["pending_settlement", "settled", "pending_payment"]),
+    ).scalar()
+    assert committed <= 2500_00
+    assert statuses.count(200) == 2
+    assert statuses.count(403) == 8
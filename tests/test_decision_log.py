@@ -0,0 +1,115 @@
+import uuid
+import pytest
+from unittest.mock import patch
+from sqlalchemy import update
+from app import models
+from app.core.config import settings
+from app.services import decision_log as decision_log_module
+from app.services.decision_log import DecisionLog, DecisionLogUnavailable, verify_chain
+
+def _record(log, approved=True, **kwargs):
+    return log.record(user_id=1, campaign_id=2, regulation_type="REG_CF", approved=approved,
+                      inputs={"amount_cents": 10000, "kyc_status": "verified"}, **kwargs)
+
+def test_records_flush_in_one_batch_and_chain_verifies(db):
+    log = DecisionLog(session_factory=lambda: db)
+    rows = [_record(log) for _ in range(3)] + [_record(log, approved=False, reason="User is not KYC verified")]
+    assert [row["seq"] for row in rows] == [1, 2, 3, 4]
+    assert rows[1]["prev_hash"] == rows[0]["hash"]
+    assert db.query(models.ComplianceDecision).filter_by(chain_id=log.chain_id).count() == 0 # Buffered
+
+    with patch.object(db, "execute", wraps=db.execute) as execute:
+        assert log.flush() == 4
+    assert execute.call_count == 1 # One multi-row INSERT
+    assert verify_chain(db, log.chain_id) == {"chain_id": log.chain_id, "records": 4, "valid": True, "first_invalid_seq": None}
+
+def test_tampering_is_detected(db):
+    log = DecisionLog(session_factory=lambda: db)
+    for _ in range(3):
+        _record(log, approved=False, reason="limit")
+    log.flush()
+
+    db.execute(update(models.ComplianceDecision).where(
+        models.ComplianceDecision.chain_id == log.chain_id, models.ComplianceDecision.seq == 2
+    ).values(approved=True))
+    result = verify_chain(db, log.chain_id)
+    assert result["valid"] is False
+    assert result["first_invalid_seq"] == 2
+
+def test_failed_flush_keeps_records_in_order(db):
+    calls = []
+    def failing_factory():
+        calls.append(1)
+        raise RuntimeError("database unavailable")
+    log = DecisionLog(session_factory=failing_factory)
+    _record(log)
+    _record(log)
+    assert log.flush() == 0
+    assert log.pending() == 2
+
+    log._session_factory = lambda: db
+    _record(log)
+    assert log.flush() == 3
+    assert verify_chain(db, log.chain_id)["valid"] is True
+
+def test_full_buffer_flushes_in_caller(db, monkeypatch):
+    monkeypatch.setattr(settings, "DECISION_LOG_MAX_BUFFER", 2)
+    log = DecisionLog(session_factory=lambda: db)
+    _record(log)
+    assert log.pending() == 1
+    _record(log)
+    assert log.pending() == 0
+
+def test_full_buffer_refuses_decisions_while_writes_fail(db, monkeypatch):
+    monkeypatch.setattr(settings, "DECISION_LOG_MAX_BUFFER", 2)
+    calls = []
+    def failing_factory():
+        calls.append(1)
+        raise RuntimeError("database unavailable")
+    log = DecisionLog(session_factory=failing_factory)
+    _record(log)
+    _record(log) # Fills the buffer; the flush in the caller fails
+    assert (log.pending(), len(calls)) == (2, 1)
+    for _ in range(3):
+        with pytest.raises(DecisionLogUnavailable):
+            _record(log)
+    assert (log.pending(), len(calls)) == (2, 1) # Bounded, and not retried within the flush interval
+
+    log._session_factory = lambda: db
+    log._failed_at = None
+    _record(log)
+    assert verify_chain(db, log.chain_id) == {"chain_id": log.chain_id, "records": 2, "valid": True, "first_invalid_seq": None}
+    assert log.pending() == 1
+
+def test_stop_flushes_remaining(db, monkeypatch):
+    monkeypatch.setattr(settings, "DECISION_LOG_FLUSH_SECONDS", 60)
+    log = DecisionLog(session_factory=lambda: db)
+    log.start()
+    _record(log)
+    log.stop()
+    assert log.pending() == 0
+    assert verify_chain(db, log.chain_id)["records"] == 1
+
+def test_invest_records_decision(client, override_get_db, db):
+    email = f"decision_{uuid.uuid4()}@example.com"
+    client.post("/api/v1/users/", json={"email": email, "stripe_id": f"cus_{uuid.uuid4()}", "password": "password123"})
+    token = client.post("/api/v1/login/access-token", data={"username": email, "password": "password123"}).json()["access_token"]
+    campaign_id = client.post("/api/v1/campaigns/", json={
+        "name": "Decision CF", "target_amount": 10000, "deadline": "2030-01-01T00:00:00", "issuer_id": 1, "regulation_type": "REG_CF",
+    }).json()["id"]
+
+    with patch.object(decision_log_module.decision_log, "record", wraps=decision_log_module.decision_log.record) as record:
+        res = client.post("/api/v1/ledger/invest", json={
+            "user_id": 0, "campaign_id": campaign_id, "amount": 100.0, "transaction_type": "investment",
+        }, headers={"Authorization": f"Bearer {token}"})
+    assert res.status_code == 403 # Not KYC verified
+    kwargs = record.call_args.kwargs
+    assert kwargs["approved"] is False
+    assert kwargs["reason"] == "User is not KYC verified"
+    assert kwargs["inputs"]["kyc_status"] == "unverified"
+
+    with patch.object(decision_log_module.decision_log, "record", side_effect=DecisionLogUnavailable("Compliance decision log is unavailable")):
+        res = client.post("/api/v1/ledger/invest", json={
+            "user_id": 0, "campaign_id": campaign_id, "amount": 100.0, "transaction_type": "investment",
+        }, headers={"Authorization": f"Bearer {token}"})
+    assert res.status_code == 503
@@ -0,0 +1,98 @@
+import io
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from app import models
+from app.core import security
+from app.core.config import settings
+from app.services import storage
+from app.services.exports import ExportService, partition_dir
+from app.services.storage import FilesystemStorage
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+@pytest.fixture
+def storage_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "_storage", FilesystemStorage(str(tmp_path)))
+    return tmp_path
+
+def _seed(db):
+    user = models.User(email=f"export_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x")
+    campaign = models.Campaign(name="Export", issuer_id=1, target_amount_cents=100_000, regulation_type="REG_CF",
+                               deadline=datetime.now(timezone.utc) + timedelta(days=30))
+    db.add_all([user, campaign])
+    db.commit()
+    october = datetime(2026, 10, 5, tzinfo=timezone.utc)
+    for created_at in (october, october + timedelta(days=1), october - timedelta(days=10)):
+        db.add(models.Ledger(user_id=user.id, campaign_id=campaign.id, amount_cents=12_345, transaction_type="investment",
+                             status="settled", created_at=created_at))
+    db.add(models.BillingLog(user_id=user.id, transaction_id="val_x", fee_amount_cents=200, description="Validation Check", created_at=october))
+    db.commit()
+    return user, campaign
+
+def test_partition_dir():
+    row = {"campaign_id": 7, "created_at": datetime(2026, 3, 31, 23, 30, tzinfo=timezone.utc)}
+    assert partition_dir("ledger", row, ("campaign_id", "month")) == "ledger/campaign_id=7/month=2026-03"
+    assert partition_dir("ledger", {"campaign_id": None, "created_at": None}, ("campaign_id",)) == "ledger/campaign_id=__HIVE_DEFAULT_PARTITION__"
+
+def test_export_writes_partitioned_parquet_in_row_groups(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_ROW_GROUP_SIZE", 1)
+    monkeypatch.setattr(settings, "EXPORT_FETCH_SIZE", 2)
+    user, campaign = _seed(db)
+    job = models.ExportJob(tables="ledger", campaign_id=campaign.id)
+    db.add(job)
+    db.commit()
+
+    counts = ExportService.write_export(db, job, str(tmp_path))
+    assert counts == {"ledger": 3}
+
+    october = pq.ParquetFile(tmp_path / f"ledger/campaign_id={campaign.id}/month=2026-10/part-0.parquet")
+    assert october.metadata.num_rows == 2
+    assert october.metadata.num_row_groups == 2
+    table = october.read()
+    assert table.column("amount_cents").to_pylist() == [12_345, 12_345]
+    assert str(table.schema.field("created_at").type) == "timestamp[us, tz=UTC]"
+    assert (tmp_path / f"ledger/campaign_id={campaign.id}/month=2026-09/part-0.parquet").exists()
+
+def test_export_job_end_to_end(client, override_get_db, db, storage_root, monkeypatch):
+    user, campaign = _seed(db)
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+    monkeypatch.setattr(settings, "EXPORT_ALLOWED_EMAILS", [user.email])
+
+    with patch("app.worker.run_export_job.delay") as delay:
+        res = client.post("/api/v1/admin/exports", json={
+            "tables": ["ledger", "billing_log"], "campaign_id": campaign.id,
+            "period_start": "2026-10-01T00:00:00Z", "period_end": "2026-11-01T00:00:00Z",
+        }, headers=headers)
+    assert res.status_code == 202
+    job_id = res.json()["id"]
+    delay.assert_called_once_with(job_id)
+    assert client.get(f"/api/v1/admin/exports/{job_id}/download", headers=headers).status_code == 409
+
+    job = ExportService.run(db, job_id)
+    assert job.status == "completed", job.error
+    assert job.row_count == 3 # Two October ledger rows plus the billing row
+
+    res = client.get(f"/api/v1/admin/exports/{job_id}/download", headers=headers)
+    assert res.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(res.content))
+    names = archive.namelist()
+    assert "manifest.json" in names
+    assert f"ledger/campaign_id={campaign.id}/month=2026-10/part-0.parquet" in names
+    assert "billing_log/month=2026-10/part-0.parquet" in names
+
+def test_exports_need_an_explicit_grant(client, override_get_db, db, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_ALLOWED_EMAILS", ["auditor@example.com"])
+    user, _ = _seed(db)
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+    job = models.ExportJob(tables="ledger", status="completed")
+    db.add(job)
+    db.commit()
+
+    with patch("app.worker.run_export_job.delay") as delay:
+        assert client.post("/api/v1/admin/exports", json={"tables": ["ledger"]}, headers=headers).status_code == 403
+    delay.assert_not_called()
+    assert client.get(f"/api/v1/admin/exports/{job.id}", headers=headers).status_code == 403
+    assert client.get(f"/api/v1/admin/exports/{job.id}/download", headers=headers).status_code == 403
@@ -0,0 +1,94 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from app import models
+from app.core import security
+from app.services.idempotency import request_fingerprint
+
+@pytest.fixture
+def investor_headers(db):
+    email = f"idem_{uuid.uuid4()}@example.com"
+    user = models.User(email=email, stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x",
+                       kyc_status="verified", annual_income=100000, net_worth=100000)
+    campaign = models.Campaign(name="Idempotent Deal", target_amount=100000, deadline=datetime.now() + timedelta(days=30), issuer_id=1)
+    db.add_all([user, campaign])
+    db.commit()
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': email})}"}
+    return headers, user.id, campaign.id
+
+def test_invest_retry_replays_response(client, override_get_db, db, investor_headers):
+    headers, user_id, campaign_id = investor_headers
+    headers = {**headers, "Idempotency-Key": "retry-1"}
+    body = {"campaign_id": campaign_id, "amount": 500.0, "transaction_type": "investment"}
+
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as mock_stripe:
+        mock_stripe.return_value = MagicMock(id="pi_idem", client_secret="secret_idem")
+        first = client.post("/api/v1/ledger/invest", json=body, headers=headers)
+        second = client.post("/api/v1/ledger/invest", json=body, headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+    # Compliance, fee, PaymentIntent and ledger row happened once
+    assert mock_stripe.call_count == 1
+    assert db.query(models.Ledger).filter(models.Ledger.user_id == user_id).count() == 1
+    assert db.query(models.BillingLog).filter(models.BillingLog.user_id == user_id).count() == 1
+
+def test_idempotency_key_reuse_and_in_progress(client, override_get_db, db, investor_headers):
+    headers, user_id, campaign_id = investor_headers
+    email = db.get(models.User, user_id).email
+    body = {"campaign_id": campaign_id, "amount": 10.0, "transaction_type": "investment", "status": "pending_settlement"}
+
+    # A claim still running blocks a concurrent duplicate
+    db.add(models.IdempotencyKey(
+        owner=email, key="busy", scope="POST /ledger/invest", request_hash=request_fingerprint("POST /ledger/invest", body),
+        status="in_progress", created_at=datetime.utcnow(), expires_at=datetime.utcnow() + timedelta(hours=1),
+    ))
+    db.commit()
+    res = client.post("/api/v1/ledger/invest", json={"campaign_id": campaign_id, "amount": 10.0, "transaction_type": "investment"},
+                      headers={**headers, "Idempotency-Key": "busy"})
+    assert res.status_code == 409
+
+    # Same key, different payload
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as mock_stripe:
+        mock_stripe.return_value = MagicMock(id="pi_idem2", client_secret="secret")
+        ok = client.post("/api/v1/ledger/invest", json={"campaign_id": campaign_id, "amount": 10.0, "transaction_type": "investment"},
+                         headers={**headers, "Idempotency-Key": "k2"})
+        reused = client.post("/api/v1/ledger/invest", json={"campaign_id": campaign_id, "amount": 20.0, "transaction_type": "investment"},
+                             headers={**headers, "Idempotency-Key": "k2"})
+    assert ok.status_code == 200
+    assert reused.status_code == 422
+
+def test_failure_after_fee_replayed_not_rebilled(client, override_get_db, db, investor_headers):
+    headers, user_id, campaign_id = investor_headers
+    headers = {**headers, "Idempotency-Key": "stripe-down"}
+    body = {"campaign_id": campaign_id, "amount": 50.0, "transaction_type": "investment"}
+
+    with patch("app.services.stripe_service.StripeService.create_payment_intent", side_effect=Exception("card_declined")) as mock_stripe:
+        first = client.post("/api/v1/ledger/invest", json=body, headers=headers)
+        second = client.post("/api/v1/ledger/invest", json=body, headers=headers)
+
+    assert first.status_code == second.status_code == 400
+    assert second.json() == first.json() == {"detail": "card_declined"}
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert mock_stripe.call_count == 1
+    assert db.query(models.BillingLog).filter(models.BillingLog.user_id == user_id).count() == 1
+    assert db.query(models.Ledger).filter(models.Ledger.user_id == user_id).count() == 1
+
+def test_failure_before_commit_releases_key(client, override_get_db, db, investor_headers):
+    headers, user_id, campaign_id = investor_headers
+    db.get(models.User, user_id).kyc_status = "pending"
+    db.commit()
+    headers = {**headers, "Idempotency-Key": "not-yet-kyc"}
+    body = {"campaign_id": campaign_id, "amount": 50.0, "transaction_type": "investment"}
+
+    assert client.post("/api/v1/ledger/invest", json=body, headers=headers).status_code == 403
+    assert db.query(models.IdempotencyKey).filter(models.IdempotencyKey.key == "not-yet-kyc").count() == 0
+
+    db.get(models.User, user_id).kyc_status = "verified"
+    db.commit()
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as mock_stripe:
+        mock_stripe.return_value = MagicMock(id="pi_after_kyc", client_secret="secret")
+        assert client.post("/api/v1/ledger/invest", json=body, headers=headers).status_code == 200
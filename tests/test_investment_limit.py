@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from app import models
+from app.core import security
+from app.services.investment_limit import InvestmentLimitService
+
+def _create_investor(db, **kwargs):
+    user = models.User(email=f"limit_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x", **kwargs)
+    campaign = models.Campaign(name=f"Limit {uuid.uuid4()}", target_amount=100000, deadline=datetime.now() + timedelta(days=30), issuer_id=1)
+    db.add_all([user, campaign])
+    db.commit()
+    return user, campaign
+
+def test_annual_limit_recomputed_when_inputs_change(db):
+    user, _ = _create_investor(db, annual_income=50000, net_worth=50000)
+    assert user.reg_cf_annual_limit_cents == 2500_00
+
+    user.annual_income = 200000
+    user.net_worth = 150000
+    db.commit()
+    assert user.reg_cf_annual_limit_cents == 20000_00
+
+    user.is_accredited = True
+    db.commit()
+    assert user.reg_cf_annual_limit_cents is None
+    assert InvestmentLimitService.remaining_capacity(user) is None
+
+def test_exposure_follows_ledger_status(db):
+    user, campaign = _create_investor(db, annual_income=50000, net_worth=50000)
+    entry = models.Ledger(user_id=user.id, campaign_id=campaign.id, amount=1000.0, transaction_type="investment", status="pending_payment")
+    db.add(entry)
+    db.add(models.Ledger(user_id=user.id, campaign_id=campaign.id, amount=50.0, transaction_type="payout", status="settled"))
+    db.commit()
+    assert user.reg_cf_invested_12mo_cents == 1000_00
+    assert InvestmentLimitService.remaining_capacity(user) == 1500_00
+
+    entry.status = "settled" # Still counted
+    db.commit()
+    assert user.reg_cf_invested_12mo_cents == 1000_00
+
+    entry.status = "cancelled"
+    db.commit()
+    assert user.reg_cf_invested_12mo_cents == 0
+
+def test_stale_window_recomputed_from_ledger(db):
+    user, campaign = _create_investor(db, annual_income=50000, net_worth=50000)
+    db.add(models.Ledger(user_id=user.id, campaign_id=campaign.id, amount=700.0, transaction_type="investment", status="settled"))
+    db.commit()
+    # An investment aged out of the window: the stored total is no longer current
+    user.reg_cf_window_resets_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    user.reg_cf_invested_12mo_cents = 9999_00
+    db.commit()
+
+    assert InvestmentLimitService.ensure_current(db, user) == 700_00
+    assert InvestmentLimitService.exposure_is_current(user)
+
+def test_investment_limit_endpoint(client, override_get_db, db):
+    user, campaign = _create_investor(db, annual_income=100000, net_worth=100000)
+    db.add(models.Ledger(user_id=user.id, campaign_id=campaign.id, amount=1200.0, transaction_type="investment", status="settled"))
+    db.commit()
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+    res = client.get("/api/v1/users/me/investment-limit", headers=headers)
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["annual_limit"] == 5000
+    assert body["invested_12mo"] == 1200
+    assert body["remaining"] == 3800
+    assert body["window_resets_at"] is not None
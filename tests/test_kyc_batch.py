@@ -0,0 +1,74 @@
+import hashlib
+import hmac
+import json
+import uuid
+from unittest.mock import patch
+from app import models
+from app.core import security
+from app.core.config import settings
+from app.services.kyc import KycService
+from app.services.verdict_cache import VerdictCache
+
+def _create_user(db, kyc_status="pending"):
+    user = models.User(email=f"kyc_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x", kyc_status=kyc_status)
+    db.add(user)
+    db.commit()
+    return user
+
+def test_apply_updates_grouped_and_idempotent(db):
+    users = [_create_user(db) for _ in range(4)]
+    already = _create_user(db, kyc_status="verified")
+    for user in users:
+        assert VerdictCache.check(user, "REG_CF") is False
+
+    updates = [(u.id, "verified") for u in users[:3]] + [(users[3].id, "rejected"), (already.id, "verified"), (999999, "verified")]
+    with patch("app.worker.notify_kyc_status_changes.delay") as delay:
+        result = KycService.apply_updates(db, updates)
+
+    assert result == {"updated": 4, "unchanged": 1, "not_found": [999999]}
+    delay.assert_called_once()
+    assert sorted(map(tuple, delay.call_args[0][0])) == sorted([(u.id, "verified") for u in users[:3]] + [(users[3].id, "rejected")])
+    for user in users[:3]:
+        db.refresh(user)
+        assert user.kyc_status == "verified"
+        assert VerdictCache.check(user, "REG_CF") is True
+
+    # Redelivery changes nothing and notifies nobody
+    with patch("app.worker.notify_kyc_status_changes.delay") as delay:
+        assert KycService.apply_updates(db, updates)["updated"] == 0
+    delay.assert_not_called()
+
+def test_notifications_enqueued_in_batches(monkeypatch):
+    monkeypatch.setattr(settings, "KYC_NOTIFY_BATCH_SIZE", 2)
+    with patch("app.worker.notify_kyc_status_changes.delay") as delay:
+        KycService.enqueue_notifications([(1, "verified"), (2, "verified"), (3, "rejected")])
+    assert [call[0][0] for call in delay.call_args_list] == [[[1, "verified"], [2, "verified"]], [[3, "rejected"]]]
+
+def test_batch_endpoint(client, override_get_db, db):
+    caller = _create_user(db)
+    user = _create_user(db)
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': caller.email})}"}
+    with patch("app.worker.notify_kyc_status_changes.delay"):
+        res = client.post("/api/v1/users/kyc/batch", json={"updates": [{"user_id": user.id, "kyc_status": "verified"}]}, headers=headers)
+    assert res.status_code == 200
+    assert res.json()["updated"] == 1
+
+    res = client.post("/api/v1/users/kyc/batch", json={"updates": [{"user_id": user.id, "kyc_status": "bogus"}]}, headers=headers)
+    assert res.status_code == 422
+
+def test_provider_webhook_requires_valid_signature(client, override_get_db, db, monkeypatch):
+    monkeypatch.setattr(settings, "KYC_WEBHOOK_SECRET", "whsec_kyc")
+    user = _create_user(db)
+    body = json.dumps({"results": [{"reference_id": str(user.id), "status": "approved"}, {"reference_id": "x", "status": "approved"}]}).encode()
+
+    res = client.post("/api/v1/webhooks/kyc", content=body, headers={"X-KYC-Signature": "sha256=bad"})
+    assert res.status_code == 400
+
+    signature = hmac.new(b"whsec_kyc", body, hashlib.sha256).hexdigest()
+    with patch("app.worker.notify_kyc_status_changes.delay"):
+        res = client.post("/api/v1/webhooks/kyc", content=body, headers={"X-KYC-Signature": f"sha256={signature}"})
+    assert res.status_code == 200
+    assert res.json()["updated"] == 1
+    assert res.json()["ignored"] == 1
+    db.refresh(user)
+    assert user.kyc_status == "verified"
@@ -0,0 +1,40 @@
+import pytest
+from datetime import datetime, timedelta
+from app.core import metrics
+
+def test_metrics_endpoint_reports_route_latency_and_db_usage(client, override_get_db):
+    client.post(
+        "/api/v1/campaigns/",
+        json={
+            "name": "Metrics Campaign",
+            "target_amount": 1000.0,
+            "deadline": (datetime.now() + timedelta(days=30)).isoformat(),
+            "issuer_id": 1
+        },
+    )
+    client.get("/api/v1/campaigns/")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    body = res.text
+    # Labelled by route template, not raw path
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/campaigns/",status="200"}' in body
+    assert 'db_queries_per_request_count{method="GET",route="/api/v1/campaigns/"}' in body
+    assert 'db_time_per_request_seconds_sum{method="POST",route="/api/v1/campaigns/"}' in body
+
+def test_db_queries_counted_per_request(client, override_get_db):
+    before = metrics.DB_QUERIES_PER_REQUEST.labels("GET", "/api/v1/campaigns/{campaign_id}")._sum.get()
+    client.get("/api/v1/campaigns/99999")
+    after = metrics.DB_QUERIES_PER_REQUEST.labels("GET", "/api/v1/campaigns/{campaign_id}")._sum.get()
+    assert after - before >= 1
+
+def test_track_external_call_records_outcome():
+    with metrics.track_external_call("stripe", "test_op"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.track_external_call("stripe", "test_op"):
+            raise RuntimeError("boom")
+
+    assert metrics.EXTERNAL_CALL_DURATION.labels("stripe", "test_op", "ok")._sum.get() >= 0
+    body = metrics.render_latest().decode()
+    assert 'external_call_duration_seconds_count{operation="test_op",outcome="error",service="stripe"} 1.0' in body
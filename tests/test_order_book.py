@@ -0,0 +1,224 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from app import models
+from app.core import security
+from app.services.order_book import BUY, SELL, Order, OrderBook, Verdict
+from app.services.orders import OrderService
+from app.services.positions import PositionService
+
+def _order(order_id, side, price_bps, quantity, user_id=None):
+    return Order(order_id, user_id or order_id, side, price_bps, quantity, quantity)
+
+def test_price_time_priority_and_partial_fills():
+    book = OrderBook(1)
+    for order in (_order(1, SELL, 10100, 50), _order(2, SELL, 9900, 30), _order(3, SELL, 9900, 30)):
+        assert book.submit(order).fills == []
+    assert book.best_ask() == 9900
+
+    result = book.submit(_order(4, BUY, 10000, 45))
+    assert [(f.sell_order.id, f.price_bps, f.quantity_cents) for f in result.fills] == [(2, 9900, 30), (3, 9900, 15)]
+    assert book.get(3).remaining_cents == 15
+    assert book.depth() == {"bids": [], "asks": [(9900, 15), (10100, 50)]}
+
+    # A market order sweeps levels and cancels what it cannot fill
+    result = book.submit(_order(5, BUY, None, 100))
+    assert [f.quantity_cents for f in result.fills] == [15, 50]
+    assert [(o.id, reason) for o, reason in result.cancelled] == [(5, "unfilled")]
+    assert book.best_ask() is None
+
+def test_cancel_and_self_trade():
+    book = OrderBook(1)
+    book.submit(_order(1, BUY, 10000, 10, user_id=7))
+    book.submit(_order(2, BUY, 10000, 10, user_id=8))
+    assert book.cancel(2).id == 2
+    assert book.cancel(2) is None
+    assert book.depth()["bids"] == [(10000, 10)]
+
+    result = book.submit(_order(3, SELL, 10000, 10, user_id=7))
+    assert result.fills == []
+    assert [(o.id, reason) for o, reason in result.cancelled] == [(1, "self_trade")]
+    assert book.depth() == {"bids": [], "asks": [(10000, 10)]}
+
+def test_verdict_limits_fill_and_cancels_side():
+    book = OrderBook(1)
+    book.submit(_order(1, SELL, 10000, 100))
+    book.submit(_order(2, SELL, 10000, 100))
+    check = lambda buy, sell, quantity: Verdict(40, SELL, "lockup") if sell.id == 1 else Verdict(quantity)
+    result = book.submit(_order(3, BUY, 10000, 100), check)
+    assert [(f.sell_order.id, f.quantity_cents) for f in result.fills] == [(1, 40), (2, 60)]
+    assert [(o.id, reason) for o, reason in result.cancelled] == [(1, "lockup")]
+    assert book.depth()["asks"] == [(10000, 40)]
+
+def _user(db, kyc_status="verified"):
+    user = models.User(email=f"orders_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}",
+                       hashed_password="x", kyc_status=kyc_status)
+    db.add(user)
+    db.commit()
+    return user
+
+def _headers(user):
+    return {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+def _stripe_event(client, event_type, payment_intent_id):
+    event = {"type": event_type, "data": {"object": {"id": payment_intent_id}}}
+    with patch("app.api.v1.endpoints.webhooks.StripeService.construct_event", return_value=event):
+        assert client.post("/api/v1/webhooks/stripe", content=b"{}", headers={"Stripe-Signature": "t"}).status_code == 200
+
+def _holding(db, user, campaign, amount_cents, days_ago):
+    entry = models.Ledger(user_id=user.id, campaign_id=campaign.id, amount_cents=amount_cents, transaction_type="investment",
+                          status="settled", created_at=datetime.now(timezone.utc) - timedelta(days=days_ago))
+    db.add(entry)
+    db.flush()
+    PositionService.record_settlement(db, entry)
+    db.commit()
+
+def test_orders_match_move_holdings_and_recover(client, override_get_db, db):
+    campaign = models.Campaign(name="Secondary", issuer_id=1, target_amount_cents=10_000_00, regulation_type="REG_CF",
+                               deadline=datetime.now(timezone.utc) + timedelta(days=30))
+    db.add(campaign)
+    db.commit()
+    seller, locked_seller, buyer = _user(db), _user(db), _user(db)
+    _holding(db, seller, campaign, 100_00, days_ago=400)
+    _holding(db, locked_seller, campaign, 100_00, days_ago=10)
+
+    # Placement checks lockup and holdings
+    res = client.post("/api/v1/orders/", json={"campaign_id": campaign.id, "side": "sell", "price_bps": 9500, "quantity": 50.0},
+                      headers=_headers(locked_seller))
+    assert res.status_code == 403
+    assert "lockup" in res.json()["detail"]
+
+    res = client.post("/api/v1/orders/", json={"campaign_id": campaign.id, "side": "sell", "price_bps": 9500, "quantity": 80.0},
+                      headers=_headers(seller))
+    assert res.status_code == 200
+    sell_id = res.json()["id"]
+    assert res.json()["status"] == "open"
+
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as create:
+        create.return_value = MagicMock(id="pi_trade_1", client_secret="secret_trade_1")
+        res = client.post("/api/v1/orders/", json={"campaign_id": campaign.id, "side": "buy", "price_bps": 10000, "quantity": 50.0},
+                          headers=_headers(buyer))
+    assert res.status_code == 200
+    body = res.json()
+    assert body["status"] == "filled"
+    assert body["fills"] == [{
+        "buy_order_id": body["id"], "sell_order_id": sell_id, "price_bps": 9500, "quantity": 50.0, "amount": 47.5,
+        "payment_status": "pending_payment", "stripe_payment_intent_id": "pi_trade_1", "client_secret": "secret_trade_1",
+    }]
+    assert create.call_args.kwargs["amount_cents"] == 47_50
+
+    # Until the buyer pays, the quantity is out of the seller's position but not yet in the buyer's
+    assert db.get(models.Position, (seller.id, campaign.id)).quantity_cents == 50_00
+    assert db.get(models.Position, (buyer.id, campaign.id)) is None
+    assert PositionService.sellable(db, buyer.id, campaign.id) == 0
+    _stripe_event(client, "payment_intent.succeeded", "pi_trade_1")
+    assert db.get(models.Position, (buyer.id, campaign.id)).quantity_cents == 50_00
+    # The buyer inherits the seller's acquisition date, so the transfer does not reset the lockup
+    assert PositionService.sellable(db, buyer.id, campaign.id) == 50_00
+    legs = db.query(models.Ledger).filter(models.Ledger.stripe_payment_intent_id == "pi_trade_1").all()
+    assert sorted((leg.transaction_type, leg.status) for leg in legs) == [("trade_buy", "settled"), ("trade_sell", "settled")]
+
+    # A fresh process rebuilds the same book from the event log, without queueing behind order placement
+    OrderService.reset()
+    with patch("app.services.orders.InvestorLock.hold", side_effect=AssertionError("matching lock taken")):
+        res = client.get(f"/api/v1/orders/book/{campaign.id}")
+    assert res.json() == {"campaign_id": campaign.id, "bids": [], "asks": [{"price_bps": 9500, "quantity": 30.0}]}
+
+    # Unverified buyers are refused
+    res = client.post("/api/v1/orders/", json={"campaign_id": campaign.id, "side": "buy", "order_type": "market", "quantity": 10.0},
+                      headers=_headers(_user(db, kyc_status="pending")))
+    assert res.status_code == 403
+
+    assert client.delete(f"/api/v1/orders/{sell_id}", headers=_headers(buyer)).status_code == 404
+    res = client.delete(f"/api/v1/orders/{sell_id}", headers=_headers(seller))
+    assert res.json()["status"] == "cancelled"
+    assert client.get(f"/api/v1/orders/book/{campaign.id}").json()["asks"] == []
+    events = db.query(models.OrderEvent).filter(models.OrderEvent.campaign_id == campaign.id).order_by(models.OrderEvent.id).all()
+    assert [e.event_type for e in events] == ["placed", "placed", "fill", "cancelled"]
+
+def test_resting_sell_rechecked_at_match_time(client, override_get_db, db):
+    campaign = models.Campaign(name="Recheck", issuer_id=1, target_amount_cents=10_000_00, regulation_type="REG_CF",
+                               deadline=datetime.now(timezone.utc) + timedelta(days=30))
+    db.add(campaign)
+    db.commit()
+    seller, buyer = _user(db), _user(db)
+    _holding(db, seller, campaign, 100_00, days_ago=400)
+    OrderService.place(db, seller, campaign, SELL, 10000, 100_00)
+    # The holding is sold elsewhere before a buyer arrives
+    PositionService.sell(db, seller.id, campaign.id, 70_00)
+    db.commit()
+
+    with patch("app.services.stripe_service.StripeService.create_payment_intent", return_value=MagicMock(id="pi_recheck")):
+        order, result, payments = OrderService.place(db, buyer, campaign, BUY, 10000, 100_00)
+    assert [p.status for p in payments] == ["pending_payment"]
+    assert [f.quantity_cents for f in result.fills] == [30_00]
+    assert [(o.side, reason) for o, reason in result.cancelled] == [(SELL, "Asset is under 1-year lockup period (SEC Rule 501)")]
+    assert order.remaining_cents == 70_00 and order.active
+
+def _trade(db, seller, buyer, quantity_cents, payment_intent="pi_trade"):
+    campaign = models.Campaign(name="Unpaid", issuer_id=1, target_amount_cents=10_000_00, regulation_type="REG_CF",
+                               deadline=datetime.now(timezone.utc) + timedelta(days=30))
+    db.add(campaign)
+    db.commit()
+    _holding(db, seller, campaign, 100_00, days_ago=400)
+    OrderService.place(db, seller, campaign, SELL, 10000, 100_00)
+    with patch("app.services.stripe_service.StripeService.create_payment_intent") as create:
+        if payment_intent is None:
+            create.side_effect = Exception("Stripe Error: unavailable")
+        else:
+            create.return_value = MagicMock(id=payment_intent, client_secret=f"{payment_intent}_secret")
+        _, result, payments = OrderService.place(db, buyer, campaign, BUY, 10000, quantity_cents)
+    return campaign, payments[0]
+
+def test_failed_or_expired_payment_gives_the_seller_back(client, override_get_db, db):
+    seller, buyer = _user(db), _user(db)
+    campaign, payment = _trade(db, seller, buyer, 60_00, payment_intent="pi_declined")
+    assert db.get(models.Position, (seller.id, campaign.id)).quantity_cents == 40_00
+
+    # The buyer sees the payment to confirm
+    with patch("app.services.stripe_service.StripeService.retrieve_payment_intent", return_value=MagicMock(client_secret="pi_declined_secret")):
+        res = client.get("/api/v1/orders/payments", headers=_headers(buyer))
+    assert [(p["id"], p["client_secret"], p["amount"]) for p in res.json()] == [(payment.buy_ledger_id, "pi_declined_secret", 60.0)]
+
+    with patch("app.services.stripe_service.StripeService.cancel_payment_intent") as cancel:
+        _stripe_event(client, "payment_intent.payment_failed", "pi_declined")
+        _stripe_event(client, "payment_intent.payment_failed", "pi_declined") # Redelivered
+    cancel.assert_called_once_with("pi_declined")
+    assert db.get(models.Position, (seller.id, campaign.id)).quantity_cents == 100_00
+    assert PositionService.sellable(db, seller.id, campaign.id) == 100_00
+    assert db.get(models.Position, (buyer.id, campaign.id)) is None
+    legs = db.query(models.Ledger).filter(models.Ledger.stripe_payment_intent_id == "pi_declined").all()
+    assert {leg.status for leg in legs} == {"failed"}
+    # A late success cannot hand the unwound quantity to the buyer
+    _stripe_event(client, "payment_intent.succeeded", "pi_declined")
+    assert db.get(models.Position, (buyer.id, campaign.id)) is None
+
+    # No PaymentIntent could be created: unwound at once
+    seller, buyer = _user(db), _user(db)
+    campaign, payment = _trade(db, seller, buyer, 60_00, payment_intent=None)
+    assert payment.status == "failed"
+    assert db.get(models.Position, (seller.id, campaign.id)).quantity_cents == 100_00
+
+    # Never paid: unwound once the payment window has passed
+    seller, buyer = _user(db), _user(db)
+    campaign, payment = _trade(db, seller, buyer, 60_00, payment_intent="pi_abandoned")
+    with patch("app.services.stripe_service.StripeService.cancel_payment_intent") as cancel:
+        assert OrderService.expire_unpaid_trades(db) == 0
+        assert OrderService.expire_unpaid_trades(db, now=datetime.now(timezone.utc) + timedelta(days=2)) == 1
+    cancel.assert_called_once_with("pi_abandoned")
+    assert db.get(models.Position, (seller.id, campaign.id)).quantity_cents == 100_00
+
+def test_trade_legs_cannot_be_cancelled_as_investments(client, override_get_db, db):
+    seller, buyer = _user(db), _user(db)
+    campaign, payment = _trade(db, seller, buyer, 60_00, payment_intent="pi_paid_trade")
+    _stripe_event(client, "payment_intent.succeeded", "pi_paid_trade")
+    sell_leg = db.query(models.Ledger).filter(models.Ledger.user_id == seller.id,
+                                              models.Ledger.transaction_type == "trade_sell").one()
+
+    with patch("app.services.stripe_service.StripeService.refund_payment") as refund:
+        for user, ledger_id in ((buyer, payment.buy_ledger_id), (seller, sell_leg.id)):
+            res = client.post(f"/api/v1/ledger/investments/{ledger_id}/cancel", headers=_headers(user))
+            assert res.status_code == 404
+    refund.assert_not_called()
+    assert db.get(models.Position, (buyer.id, campaign.id)).quantity_cents == 60_00
+    assert db.get(models.Position, (seller.id, campaign.id)).quantity_cents == 40_00
@@ -0,0 +1,137 @@
+import csv
+import gzip
+import os
+import uuid
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from app import worker
+from app.core.config import settings
+from app.db.base import Base
+from app.services import partitions
+from app.services.partitions import (
+    PARTITIONED_TABLES, PartitionArchiveError, PartitionManager, add_months, archive_cutoff, month_start,
+    parse_partition_name, partition_bounds, partition_name,
+)
+from app.services.storage import FilesystemStorage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_month_arithmetic():
+    assert month_start(date(2026, 10, 19)) == date(2026, 10, 1)
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_bounds(date(2026, 12, 1)) == (date(2026, 12, 1), date(2027, 1, 1))
+
+def test_partition_names_round_trip():
+    name = partition_name("billing_log", date(2026, 3, 1))
+    assert name == "billing_log_y2026m03"
+    assert parse_partition_name(name) == ("billing_log", date(2026, 3, 1))
+    assert parse_partition_name("ledger_default") is None
+
+def test_archive_cutoff_keeps_limit_window():
+    # 13 months: the 12-month lookback plus the current month
+    assert archive_cutoff(date(2026, 10, 19), 13) == date(2025, 10, 1)
+    assert archive_cutoff(date(2026, 10, 19), 24) == date(2024, 11, 1)
+    with pytest.raises(ValueError):
+        archive_cutoff(date(2026, 10, 19), 12)
+
+def test_maintenance_is_noop_without_postgres(db):
+    assert PartitionManager.ensure_future_partitions(db) == []
+    assert PartitionManager.archive_old_partitions(db) == []
+
+def test_archival_off_by_default(db, monkeypatch):
+    monkeypatch.setattr(partitions.settings, "PARTITION_RETENTION_MONTHS", None)
+    monkeypatch.setattr(partitions, "_is_postgres", lambda db: True)
+    assert PartitionManager.archive_old_partitions(db) == []
+
+@pytest.fixture
+def migrated_postgres():
+    # A scratch database with plain tables, then the partitioning migration run on it.
+    # The chain cannot start from empty (the first revisions assume existing tables).
+    url = make_url(settings.DATABASE_URL)
+    name = f"regrouter_partitions_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f'CREATE DATABASE "{name}"'))
+    scratch = create_engine(url.set(database=name))
+    try:
+        Base.metadata.create_all(bind=scratch)
+        config = Config() # No ini file: env.py would reconfigure logging
+        config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+        with scratch.begin() as connection:
+            config.attributes["connection"] = connection
+            command.stamp(config, "9a4f7e3b2c18")
+            command.upgrade(config, "2b8d6f0e5c93")
+        yield sessionmaker(bind=scratch)
+    finally:
+        scratch.dispose()
+        with admin.connect() as connection:
+            connection.execute(text(f'DROP DATABASE "{name}"'))
+        admin.dispose()
+
+@pytest.mark.postgres
+def test_maintain_partitions_archives_to_storage(migrated_postgres, tmp_path, monkeypatch):
+    storage = FilesystemStorage(str(tmp_path))
+    monkeypatch.setattr(partitions, "get_storage", lambda: storage)
+    monkeypatch.setattr(worker, "SessionLocal", migrated_postgres)
+    today = date.today()
+    old_month = add_months(month_start(today), -30)
+
+    db = migrated_postgres()
+    try:
+        # The migration premade the current month and PARTITION_PREMAKE_MONTHS ahead
+        assert partition_name("ledger", add_months(month_start(today), 3)) in PartitionManager.list_partitions(db, "ledger")
+        PartitionManager.ensure_future_partitions(db, months_ahead=0, today=old_month)
+        user_id = db.execute(text(
+            "INSERT INTO users (email, stripe_id, hashed_password) VALUES ('archive@example.com', 'cus_archive', 'x') RETURNING id"
+        )).scalar()
+        old = datetime.combine(old_month, datetime.min.time(), tzinfo=timezone.utc) + timedelta(days=3)
+        for created_at in (old, datetime.now(timezone.utc)):
+            db.execute(text(
+                "INSERT INTO ledger (user_id, amount_cents, transaction_type, status, created_at) "
+                "VALUES (:user_id, 5000, 'investment', 'settled', :created_at)"
+            ), {"user_id": user_id, "created_at": created_at})
+            db.execute(text(
+                "INSERT INTO billing_log (user_id, transaction_id, fee_amount_cents, description, created_at) "
+                "VALUES (:user_id, 'val', 200, 'Validation Check: REG_CF', :created_at)"
+            ), {"user_id": user_id, "created_at": created_at})
+        db.commit()
+
+        # Retention off: nothing is dropped
+        monkeypatch.setattr(partitions.settings, "PARTITION_RETENTION_MONTHS", None)
+        worker.maintain_partitions()
+        assert db.execute(text("SELECT count(*) FROM ledger")).scalar() == 2
+
+        monkeypatch.setattr(partitions.settings, "PARTITION_RETENTION_MONTHS", 24)
+        worker.maintain_partitions()
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, old_month)
+            assert name not in PartitionManager.list_partitions(db, table)
+            assert db.execute(text(f"SELECT count(*) FROM {table}")).scalar() == 1
+            with gzip.open(tmp_path / "partition-archive" / table / f"{name}.csv.gz", "rt") as f:
+                rows = list(csv.DictReader(f))
+            assert len(rows) == 1 and rows[0]["user_id"] == str(user_id)
+    finally:
+        db.close()
+
+@pytest.mark.postgres
+def test_partition_kept_when_stored_archive_differs(migrated_postgres, tmp_path, monkeypatch):
+    class CorruptingStorage(FilesystemStorage):
+        def open_stream(self, key, chunk_size):
+            yield b"truncated"
+
+    monkeypatch.setattr(partitions, "get_storage", lambda: CorruptingStorage(str(tmp_path)))
+    old_month = add_months(month_start(date.today()), -30)
+    db = migrated_postgres()
+    try:
+        PartitionManager.ensure_future_partitions(db, months_ahead=0, today=old_month)
+        with pytest.raises(PartitionArchiveError):
+            PartitionManager.archive_old_partitions(db, retention_months=24)
+        assert partition_name("ledger", old_month) in PartitionManager.list_partitions(db, "ledger")
+    finally:
+        db.close()
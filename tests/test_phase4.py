@@ -23,7 +23,7 @@ def mock_stripe_refund():
 
 @pytest.fixture
 def mock_worker_task():
-    with patch("app.api.v1.endpoints.ledger.settle_investment_task") as mock:
+    with patch("app.worker.settle_investment_task") as mock:
         yield mock
 
 @pytest.fixture
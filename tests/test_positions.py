@@ -0,0 +1,87 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from app import models
+from app.core import security
+from app.services.compliance import ComplianceService
+from app.services.positions import InsufficientHoldings, LockedHoldings, PositionService
+
+def _holder(db):
+    user = models.User(email=f"holder_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x")
+    campaign = models.Campaign(name="Held", issuer_id=1, target_amount_cents=10_000_00, regulation_type="REG_CF",
+                               deadline=datetime.now(timezone.utc) + timedelta(days=30))
+    db.add_all([user, campaign])
+    db.commit()
+    return user, campaign
+
+def _investment(db, user, campaign, amount_cents, days_ago, status="settled"):
+    entry = models.Ledger(user_id=user.id, campaign_id=campaign.id, amount_cents=amount_cents, transaction_type="investment",
+                          status=status, created_at=datetime.now(timezone.utc) - timedelta(days=days_ago))
+    db.add(entry)
+    db.flush()
+    return entry
+
+def test_settlement_is_idempotent(db):
+    user, campaign = _holder(db)
+    entry = _investment(db, user, campaign, 100_00, days_ago=1)
+    assert PositionService.record_settlement(db, entry) is not None
+    assert PositionService.record_settlement(db, entry) is None
+    second = _investment(db, user, campaign, 50_00, days_ago=0)
+    PositionService.record_settlement(db, second)
+    db.commit()
+    assert db.get(models.Position, (user.id, campaign.id)).quantity_cents == 150_00
+
+def test_sell_is_fifo_and_stops_at_locked_lots(db):
+    user, campaign = _holder(db)
+    oldest = PositionService.record_settlement(db, _investment(db, user, campaign, 100_00, days_ago=800))
+    older = PositionService.record_settlement(db, _investment(db, user, campaign, 100_00, days_ago=400))
+    recent = PositionService.record_settlement(db, _investment(db, user, campaign, 100_00, days_ago=30))
+    db.commit()
+
+    assert PositionService.sell(db, user.id, campaign.id, 150_00) == [(oldest.id, 100_00), (older.id, 50_00)]
+    with pytest.raises(LockedHoldings):
+        PositionService.sell(db, user.id, campaign.id, 100_00)
+    with pytest.raises(InsufficientHoldings):
+        PositionService.sell(db, user.id, campaign.id, 200_00)
+    assert (oldest.remaining_cents, older.remaining_cents, recent.remaining_cents) == (0, 50_00, 100_00)
+    assert db.get(models.Position, (user.id, campaign.id)).quantity_cents == 150_00
+
+def test_release_removes_remaining_lot(db):
+    user, campaign = _holder(db)
+    entry = _investment(db, user, campaign, 100_00, days_ago=1)
+    PositionService.record_settlement(db, entry)
+    assert PositionService.release(db, entry) == 100_00
+    assert PositionService.release(db, entry) == 0
+    assert db.get(models.Position, (user.id, campaign.id)).quantity_cents == 0
+
+def test_stripe_webhook_opens_lot(client, override_get_db, db):
+    user, campaign = _holder(db)
+    entry = _investment(db, user, campaign, 75_00, days_ago=0, status="pending_settlement")
+    entry.stripe_payment_intent_id = f"pi_{uuid.uuid4().hex}"
+    db.commit()
+    event = {"type": "payment_intent.succeeded", "data": {"object": {"id": entry.stripe_payment_intent_id}}}
+    with patch("app.api.v1.endpoints.webhooks.StripeService.construct_event", return_value=event):
+        for _ in range(2): # Redelivered
+            assert client.post("/api/v1/webhooks/stripe", content=b"{}", headers={"Stripe-Signature": "t"}).status_code == 200
+    assert db.get(models.Position, (user.id, campaign.id)).quantity_cents == 75_00
+
+def test_lockup_cutoff_leap_day():
+    assert ComplianceService.lockup_cutoff(datetime(2028, 2, 29, 12)) == datetime(2027, 2, 28, 12)
+    assert ComplianceService.lockup_cutoff(datetime(2026, 10, 19)) == datetime(2025, 10, 19)
+
+def test_cancel_refused_once_part_of_the_lot_is_sold(client, override_get_db, db):
+    user, campaign = _holder(db)
+    entry = _investment(db, user, campaign, 100_00, days_ago=400)
+    entry.stripe_payment_intent_id = f"pi_{uuid.uuid4().hex}"
+    PositionService.record_settlement(db, entry)
+    PositionService.sell(db, user.id, campaign.id, 40_00)
+    db.commit()
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+    with patch("app.services.stripe_service.StripeService.refund_payment") as refund:
+        res = client.post(f"/api/v1/ledger/investments/{entry.id}/cancel", headers=headers)
+    assert res.status_code == 409
+    refund.assert_not_called()
+    db.refresh(entry)
+    assert entry.status == "settled"
@@ -0,0 +1,71 @@
+import logging
+from unittest.mock import MagicMock
+import pytest
+from datetime import datetime, timedelta
+from app import models
+from app.core.config import settings
+from app.db import profiler
+
+def test_capture_flags_duplicates_and_n_plus_one(db):
+    campaign = models.Campaign(name="Profiled", target_amount=1000, deadline=datetime.now() + timedelta(days=30), issuer_id=1)
+    db.add(campaign)
+    db.commit()
+    campaign_id = campaign.id
+
+    with profiler.capture() as profile:
+        # Same lookup twice -> duplicate
+        db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
+        db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
+        # Same statement shape in a loop -> N+1
+        for i in range(settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD):
+            db.query(models.Ledger).filter(models.Ledger.campaign_id == i).first()
+
+    assert profile.query_count == 2 + settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+    assert len(profile.duplicates()) == 1
+    assert any("ledger" in stmt for stmt, _ in profile.n_plus_one())
+
+def test_slow_query_logged_with_plan(db, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.db.profiler"):
+        with profiler.capture() as profile:
+            db.query(models.User).filter(models.User.email == "nobody@example.com").first()
+
+    assert profile.slow_queries
+    assert profile.slow_queries[0].plan
+    assert "Slow query" in caplog.text
+
+def test_failed_explain_rolls_back_to_savepoint():
+    # On Postgres a failed statement aborts the transaction the slow query ran in
+    conn = MagicMock()
+    conn.dialect.name = "postgresql"
+    conn.connection.dbapi_connection.autocommit = False
+    cursor = conn.connection.dbapi_connection.cursor.return_value
+    executed = []
+    def execute(sql, parameters=None):
+        executed.append(sql)
+        if sql.startswith("EXPLAIN"):
+            raise RuntimeError("permission denied")
+    cursor.execute.side_effect = execute
+
+    plan = profiler._explain(conn, "SELECT * FROM ledger WHERE id = %(id)s", {"id": 1})
+    assert plan == "EXPLAIN failed: permission denied"
+    assert executed == [
+        "SAVEPOINT query_profiler_explain",
+        "EXPLAIN SELECT * FROM ledger WHERE id = %(id)s",
+        "ROLLBACK TO SAVEPOINT query_profiler_explain",
+    ]
+
+def test_profile_header_ignored_by_default(client, override_get_db):
+    res = client.get("/api/v1/campaigns/", headers={"X-Query-Profile": "1"})
+    assert res.status_code == 200
+    assert "x-query-count" not in res.headers
+
+def test_profile_header_reports_query_counts(client, override_get_db, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_PROFILER_ALLOW_HEADER", True)
+    res = client.get("/api/v1/campaigns/", headers={"X-Query-Profile": "1"})
+    assert res.status_code == 200
+    assert int(res.headers["x-query-count"]) >= 1
+    assert res.headers["x-query-duplicates"] == "0"
+
+    res = client.get("/api/v1/campaigns/")
+    assert "x-query-count" not in res.headers
@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.middleware.cors import CORSMiddleware
+from app.core import security
+from app.core.config import settings
+from app.core.rate_limit import AdmissionControlMiddleware, LocalTokenBuckets, client_ip, local_buckets
+from app.db import pool_monitor
+
+@pytest.fixture
+def limited_app(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_REDIS_URL", None)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ROUTES", {"POST /login": 2})
+    monkeypatch.setattr(settings, "CONCURRENCY_LIMITS", {})
+    local_buckets.clear()
+    pool_monitor.clear()
+    api = FastAPI()
+
+    @api.post("/login")
+    async def login(request: Request):
+        form = await request.form()
+        return {"ok": True, "username": form.get("username")}
+
+    @api.get("/campaigns")
+    def campaigns():
+        return []
+
+    api.add_middleware(AdmissionControlMiddleware)
+    yield TestClient(api)
+    local_buckets.clear()
+    pool_monitor.clear()
+
+def test_token_bucket_refills():
+    buckets = LocalTokenBuckets()
+    assert buckets.take("k", 60, now=0.0) == 0
+    for _ in range(59):
+        buckets.take("k", 60, now=0.0)
+    assert buckets.take("k", 60, now=0.0) == pytest.approx(1.0)
+    assert buckets.take("k", 60, now=1.0) == 0 # One token per second
+
+def test_route_budget_is_per_client(limited_app):
+    assert limited_app.post("/login").status_code == 200
+    assert limited_app.post("/login").status_code == 200
+    res = limited_app.post("/login")
+    assert res.status_code == 429
+    assert int(res.headers["retry-after"]) >= 1
+    # Other routes and other clients keep their own budgets
+    assert limited_app.get("/campaigns").status_code == 200
+    token = security.create_access_token({"sub": "other@example.com"})
+    assert limited_app.post("/login", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+def test_login_budget_is_per_username(limited_app, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_USERNAME_ROUTES", ["POST /login"])
+    other_clients = [{"Authorization": f"Bearer {security.create_access_token({'sub': f'c{i}@example.com'})}"} for i in range(3)]
+    res = limited_app.post("/login", data={"username": "victim@example.com"}, headers=other_clients[0])
+    assert res.json() == {"ok": True, "username": "victim@example.com"} # Body still reaches the route
+    assert limited_app.post("/login", data={"username": "Victim@example.com"}, headers=other_clients[1]).status_code == 200
+    # A fresh client still cannot try a third password for the same account
+    assert limited_app.post("/login", data={"username": "victim@example.com"}, headers=other_clients[2]).status_code == 429
+    assert limited_app.post("/login", data={"username": "other@example.com"}, headers=other_clients[2]).status_code == 200
+
+def test_client_ip_trusts_only_configured_proxies(monkeypatch):
+    headers = {b"x-forwarded-for": b"6.6.6.6, 203.0.113.7, 172.18.0.5", b"x-real-ip": b"198.51.100.2"}
+    proxied = {"client": ("172.18.0.1", 1)}
+    assert client_ip(proxied, headers) == "172.18.0.1" # No trusted proxies configured
+    assert client_ip({"client": ("203.0.113.9", 1)}, headers) == "203.0.113.9"
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", ["172.16.0.0/12"])
+    # Skips our own proxies; the spoofable entries before the client are ignored
+    assert client_ip(proxied, headers) == "203.0.113.7"
+    assert client_ip(proxied, {b"x-real-ip": b"198.51.100.2"}) == "198.51.100.2"
+    assert client_ip({"client": ("203.0.113.9", 1)}, headers) == "203.0.113.9"
+
+def test_rejection_carries_cors_headers(limited_app):
+    # Same order as app.main: CORS is added after the limiter, so it wraps it
+    limited_app.app.add_middleware(CORSMiddleware, allow_origins=["https://app.example.com"])
+    origin = {"Origin": "https://app.example.com"}
+    limited_app.post("/login", headers=origin)
+    limited_app.post("/login", headers=origin)
+    res = limited_app.post("/login", headers=origin)
+    assert res.status_code == 429
+    assert res.headers["access-control-allow-origin"] == "https://app.example.com"
+
+def test_sheds_load_while_pool_wait_is_high(limited_app, monkeypatch):
+    monkeypatch.setattr(settings, "LOAD_SHED_POOL_WAIT_MS", 100.0)
+    pool_monitor.record_wait(0.5)
+    res = limited_app.get("/campaigns")
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "1"
+
+def test_concurrency_cap(monkeypatch):
+    monkeypatch.setattr(settings, "CONCURRENCY_LIMITS", {"POST /login": 1})
+    monkeypatch.setattr(settings, "CONCURRENCY_QUEUE_SECONDS", 0.05)
+    local_buckets.clear()
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = AdmissionControlMiddleware(slow_app)
+    scope = {"type": "http", "method": "POST", "path": "/login", "headers": [], "client": ("10.1.1.1", 1)}
+
+    async def call():
+        statuses = []
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+        await middleware(scope, None, send)
+        return statuses[0]
+
+    async def scenario():
+        first = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        second = await call() # Times out waiting for the only slot
+        release.set()
+        return await first, second
+
+    assert asyncio.run(scenario()) == (200, 503)
+    local_buckets.clear()
@@ -0,0 +1,70 @@
+import pytest
+from starlette.requests import Request
+from app import models
+from app.api import deps
+from app.core import security
+from app.core.config import settings
+from app.db.replica import ReadYourWrites
+from app.db.session import SessionLocal
+
+def _request(headers=None, client=("10.0.0.7", 1234)):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers, "client": client, "query_string": b""})
+
+class _FakeSession:
+    def __init__(self, name):
+        self.name = name
+        self.info = {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def replica(monkeypatch):
+    monkeypatch.setattr(settings, "READ_REPLICA_URL", "postgresql://replica/regrouter")
+    monkeypatch.setattr(deps, "ReadSessionLocal", lambda: _FakeSession("replica"))
+    monkeypatch.setattr(deps, "SessionLocal", lambda: _FakeSession("primary"))
+    ReadYourWrites.clear()
+    yield
+    ReadYourWrites.clear()
+
+def test_client_key_prefers_token_subject():
+    token = security.create_access_token({"sub": "reader@example.com"})
+    assert deps._client_key(_request({"Authorization": f"Bearer {token}"})) == "user:reader@example.com"
+    assert deps._client_key(_request({"Authorization": "Bearer garbage"})) == "ip:10.0.0.7"
+
+def test_reads_go_to_replica_unless_client_wrote_recently(replica):
+    request = _request()
+    session = next(deps.get_read_db(request))
+    assert session.name == "replica"
+
+    ReadYourWrites.mark(deps._client_key(request), None)
+    session = next(deps.get_read_db(request))
+    assert session.name == "primary"
+
+    # Other clients are unaffected
+    assert next(deps.get_read_db(_request(client=("10.0.0.8", 1)))).name == "replica"
+
+def test_read_your_writes_window_expires(monkeypatch):
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.0)
+    ReadYourWrites.mark("ip:10.0.0.9", "0/16B3748")
+    assert ReadYourWrites.pending("ip:10.0.0.9") == (False, None)
+
+def test_committed_writes_are_tracked(db_engine):
+    db = SessionLocal()
+    try:
+        db.query(models.User).filter(models.User.id == -1).first()
+        db.commit()
+        assert not db.info.get("committed_writes")
+
+        db.query(models.User).filter(models.User.id == -1).update({"kyc_status": "verified"})
+        db.commit()
+        assert db.info.get("committed_writes")
+    finally:
+        db.close()
+
+def test_without_replica_reads_use_primary(monkeypatch):
+    monkeypatch.setattr(settings, "READ_REPLICA_URL", None)
+    monkeypatch.setattr(deps, "SessionLocal", lambda: _FakeSession("primary"))
+    assert next(deps.get_read_db(_request())).name == "primary"
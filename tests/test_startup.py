@@ -0,0 +1,23 @@
+import os
+import pytest
+from benchmarks.startup_bench import profile_imports
+
+# Generous enough for slow CI runners; override with STARTUP_IMPORT_BUDGET_MS
+STARTUP_IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", "3000"))
+
+# Heavy clients that must only be imported when first used
+LAZY_MODULES = ["stripe", "celery", "sentry_sdk", "app.worker", "boto3", "pyarrow"]
+
+@pytest.fixture(scope="module")
+def import_profile():
+    env = {"SENTRY_DSN": ""}
+    profile_imports("app.main", env)  # warm the bytecode cache
+    return min((profile_imports("app.main", env) for _ in range(3)), key=lambda p: p["app.main"])
+
+def test_heavy_clients_not_imported_at_startup(import_profile):
+    eager = [name for name in LAZY_MODULES if name in import_profile]
+    assert eager == [], f"Imported at startup: {eager}"
+
+def test_startup_import_budget(import_profile):
+    import_ms = import_profile["app.main"] / 1000
+    assert import_ms < STARTUP_IMPORT_BUDGET_MS, f"app.main imports in {import_ms:.0f} ms"
@@ -0,0 +1,53 @@
+import io
+import os
+import pytest
+from app import models
+from app.core import security
+from app.services import storage
+from app.services.storage import DocumentRejected, FilesystemStorage, iter_validated_pdf
+
+PDF = b"%PDF-1.7\n" + b"0" * 5000 + b"\n%%EOF"
+
+@pytest.fixture
+def storage_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "_storage", FilesystemStorage(str(tmp_path)))
+    return tmp_path
+
+def test_pdf_streamed_in_chunks():
+    chunks = list(iter_validated_pdf(io.BytesIO(PDF), max_bytes=10000, chunk_size=1024))
+    assert len(chunks) == 5
+    assert b"".join(chunks) == PDF
+
+def test_rejects_non_pdf_and_oversized():
+    with pytest.raises(DocumentRejected) as exc:
+        list(iter_validated_pdf(io.BytesIO(b"MZ\x90\x00" + b"0" * 100), max_bytes=10000, chunk_size=1024))
+    assert exc.value.status_code == 400
+
+    with pytest.raises(DocumentRejected) as exc:
+        list(iter_validated_pdf(io.BytesIO(PDF), max_bytes=2048, chunk_size=1024))
+    assert exc.value.status_code == 413
+
+def test_failed_stream_leaves_no_file(storage_root):
+    backend = FilesystemStorage(str(storage_root))
+    with pytest.raises(DocumentRejected):
+        backend.put_stream("docs/x.pdf", iter_validated_pdf(io.BytesIO(PDF), 2048, 1024), "application/pdf")
+    assert os.listdir(storage_root / "docs") == []
+
+def test_upload_records_storage_key(client, override_get_db, db, storage_root):
+    user = models.User(email="uploader@example.com", stripe_id="cus_uploader", hashed_password="x")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+    res = client.post("/api/v1/users/me/accreditation/upload", headers=headers,
+                      files={"file": ("proof.pdf", PDF, "application/pdf")})
+    assert res.status_code == 200, res.text
+    assert res.json()["accreditation_status"] == "PENDING_REVIEW"
+    db.refresh(user)
+    assert user.accreditation_document_key.startswith(f"accreditation/{user.id}/")
+    assert (storage_root / user.accreditation_document_key).read_bytes() == PDF
+
+    # Declared as PDF but is not one
+    res = client.post("/api/v1/users/me/accreditation/upload", headers=headers,
+                      files={"file": ("proof.pdf", b"<html></html>", "application/pdf")})
+    assert res.status_code == 400
@@ -0,0 +1,60 @@
+import uuid
+from unittest.mock import patch
+from app import models
+from app.core import security
+from app.services import user_import
+from app.services.user_import import UserImportService
+
+def _record(**kwargs):
+    tag = uuid.uuid4().hex
+    record = {"email": f"import_{tag}@example.com", "stripe_id": f"cus_{tag}", "password": "password123"}
+    record.update(kwargs)
+    return record
+
+def test_import_reports_row_errors_and_inserts_the_rest(db):
+    existing = models.User(email=f"import_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x")
+    db.add(existing)
+    db.commit()
+
+    good = _record(annual_income=50000, net_worth=60000)
+    accredited = _record(is_accredited=True)
+    records = [
+        good,
+        _record(email="not-an-email"),
+        _record(email=existing.email),
+        dict(good, stripe_id=f"cus_{uuid.uuid4()}"), # Same email twice in the file
+        accredited,
+    ]
+    result = UserImportService.import_users(db, records, chunk_size=2, hash_workers=1)
+
+    assert result["created"] == 2
+    assert [error["row"] for error in result["errors"]] == [1, 2, 3]
+
+    user = db.query(models.User).filter(models.User.email == good["email"]).one()
+    assert security.verify_password("password123", user.hashed_password)
+    assert user.kyc_status == "unverified"
+    assert user.reg_cf_annual_limit_cents == 300000 # 5% of net worth, set without the ORM hook
+    assert user.reg_cf_invested_12mo_cents == 0
+    assert db.query(models.User).filter(models.User.email == accredited["email"]).one().reg_cf_annual_limit_cents is None
+
+def test_hash_passwords_uses_pool_for_large_batches():
+    passwords = [f"pw{i}" for i in range(user_import.MIN_POOL_BATCH)]
+    with patch.object(user_import, "_get_hash_pool") as get_pool:
+        get_pool.return_value.map.side_effect = lambda fn, items, chunksize: [f"hash:{item}" for item in items]
+        hashes = user_import.hash_passwords(passwords, workers=4)
+    get_pool.assert_called_once_with(4)
+    assert get_pool.return_value.map.call_args[0][0] is security.get_password_hash
+    assert hashes == [f"hash:{password}" for password in passwords]
+
+def test_import_endpoint(client, override_get_db, db):
+    admin = models.User(email=f"import_admin_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x")
+    db.add(admin)
+    db.commit()
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': admin.email})}"}
+
+    res = client.post("/api/v1/admin/users/import", json={"users": [_record(), {"email": "missing@example.com"}]}, headers=headers)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["created"] == 1
+    assert body["errors"][0]["row"] == 1
+    assert "stripe_id" in body["errors"][0]["error"]
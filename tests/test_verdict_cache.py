@@ -0,0 +1,77 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from app import models
+from app.core import security
+from app.services import verdict_cache
+from app.services.compliance import ComplianceService
+from app.services.verdict_cache import VerdictCache
+
+def _create_user(db, **kwargs):
+    user = models.User(email=f"verdict_{uuid.uuid4()}@example.com", stripe_id=f"cus_{uuid.uuid4()}", hashed_password="x", **kwargs)
+    db.add(user)
+    db.commit()
+    return user
+
+def test_506b_valid_until_cool_off_end():
+    created = datetime.now(timezone.utc) - timedelta(days=10)
+    user = models.User(accreditation_status="SELF_CERTIFIED", created_at=created)
+    eligible, valid_until = ComplianceService.evaluate_reg_d_506b(user)
+    assert eligible is False
+    assert valid_until == created + timedelta(days=30)
+
+def test_506c_valid_until_accreditation_expiry():
+    expiry = datetime.now(timezone.utc) + timedelta(days=5)
+    user = models.User(accreditation_status="VERIFIED_DOCS", accreditation_expiry=expiry)
+    assert ComplianceService.evaluate_reg_d_506c(user) == (True, expiry)
+
+def test_cached_verdict_reused_then_invalidated_on_user_update(db, monkeypatch):
+    user = _create_user(db, accreditation_status="NONE")
+    calls = []
+    original = ComplianceService.evaluate_reg_d_506c
+    monkeypatch.setattr(ComplianceService, "evaluate_reg_d_506c", staticmethod(lambda u: calls.append(1) or original(u)))
+
+    assert VerdictCache.check(user, "506_C") is False
+    assert VerdictCache.check(user, "506_C") is False
+    assert len(calls) == 1
+
+    user.accreditation_status = "VERIFIED_DOCS"
+    user.accreditation_expiry = datetime.now(timezone.utc) + timedelta(days=90)
+    db.commit()
+
+    assert VerdictCache.check(user, "506_C") is True
+    assert len(calls) == 2
+
+def test_verdict_not_served_past_rule_validity():
+    # Verified until one second ago: cached "eligible" must not outlive the expiry
+    VerdictCache.put(424242, "506_C", True, datetime.now(timezone.utc) - timedelta(seconds=1))
+    assert VerdictCache.get(424242, "506_C") is None
+
+def test_eligibility_endpoint(client, override_get_db, db):
+    user = _create_user(db, kyc_status="verified", accreditation_status="VERIFIED_DOCS",
+                        accreditation_expiry=datetime.now(timezone.utc) + timedelta(days=30))
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': user.email})}"}
+
+    res = client.get(f"/api/v1/users/{user.id}/eligibility", headers=headers)
+    assert res.status_code == 200
+    lanes = res.json()["lanes"]
+    assert lanes["REG_CF"]["eligible"] is True
+    assert lanes["506_B"]["eligible"] is False # Too new for the cool-off
+    assert lanes["506_B"]["valid_until"] is not None
+    assert lanes["506_C"]["eligible"] is True
+
+    res = client.get("/api/v1/users/999999/eligibility", headers=headers)
+    assert res.status_code == 404
+
+def test_eligible_verdict_not_cached_per_process(db, monkeypatch):
+    # Another worker could not see the invalidation after a revocation
+    monkeypatch.setattr(verdict_cache.settings, "VERDICT_CACHE_REDIS_URL", None)
+    user = _create_user(db, kyc_status="verified")
+    calls = []
+    original = ComplianceService.check_kyc
+    monkeypatch.setattr(ComplianceService, "check_kyc", staticmethod(lambda u: calls.append(1) or original(u)))
+
+    assert VerdictCache.check(user, "REG_CF") is True
+    assert VerdictCache.get(user.id, "REG_CF") is None
+    assert VerdictCache.check(user, "REG_CF") is True
+    assert len(calls) == 2